@@ -0,0 +1,66 @@
+"""create customer_tags table
+
+Revision ID: a3c91f0d2b17
+Revises: 5e55b5fa45b8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f0d2b17'
+down_revision: Union[str, Sequence[str], None] = '5e55b5fa45b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    customer_tags = op.create_table('customer_tags',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('customer_id', 'tag')
+    )
+    op.create_index(
+        'ix_customer_tags_tag_customer', 'customer_tags', ['tag', 'customer_id'],
+        unique=False
+    )
+
+    # Backfill desde la columna JSON customers.tags
+    bind = op.get_bind()
+    customers = sa.table(
+        'customers', sa.column('id', sa.Integer), sa.column('tags', sa.JSON)
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(customers.c.id, customers.c.tags)
+            .where(customers.c.id > last_id)
+            .order_by(customers.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [
+            {'customer_id': customer_id, 'tag': tag[:50]}
+            for customer_id, tags in rows
+            for tag in dict.fromkeys(
+                t.strip().lower() for t in (tags or []) if t and t.strip()
+            )
+        ]
+        if values:
+            op.bulk_insert(customer_tags, values)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customer_tags_tag_customer', table_name='customer_tags')
+    op.drop_table('customer_tags')
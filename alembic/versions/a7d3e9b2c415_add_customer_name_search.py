@@ -0,0 +1,93 @@
+"""add customers.name_search for typeahead
+
+Revision ID: a7d3e9b2c415
+Revises: f4c8d2e6a1b3
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Optional, Sequence, Union
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b2c415'
+down_revision: Union[str, Sequence[str], None] = 'f4c8d2e6a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def _normalize_name(value: Optional[str]) -> str:
+    # Copia congelada de app.utils.dedupe_keys.normalize_name: la
+    # migración no cambia con el código
+    value = unicodedata.normalize("NFKD", (value or "").lower().replace("ñ", "n"))
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[a-zñ]+", value))
+
+
+def _backfill(bind, table_name: str) -> None:
+    table = sa.table(
+        table_name, sa.column('id', sa.Integer), sa.column('full_name', sa.String),
+        sa.column('name_search', sa.String)
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.full_name)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values(
+                name_search=sa.bindparam('value')
+            ),
+            [
+                {'row_id': row_id, 'value': _normalize_name(full_name)}
+                for row_id, full_name in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'customers', sa.Column('name_search', sa.String(length=120), nullable=True)
+    )
+    op.add_column(
+        'customers_archive',
+        sa.Column('name_search', sa.String(length=120), nullable=True)
+    )
+
+    bind = op.get_bind()
+    _backfill(bind, 'customers')
+    _backfill(bind, 'customers_archive')
+
+    op.create_index(
+        'ix_customers_name_search', 'customers', ['is_deleted', 'name_search'],
+        unique=False
+    )
+    op.create_index(
+        'ix_customers_owner_name_search', 'customers',
+        ['created_by', 'is_deleted', 'name_search'], unique=False
+    )
+    op.create_index(
+        'ix_customers_email_search', 'customers', ['is_deleted', 'email'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customers_email_search', table_name='customers')
+    op.drop_index('ix_customers_owner_name_search', table_name='customers')
+    op.drop_index('ix_customers_name_search', table_name='customers')
+    op.drop_column('customers_archive', 'name_search')
+    op.drop_column('customers', 'name_search')
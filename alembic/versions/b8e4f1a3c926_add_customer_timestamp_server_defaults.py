@@ -0,0 +1,37 @@
+"""add server defaults to customers timestamps
+
+Revision ID: b8e4f1a3c926
+Revises: a7d3e9b2c415
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f1a3c926'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9b2c415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # El ORM manda el valor en el INSERT; el default del servidor
+    # cubre las filas cargadas por fuera
+    for column in ('created_at', 'updated_at'):
+        op.alter_column(
+            'customers', column, existing_type=sa.DateTime(),
+            server_default=sa.func.now()
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ('created_at', 'updated_at'):
+        op.alter_column(
+            'customers', column, existing_type=sa.DateTime(), server_default=None
+        )
@@ -0,0 +1,42 @@
+"""store customers.updated_at with microseconds on MySQL
+
+Revision ID: c1d4e7f2a958
+Revises: b8e4f1a3c926
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d4e7f2a958'
+down_revision: Union[str, Sequence[str], None] = 'b8e4f1a3c926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # updated_at es la versión de la fila (ETag / If-Match): DATETIME(0) la redondea a
+    # segundos. SQLite y PostgreSQL ya guardan microsegundos
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.alter_column(
+        'customers', 'updated_at', existing_type=sa.DateTime(),
+        type_=mysql.DATETIME(fsp=6), existing_nullable=True,
+        server_default=sa.text('CURRENT_TIMESTAMP(6)')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.alter_column(
+        'customers', 'updated_at', existing_type=mysql.DATETIME(fsp=6),
+        type_=sa.DateTime(), existing_nullable=True, server_default=sa.func.now()
+    )
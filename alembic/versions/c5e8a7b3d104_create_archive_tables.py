@@ -0,0 +1,91 @@
+"""create customers_archive and users_archive tables
+
+Revision ID: c5e8a7b3d104
+Revises: a3c91f0d2b17
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a7b3d104'
+down_revision: Union[str, Sequence[str], None] = 'a3c91f0d2b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('customers_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('full_name', sa.String(length=120), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=True),
+    sa.Column('phone', sa.String(length=30), nullable=True),
+    sa.Column('source', sa.Enum(
+        'MANUAL', 'GOOGLE_MAPS', 'INSTAGRAM', 'FACEBOOK', 'WEB', name='leadsource'
+    ), nullable=False),
+    sa.Column('status', sa.Enum(
+        'NEW', 'CONTACTED', 'QUALIFIED', 'LOST', name='leadstatus'
+    ), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('updated_by', sa.Integer(), nullable=False),
+    sa.Column('deleted_by', sa.Integer(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_customers_archive_email'), 'customers_archive', ['email'], unique=False
+    )
+    op.create_index(
+        op.f('ix_customers_archive_created_by'), 'customers_archive', ['created_by'],
+        unique=False
+    )
+
+    op.create_table('users_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('updated_by', sa.Integer(), nullable=False),
+    sa.Column('deleted_by', sa.Integer(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_users_archive_username'), 'users_archive', ['username'], unique=False
+    )
+
+    # Selección de candidatos: WHERE is_deleted AND deleted_at < corte
+    op.create_index(
+        'ix_customers_deleted_at', 'customers', ['is_deleted', 'deleted_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customers_deleted_at', table_name='customers')
+    op.drop_index(op.f('ix_users_archive_username'), table_name='users_archive')
+    op.drop_table('users_archive')
+    op.drop_index(
+        op.f('ix_customers_archive_created_by'), table_name='customers_archive'
+    )
+    op.drop_index(op.f('ix_customers_archive_email'), table_name='customers_archive')
+    op.drop_table('customers_archive')
@@ -0,0 +1,89 @@
+"""add customers.email_search for case-insensitive email typeahead
+
+Revision ID: d6b2f8a4c173
+Revises: c1d4e7f2a958
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Optional, Sequence, Union
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6b2f8a4c173'
+down_revision: Union[str, Sequence[str], None] = 'c1d4e7f2a958'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def _normalize_email(value: Optional[str]) -> Optional[str]:
+    # Copia congelada de app.utils.dedupe_keys.normalize_email: la
+    # migración no cambia con el código
+    if not value:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.strip().lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _backfill(bind, table_name: str) -> None:
+    table = sa.table(
+        table_name, sa.column('id', sa.Integer), sa.column('email', sa.String),
+        sa.column('email_search', sa.String)
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.email)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values(
+                email_search=sa.bindparam('value')
+            ),
+            [
+                {'row_id': row_id, 'value': _normalize_email(email)}
+                for row_id, email in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'customers', sa.Column('email_search', sa.String(length=120), nullable=True)
+    )
+    op.add_column(
+        'customers_archive',
+        sa.Column('email_search', sa.String(length=120), nullable=True)
+    )
+
+    bind = op.get_bind()
+    _backfill(bind, 'customers')
+    _backfill(bind, 'customers_archive')
+
+    # El índice del typeahead pasa de email (sensible a mayúsculas) a email_search
+    op.drop_index('ix_customers_email_search', table_name='customers')
+    op.create_index(
+        'ix_customers_email_search', 'customers', ['is_deleted', 'email_search'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customers_email_search', table_name='customers')
+    op.create_index(
+        'ix_customers_email_search', 'customers', ['is_deleted', 'email'], unique=False
+    )
+    op.drop_column('customers_archive', 'email_search')
+    op.drop_column('customers', 'email_search')
@@ -0,0 +1,34 @@
+"""add customer change feed indexes
+
+Revision ID: e3b7c1d5f926
+Revises: d2a6f9c4e817
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7c1d5f926'
+down_revision: Union[str, Sequence[str], None] = 'd2a6f9c4e817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_customers_updated_id', 'customers', ['updated_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_customers_owner_updated_id', 'customers',
+        ['created_by', 'updated_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customers_owner_updated_id', table_name='customers')
+    op.drop_index('ix_customers_updated_id', table_name='customers')
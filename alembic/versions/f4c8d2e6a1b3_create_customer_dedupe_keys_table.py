@@ -0,0 +1,133 @@
+"""create customer_dedupe_keys table
+
+Revision ID: f4c8d2e6a1b3
+Revises: e3b7c1d5f926
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Optional, Sequence, Set, Tuple, Union
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8d2e6a1b3'
+down_revision: Union[str, Sequence[str], None] = 'e3b7c1d5f926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+# =========================
+# Copia congelada de app.utils.dedupe_keys (tal como estaba en esta revisión):
+# el backfill no debe cambiar si después cambia el código de la app
+# =========================
+PHONE_DIGITS = 8
+
+_SOUNDEX = {c: str(code) for code, letters in enumerate(
+    ("bfpv", "cgjkqsxz", "dt", "l", "mn", "r"), start=1) for c in letters}
+
+
+def _normalize_name(value: Optional[str]) -> str:
+    value = unicodedata.normalize("NFKD", (value or "").lower().replace("ñ", "n"))
+    return " ".join(
+        re.findall(
+            r"[a-zñ]+", "".join(c for c in value if not unicodedata.combining(c))
+        )
+    )
+
+
+def _phone_key(phone: Optional[str]) -> Optional[str]:
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-PHONE_DIGITS:] if len(digits) >= PHONE_DIGITS else None
+
+
+def _soundex(word: str) -> str:
+    word = word[1:] if word.startswith("h") and len(word) > 1 else word
+    codes = [_SOUNDEX.get(c, "") for c in word]
+    key, last = word[0], codes[0]
+    for c, code in zip(word[1:], codes[1:]):
+        if code and code != last:
+            key += code
+        if c not in "hw":
+            last = code
+    return (key + "000")[:4]
+
+
+def _name_key(full_name: Optional[str]) -> Optional[str]:
+    words = [w for w in _normalize_name(full_name).split() if len(w) > 1]
+    if not words:
+        return None
+    return " ".join(sorted(_soundex(w) for w in words))
+
+
+def _email_key(email: Optional[str]) -> Optional[str]:
+    if not email or "@" not in email:
+        return None
+    local = email.split("@", 1)[0].lower().split("+", 1)[0].replace(".", "")
+    return local or None
+
+
+def dedupe_keys(
+        full_name: Optional[str], phone: Optional[str], email: Optional[str]
+) -> Set[Tuple[str, str]]:
+    keys = {
+        ("phone", _phone_key(phone)), ("name", _name_key(full_name)),
+        ("email", _email_key(email))
+    }
+    return {(kind, key) for kind, key in keys if key}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    customer_dedupe_keys = op.create_table('customer_dedupe_keys',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('key', sa.String(length=120), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('customer_id', 'kind', 'key')
+    )
+    op.create_index(
+        'ix_customer_dedupe_keys_lookup', 'customer_dedupe_keys',
+        ['kind', 'key', 'customer_id'], unique=False
+    )
+
+    # Backfill de los clientes activos
+    bind = op.get_bind()
+    customers = sa.table(
+        'customers',
+        sa.column('id', sa.Integer), sa.column('full_name', sa.String),
+        sa.column('phone', sa.String), sa.column('email', sa.String),
+        sa.column('is_deleted', sa.Boolean),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                customers.c.id, customers.c.full_name, customers.c.phone,
+                customers.c.email
+            )
+            .where(customers.c.id > last_id, customers.c.is_deleted == sa.false())
+            .order_by(customers.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [
+            {'customer_id': customer_id, 'kind': kind, 'key': key}
+            for customer_id, full_name, phone, email in rows
+            for kind, key in dedupe_keys(full_name, phone, email)
+        ]
+        if values:
+            op.bulk_insert(customer_dedupe_keys, values)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customer_dedupe_keys_lookup', table_name='customer_dedupe_keys')
+    op.drop_table('customer_dedupe_keys')
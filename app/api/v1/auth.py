@@ -48,7 +48,6 @@ def login(
         user.security_info = UserSecurityInfo(user_id=user.id)
         db.add(user.security_info)
         db.commit()
-        db.refresh(user.security_info)
     sec = user.security_info
 
     # Chequear bloqueo usando el helper del modelo
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.session import get_connection
+from app.dependencies.roles import role_required
+from app.models.user import User
+from app.schemas.batch_schema import BatchRequest, BatchResult
+from app.services.batch_service import BatchService
+
+router = APIRouter()
+
+@router.post("", response_model=BatchResult)
+def run_batch(
+        payload: BatchRequest,
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    # Una autenticación y un commit para toda la cola de mutaciones del cliente
+    return BatchService.run(db, payload, current_user)
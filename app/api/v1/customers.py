@@ -1,22 +1,84 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.customer_schema import CustomerCreate, CustomerRead, CustomerQuery
+from app.schemas.customer_schema import (
+    CustomerCreate, CustomerRead, CustomerQuery, CustomerImportReport,
+    CustomerBulkRequest, CustomerBulkResult, CustomerFacets, TagFacet, CustomerPatch,
+    CustomerChangeFeed, DuplicateCandidate, CustomerMergeRequest, CustomerSuggestion,
+    CustomerBatch, CustomerBatchRequest
+)
+from app.schemas.audit_schema import AuditEntry
 from app.schemas.pagination import Page
 from app.services.customer_service import CustomerService
-from app.db.session import get_connection
+from app.services.customer_import_service import CustomerImportService
+from app.services.customer_bulk_service import CustomerBulkService
+from app.services.customer_dedupe_service import CustomerDedupeService
+from app.db.session import get_connection, stream_with_own_session
+from app.core.events import customer_events
+from app.core.serialization import FastJSONResponse
+from app.config import settings
 from app.models.user import User
 from app.dependencies.roles import role_required
 from fastapi import Query
 
 router = APIRouter()
 
+# Las lecturas se revalidan siempre (no-cache) pero con ETag el 304 no lleva cuerpo
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    )
+
+def projected(model, etag: str) -> Response:
+    # Con ?fields= el modelo se arma en runtime: se serializa acá y no
+    # contra response_model. Con FAST_JSON_RESPONSES los listados completos
+    # toman el mismo camino (ya validados)
+    return FastJSONResponse(
+        model, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    )
+
 @router.post("/", response_model=CustomerRead)
 def create_customer(
         payload: CustomerCreate,
+        response: Response,
         db: Session = Depends(get_connection),
         current_user: User =  Depends(role_required("admin", "user"))
 ):
-    return CustomerService.create_customer(db, payload, current_user)
+    customer = CustomerService.create_customer(db, payload, current_user)
+    # Se crea igual; el cliente decide si ofrecer el merge
+    duplicates = CustomerDedupeService.possible_duplicates(db, customer, current_user)
+    if duplicates:
+        response.headers["X-Possible-Duplicates"] = ",".join(map(str, duplicates))
+    return customer
+
+@router.post("/import", response_model=CustomerImportReport)
+def import_customers(
+        file: UploadFile = File(...),
+        format: Optional[str] = Query(
+            None, description="csv | ndjson (por defecto se infiere del archivo)"
+        ), db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    fmt = CustomerImportService.detect_format(format, file.filename, file.content_type)
+    return CustomerImportService.import_customers(db, file.file, fmt, current_user)
+
+@router.post("/bulk", response_model=CustomerBulkResult)
+def bulk_customers(
+        payload: CustomerBulkRequest,
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerBulkService.run(db, payload, current_user)
 
 @router.get("/count", response_model=int)
 def count_customers(
@@ -25,30 +87,220 @@ def count_customers(
 ):
     return CustomerService.count_all_customers(db, current_user)
 
+@router.get("/export")
+def export_customers(
+    format: str = Query("csv", description="csv | ndjson"),
+    filters: CustomerQuery = Depends(),
+    db: Session = Depends(get_connection),
+    current_user: User = Depends(role_required("admin", "user"))
+):
+    chunks = stream_with_own_session(
+        db,
+        lambda export_db: CustomerService.export_customers(
+            export_db, filters, current_user, format
+        )
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="customers.{format}"'}
+    )
+
+@router.get("/facets", response_model=CustomerFacets)
+def customer_facets(
+    bucket: str = Query("day", description="day | week | month"),
+    filters: CustomerQuery = Depends(),
+    db: Session = Depends(get_connection),
+    current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.facets(db, filters, current_user, bucket)
+
+@router.get("/tags/facets", response_model=List[TagFacet])
+def customer_tag_facets(
+    top: int = Query(20, ge=1, le=200),
+    filters: CustomerQuery = Depends(),
+    db: Session = Depends(get_connection),
+    current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.tag_facets(db, filters, current_user, top)
+
+@router.get("/suggest", response_model=List[CustomerSuggestion])
+def suggest_customers(
+        prefix: str = Query(..., min_length=1, max_length=120),
+        limit: int = Query(10, ge=1),
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.suggest(db, prefix, current_user, limit)
+
+@router.get("/batch", response_model=CustomerBatch)
+def get_customers_batch(
+        ids: str = Query(..., description="Ids separados por coma"),
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.get_customers_batch(
+        db, CustomerService.parse_ids(ids), current_user
+    )
+
+@router.post("/batch", response_model=CustomerBatch)
+def post_customers_batch(
+        payload: CustomerBatchRequest,
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    # Misma lectura que el GET, para listas de ids que no entran cómodas en la URL
+    return CustomerService.get_customers_batch(db, payload.ids, current_user)
+
+@router.get("/changes", response_model=CustomerChangeFeed)
+def customer_changes(
+        since: Optional[str] = Query(
+            None,
+            description="next_cursor de la respuesta anterior (vacío = desde el inicio)"
+        ), limit: int = Query(500, ge=1, le=1000),
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.changes(db, current_user, since, limit)
+
+@router.get("/stream")
+async def customer_stream(
+    request: Request,
+    db: Session = Depends(get_connection),
+    current_user: User = Depends(role_required("admin", "user"))
+):
+    """SSE de clientes visibles: created / updated / deleted / reactivated / bulk."""
+    owner_id = None if current_user.role == "admin" else current_user.id
+    db.close()  # la conexión no se usa durante el stream: vuelve al pool ya
+
+    subscription = customer_events.subscribe(owner_id)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # mantiene viva la conexión a través de proxies
+                    yield ": heartbeat\n\n"
+                    continue
+                data = json.dumps(event, default=str)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+                if event["type"] == "overflow":
+                    # el cliente reconecta y resincroniza con GET /customers/changes
+                    return
+        finally:
+            customer_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/", response_model=Page[CustomerRead])
 def list_customers(
+    request: Request,
+    response: Response,
     filters: CustomerQuery = Depends(),
     db: Session = Depends(get_connection),
     current_user: User = Depends(role_required("admin", "user"))
 ):
-    return CustomerService.list_customers(db, filters, current_user)
+    etag, page = CustomerService.list_customers_conditional(
+        db, filters, current_user, request.headers.get("if-none-match")
+    )
+    if page is None:
+        return not_modified(etag)
+    if filters.fields or settings.FAST_JSON_RESPONSES:
+        return projected(page, etag)
+    set_etag(response, etag)
+    return page
 
 @router.get("/{customer_id}", response_model=CustomerRead)
 def get_customer(
+        customer_id: int, request: Request, response: Response,
+        fields: Optional[str] = Query(
+            None, description="Campos separados por coma (por defecto, todos)"
+        ), db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    etag, customer = CustomerService.get_customer_conditional(
+        db, customer_id, current_user, request.headers.get("if-none-match"), fields
+    )
+    if customer is None:
+        return not_modified(etag)
+    if fields:
+        return projected(customer, etag)
+    set_etag(response, etag)
+    return customer
+
+@router.get("/{customer_id}/history", response_model=Page[AuditEntry])
+def customer_history(
+        customer_id: int,
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerService.history(db, customer_id, current_user, limit, offset)
+
+@router.get("/{customer_id}/duplicates", response_model=List[DuplicateCandidate])
+def customer_duplicates(
+        customer_id: int,
+        min_score: Optional[float] = Query(None, ge=0, le=1),
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    return CustomerDedupeService.find_duplicates(
+        db, customer_id, current_user, min_score
+    )
+
+@router.post("/{customer_id}/merge", response_model=CustomerRead)
+def merge_customers(
         customer_id: int,
+        payload: CustomerMergeRequest,
         db: Session = Depends(get_connection),
         current_user: User = Depends(role_required("admin", "user"))
 ):
-    return CustomerService.get_customer(db, customer_id, current_user)
+    return CustomerDedupeService.merge(
+        db, customer_id, payload.duplicate_ids, current_user
+    )
 
 @router.put("/{customer_id}", response_model=CustomerRead)
 def update_customer(
         customer_id: int,
         payload: CustomerCreate,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin", "user"))
+):
+    etag, customer = CustomerService.patch_customer(
+        db, customer_id, payload, current_user, request.headers.get("if-match")
+    )
+    set_etag(response, etag)
+    return customer
+
+@router.patch("/{customer_id}", response_model=CustomerRead)
+def patch_customer(
+        customer_id: int,
+        payload: CustomerPatch,
+        request: Request,
+        response: Response,
         db: Session = Depends(get_connection),
         current_user: User = Depends(role_required("admin", "user"))
 ):
-    return CustomerService.update_customer(db, customer_id, payload, current_user)
+    etag, customer = CustomerService.patch_customer(
+        db, customer_id, payload, current_user, request.headers.get("if-match")
+    )
+    set_etag(response, etag)
+    return customer
 
 @router.delete("/{customer_id}", response_model=bool)
 def delete_customer(
@@ -0,0 +1,114 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.customers import not_modified, projected, set_etag
+from app.config import settings
+from app.db.session import get_async_connection
+from app.dependencies.roles import role_required_async
+from app.models.user import User
+from app.schemas.customer_schema import (
+    CustomerCreate, CustomerPatch, CustomerQuery, CustomerRead
+)
+from app.schemas.pagination import Page
+from app.services.async_customer_service import AsyncCustomerService
+
+# Rutas calientes de /customers con DB_ASYNC=1. Se registran antes que las sync
+# y las tapan; el resto (export, facets, bulk, ...) sigue en app/api/v1/customers.py.
+# {customer_id:int} para no atrapar /customers/suggest, /customers/changes, etc.
+router = APIRouter()
+
+@router.post("/", response_model=CustomerRead)
+async def create_customer(
+        payload: CustomerCreate,
+        response: Response,
+        db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    customer = await AsyncCustomerService.create_customer(db, payload, current_user)
+    duplicates = await AsyncCustomerService.possible_duplicates(
+        db, customer, current_user
+    )
+    if duplicates:
+        response.headers["X-Possible-Duplicates"] = ",".join(map(str, duplicates))
+    return customer
+
+@router.get("/count", response_model=int)
+async def count_customers(
+        db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    return await AsyncCustomerService.count_all_customers(db, current_user)
+
+@router.get("/", response_model=Page[CustomerRead])
+async def list_customers(
+    request: Request,
+    response: Response,
+    filters: CustomerQuery = Depends(),
+    db: AsyncSession = Depends(get_async_connection),
+    current_user: User = Depends(role_required_async("admin", "user"))
+):
+    etag, page = await AsyncCustomerService.list_customers_conditional(
+        db, filters, current_user, request.headers.get("if-none-match")
+    )
+    if page is None:
+        return not_modified(etag)
+    if filters.fields or settings.FAST_JSON_RESPONSES:
+        return projected(page, etag)
+    set_etag(response, etag)
+    return page
+
+@router.get("/{customer_id:int}", response_model=CustomerRead)
+async def get_customer(
+        customer_id: int, request: Request, response: Response,
+        fields: Optional[str] = Query(
+            None, description="Campos separados por coma (por defecto, todos)"
+        ), db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    etag, customer = await AsyncCustomerService.get_customer_conditional(
+        db, customer_id, current_user, request.headers.get("if-none-match"), fields
+    )
+    if customer is None:
+        return not_modified(etag)
+    if fields:
+        return projected(customer, etag)
+    set_etag(response, etag)
+    return customer
+
+@router.put("/{customer_id:int}", response_model=CustomerRead)
+async def update_customer(
+        customer_id: int,
+        payload: CustomerCreate,
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    etag, customer = await AsyncCustomerService.patch_customer(
+        db, customer_id, payload, current_user, request.headers.get("if-match")
+    )
+    set_etag(response, etag)
+    return customer
+
+@router.patch("/{customer_id:int}", response_model=CustomerRead)
+async def patch_customer(
+        customer_id: int,
+        payload: CustomerPatch,
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    etag, customer = await AsyncCustomerService.patch_customer(
+        db, customer_id, payload, current_user, request.headers.get("if-match")
+    )
+    set_etag(response, etag)
+    return customer
+
+@router.delete("/{customer_id:int}", response_model=bool)
+async def delete_customer(
+        customer_id: int,
+        db: AsyncSession = Depends(get_async_connection),
+        current_user: User = Depends(role_required_async("admin", "user"))
+):
+    return await AsyncCustomerService.delete_customer(db, customer_id, current_user)
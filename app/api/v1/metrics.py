@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from app.core.cache import CACHES
+from app.core.events import customer_events
+from app.core.singleflight import FLIGHTS
+from app.workers.audit_writer import audit_writer
+from app.models.user import User
+from app.dependencies.roles import role_required
+
+router = APIRouter()
+
+@router.get("/cache")
+def cache_metrics(current_user: User = Depends(role_required("admin"))):
+    """Hits / misses por cache de este worker."""
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+@router.get("/audit")
+def audit_metrics(current_user: User = Depends(role_required("admin"))):
+    """Estado de la cola del audit log de este worker."""
+    return audit_writer.stats()
+
+@router.get("/events")
+def events_metrics(current_user: User = Depends(role_required("admin"))):
+    """Suscriptores SSE conectados a este worker y eventos publicados."""
+    return customer_events.stats()
+
+@router.get("/singleflight")
+def singleflight_metrics(current_user: User = Depends(role_required("admin"))):
+    """Consultas ejecutadas vs. llamadas que se sumaron a una idéntica en vuelo."""
+    return {name: flight.stats() for name, flight in FLIGHTS.items()}
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.schemas.user_schema import UserCreate, UserRead, UserQuery
+from app.schemas.user_schema import UserCreate, UserPatch, UserRead, UserQuery
 from app.schemas.pagination import Page
+from app.config import settings
+from app.core.serialization import FastJSONResponse
 from app.services.user_service import UserService
 from app.db.session import get_connection
 from app.models.user import User
@@ -23,7 +25,11 @@ def list_user(
     db: Session = Depends(get_connection),
     current_user: User = Depends(role_required("admin"))
 ):
-    return UserService.list_users(db, filters, current_user)
+    page = UserService.list_users(db, filters, current_user)
+    if settings.FAST_JSON_RESPONSES:
+        # ya validada: se evita la re-validación de response_model
+        return FastJSONResponse(page)
+    return page
 
 @router.get("/{user_id}", response_model=UserRead)
 def get_user(
@@ -42,6 +48,15 @@ def update_user(
 ):
     return UserService.update_user(db, user_id, payload, current_user)
 
+@router.patch("/{user_id}", response_model=UserRead)
+def patch_user(
+        user_id: int,
+        payload: UserPatch,
+        db: Session = Depends(get_connection),
+        current_user: User = Depends(role_required("admin"))
+):
+    return UserService.update_user(db, user_id, payload, current_user)
+
 @router.delete("/{user_id}", response_model=bool)
 def delete_user(
         user_id: int,
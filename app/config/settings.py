@@ -13,6 +13,14 @@ DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "root")
 DB_NAME = os.getenv("DB_NAME", "imadwi_data_platform")
 DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+# Opcionales: pisan la URL MySQL armada con DB_* (p. ej. sqlite:///./crm.db y
+# sqlite+aiosqlite:///./crm.db para correr local).
+# DATABASE_URL es la misma que usa Alembic
+DATABASE_URL = os.getenv("DATABASE_URL")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# 1 = las rutas calientes de /customers y la autenticación usan
+# AsyncSession (asyncmy / aiosqlite)
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
 
 # --------------------------
 # JWT / Auth
@@ -26,4 +34,133 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
-REDIS_PASSWORD = os.getenv("REDIS_PASSWORD") or None
\ No newline at end of file
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD") or None
+
+# --------------------------
+# Importación masiva de clientes
+# --------------------------
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 500))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+# --------------------------
+# Exportación de clientes (streaming)
+# --------------------------
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# --------------------------
+# Operaciones masivas (bulk)
+# --------------------------
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))
+BULK_MAX_IDS = int(os.getenv("BULK_MAX_IDS", 50000))
+
+# --------------------------
+# Cache de lecturas (memory = LRU por proceso, redis = compartida entre workers)
+# --------------------------
+# redis necesita el paquete redis (pip install redis) y REDIS_*
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# Workers del servidor: uvicorn y gunicorn la toman como default de --workers. Con más
+# de uno y CACHE_BACKEND=memory, las caches que se invalidan al escribir se apagan
+# (un worker no ve las invalidaciones de otro y serviría páginas viejas)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+LIST_CACHE_TTL_SECONDS = float(os.getenv("LIST_CACHE_TTL_SECONDS", 60))  # 0 = sin cache
+LIST_CACHE_MAXSIZE = int(os.getenv("LIST_CACHE_MAXSIZE", 2048))
+# 0 = sin cache
+ENTITY_CACHE_TTL_SECONDS = float(os.getenv("ENTITY_CACHE_TTL_SECONDS", 120))
+ENTITY_CACHE_MAXSIZE = int(os.getenv("ENTITY_CACHE_MAXSIZE", 10000))
+# Tras una escritura la clave queda marcada estos segundos: una lectura que empezó
+# antes no puede volver a cachear el valor viejo (debe superar lo que tarda un GET)
+CACHE_TOMBSTONE_SECONDS = float(os.getenv("CACHE_TOMBSTONE_SECONDS", 10))
+# GET/POST /customers/batch
+BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", 200))
+
+# --------------------------
+# Facetas del listado de clientes
+# --------------------------
+# 0 = sin cache
+FACETS_CACHE_TTL_SECONDS = float(os.getenv("FACETS_CACHE_TTL_SECONDS", 30))
+FACETS_CACHE_MAXSIZE = int(os.getenv("FACETS_CACHE_MAXSIZE", 512))
+
+# --------------------------
+# Idempotency-Key (reintentos seguros de POST)
+# --------------------------
+IDEMPOTENT_PATHS = [
+    p.strip() for p in os.getenv("IDEMPOTENT_PATHS", "/customers/,/users/").split(",")
+    if p.strip()
+]
+# 0 = desactivado
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+IDEMPOTENCY_LOCK_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_TTL_SECONDS", 30))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
+IDEMPOTENCY_MAXSIZE = int(os.getenv("IDEMPOTENCY_MAXSIZE", 10000))
+
+# --------------------------
+# Archivo de eliminados (customers_archive / users_archive)
+# --------------------------
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 30))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+# 0 = sin job en background
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", 3600))
+
+# --------------------------
+# Auditoría (escritura asíncrona en lotes)
+# --------------------------
+AUDIT_QUEUE_MAXSIZE = int(os.getenv("AUDIT_QUEUE_MAXSIZE", 10000))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", 1))
+
+# --------------------------
+# Change feed (GET /customers/changes)
+# --------------------------
+# Las filas más nuevas que esto todavía pueden tener
+# transacciones concurrentes sin confirmar
+CHANGES_SAFETY_LAG_SECONDS = float(os.getenv("CHANGES_SAFETY_LAG_SECONDS", 5))
+
+# --------------------------
+# Eventos en vivo (GET /customers/stream, SSE)
+# --------------------------
+# memory | redis (fan-out entre workers)
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", CACHE_BACKEND)
+SSE_CLIENT_BUFFER = int(os.getenv("SSE_CLIENT_BUFFER", 256))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+
+# --------------------------
+# Detección de duplicados (claves de bloqueo)
+# --------------------------
+DEDUPE_MIN_SCORE = float(os.getenv("DEDUPE_MIN_SCORE", 0.5))
+# claves más comunes que esto no se usan
+DEDUPE_MAX_BLOCK = int(os.getenv("DEDUPE_MAX_BLOCK", 200))
+
+# --------------------------
+# Serialización de listados
+# --------------------------
+# 1 = los listados paginados se devuelven ya serializados (sin re-validar contra
+# response_model), con orjson si está instalado
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "0") == "1"
+
+# --------------------------
+# Typeahead (GET /customers/suggest)
+# --------------------------
+SUGGEST_MIN_PREFIX = int(os.getenv("SUGGEST_MIN_PREFIX", 2))
+SUGGEST_MAX_LIMIT = int(os.getenv("SUGGEST_MAX_LIMIT", 20))
+
+# --------------------------
+# Batch de operaciones (POST /batch)
+# --------------------------
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", 500))
+
+# --------------------------
+# Single-flight (lecturas idénticas concurrentes comparten una consulta)
+# --------------------------
+SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "1") == "1"
+
+# --------------------------
+# Compresión de respuestas (Accept-Encoding)
+# --------------------------
+# bytes; más chicas salen tal cual
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+# Orden de preferencia; br / zstd solo si brotli / zstandard están
+# instalados. Vacío = sin compresión
+COMPRESSION_ENCODINGS = [
+    e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if e.strip()
+]
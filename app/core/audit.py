@@ -0,0 +1,130 @@
+# app/core/audit.py
+"""
+Captura de cambios para el audit log.
+
+- Escrituras por ORM: un listener after_flush arma el diff por campo de cada
+  Customer / User nuevo, modificado o borrado y lo acumula en session.info.
+- Escrituras Core (bulk, PATCH de una sentencia, import): el repositorio llama
+  a record() con los valores que escribió.
+
+En after_commit lo acumulado pasa al AuditWriter (no bloquea el request); en
+rollback se descarta. Así el log nunca registra cambios que no se confirmaron.
+"""
+import enum
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.db.session import after_commit, sync_engine_for
+from app.models.customer import Customer
+from app.models.user import User
+from app.workers.audit_writer import audit_writer
+
+AUDITED = {Customer: "customer", User: "user"}
+
+# Columnas que cambian en cada escritura (ruido) o que no deben quedar en el log
+IGNORED = {"id", "created_at", "updated_at", "updated_by"}
+REDACTED = {"hashed_password"}
+
+PENDING_KEY = "audit_pending"
+
+
+def record(
+        db: Session, entity: str, entity_ids: Iterable[int], action: str, changes: dict,
+        actor_id: Optional[int]
+) -> None:
+    """Registra cambios hechos fuera del ORM; se escriben si la transacción confirma."""
+    diff = {
+        key: {"new": _jsonable(key, value)}
+        for key, value in changes.items() if key not in IGNORED
+    }
+    now = datetime.now(timezone.utc)
+    db.info.setdefault(PENDING_KEY, []).extend(
+        {"entity": entity, "entity_id": entity_id, "action": action, "changes": diff,
+         "actor_id": actor_id, "created_at": now}
+        for entity_id in entity_ids
+    )
+
+
+def _jsonable(key: str, value):
+    if key in REDACTED:
+        return "***"
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return value
+
+
+def _diff(obj, new: bool) -> dict:
+    state = inspect(obj)
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if key in IGNORED:
+            continue
+        history = state.attrs[key].history
+        if new:
+            value = getattr(obj, key)
+            if value is not None:
+                changes[key] = {"new": _jsonable(key, value)}
+        elif history.has_changes():
+            entry = {"new": _jsonable(key, history.added[0] if history.added else None)}
+            if history.deleted:
+                entry = {"old": _jsonable(key, history.deleted[0]), **entry}
+            changes[key] = entry
+    return changes
+
+
+def _action(obj, changes: dict) -> str:
+    if "is_deleted" in changes:
+        return "delete" if changes["is_deleted"]["new"] else "reactivate"
+    return "update"
+
+
+@event.listens_for(Session, "after_flush")
+def _capture(session: Session, flush_context) -> None:
+    now = datetime.now(timezone.utc)
+    entries = []
+    for objects, kind in (
+        (session.new, "create"), (session.dirty, "update"), (session.deleted, "delete")
+    ):
+        for obj in objects:
+            entity = AUDITED.get(type(obj))
+            if entity is None:
+                continue
+            if kind == "delete":
+                changes, action, actor = {}, "delete", None
+            else:
+                changes = _diff(obj, new=kind == "create")
+                if not changes:
+                    continue
+                action = "create" if kind == "create" else _action(obj, changes)
+                actor = obj.deleted_by if action == "delete" else obj.updated_by
+            entries.append(
+                {
+                    "entity": entity, "entity_id": obj.id, "action": action,
+                    "changes": changes, "actor_id": actor, "created_at": now
+                }
+            )
+    if entries:
+        session.info.setdefault(PENDING_KEY, []).extend(entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_to_writer(session: Session) -> None:
+    entries = session.info.pop(PENDING_KEY, None)
+    if entries:
+        # En un batch get_bind() es la conexión de la transacción: el log va por el
+        # engine (el sync de la misma base si la sesión es la de un AsyncSession)
+        bind = sync_engine_for(session.get_bind().engine)
+        after_commit(lambda: audit_writer.enqueue(bind, entries))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
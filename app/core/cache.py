@@ -0,0 +1,316 @@
+# app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+
+from app.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Valor de las claves invalidadas: se lee como miss y bloquea los add() mientras vive
+TOMBSTONE = "\x00invalidated"
+
+
+class LocalCache:
+    """
+    LRU en memoria con TTL. Thread-safe: los endpoints sync corren en el
+    threadpool de Starlette. Guarda strings (JSON ya serializado) para que
+    la interfaz sea la misma que la de un backend remoto.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now or entry[1] == TOMBSTONE:
+                if entry is not None and entry[0] <= now:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Las claves presentes (y vigentes) con su valor; las ausentes no aparecen."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """Guarda solo si la clave no existe (o expiró). Devuelve True si la guardó."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._data[key] = (now + (ttl if ttl is not None else self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_many(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate_many(self, keys, ttl: Optional[float] = None) -> None:
+        """
+        Como delete_many, pero deja un TOMBSTONE por ttl segundos: un relleno
+        read-through (add) que leyó la BD antes de la escritura no vuelve a guardar el
+        valor viejo.
+        """
+        if not self.enabled:
+            return
+        ttl = ttl if ttl is not None else settings.CACHE_TOMBSTONE_SECONDS
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key in keys:
+                self._data[key] = (expires_at, TOMBSTONE)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class RedisCache:
+    """Misma interfaz que LocalCache, compartida entre workers (LRU de Redis)."""
+
+    def __init__(self, name: str, ttl: float = 60):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = get_redis().get(self._key(key))
+        if value is None or value == TOMBSTONE:
+            value = None
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        # Un solo MGET en lugar de un GET por clave
+        if not self.enabled or not keys:
+            return {}
+        values = get_redis().mget([self._key(key) for key in keys])
+        found = {
+            key: value for key, value in zip(keys, values)
+            if value is not None and value != TOMBSTONE
+        }
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        get_redis().set(
+            self._key(key), value, px=int((ttl if ttl is not None else self.ttl) * 1000)
+        )
+
+    def add(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return False
+        ttl_ms = int((ttl if ttl is not None else self.ttl) * 1000)
+        return bool(get_redis().set(self._key(key), value, px=ttl_ms, nx=True))
+
+    def delete(self, key: str) -> None:
+        get_redis().delete(self._key(key))
+
+    def delete_many(self, keys) -> None:
+        keys = [self._key(key) for key in keys]
+        if keys:
+            get_redis().delete(*keys)
+
+    def invalidate_many(self, keys, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        ttl = ttl if ttl is not None else settings.CACHE_TOMBSTONE_SECONDS
+        pipe = get_redis().pipeline(transaction=False)
+        for key in keys:
+            pipe.set(self._key(key), TOMBSTONE, px=int(ttl * 1000))
+        pipe.execute()
+
+    def clear(self) -> None:
+        client = get_redis()
+        for key in client.scan_iter(match=self._key("*"), count=500):
+            client.delete(key)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# =========================
+# CONTADORES DE GENERACIÓN (invalidación por versión)
+# =========================
+class LocalGenerations:
+    """
+    Un contador por scope. Las claves de cache incluyen la generación vigente,
+    así que incrementarla invalida de una vez todas las entradas del scope
+    sin tener que recorrerlas (las viejas expiran por TTL / LRU).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, *scopes: str) -> List[int]:
+        with self._lock:
+            return [self._counters.get(scope, 0) for scope in scopes]
+
+    def bump(self, *scopes: str) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._counters[scope] = self._counters.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class RedisGenerations:
+    def __init__(self, name: str):
+        self.name = name
+
+    def _key(self, scope: str) -> str:
+        return f"gen:{self.name}:{scope}"
+
+    def get(self, *scopes: str) -> List[int]:
+        values = get_redis().mget([self._key(scope) for scope in scopes])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, *scopes: str) -> None:
+        pipe = get_redis().pipeline(transaction=False)
+        for scope in scopes:
+            pipe.incr(self._key(scope))
+        pipe.execute()
+
+    def clear(self) -> None:
+        client = get_redis()
+        for key in client.scan_iter(match=self._key("*"), count=500):
+            client.delete(key)
+
+
+_redis_client = None
+
+
+def get_redis():
+    global _redis_client
+    if _redis_client is None:
+        from redis import Redis
+        _redis_client = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True
+        )
+    return _redis_client
+
+
+# Registro de caches (para métricas y para limpiarlas en tests)
+CACHES: Dict[str, Union[LocalCache, RedisCache]] = {}
+GENERATIONS: Dict[str, Union[LocalGenerations, RedisGenerations]] = {}
+
+
+def build_cache(name: str, maxsize: int, ttl: float,
+                invalidated_on_write: bool = True) -> Union[LocalCache, RedisCache]:
+    """
+    invalidated_on_write: las entradas dejan de valer cuando se escribe (generaciones
+    o delete). En memoria esa invalidación no llega a los otros workers, así que con
+    WEB_CONCURRENCY > 1 esas caches se apagan salvo con CACHE_BACKEND=redis.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        cache = RedisCache(name, ttl=ttl)
+    else:
+        if invalidated_on_write and settings.WEB_CONCURRENCY > 1 and ttl > 0:
+            logger.warning(
+                "Cache %s disabled: CACHE_BACKEND=memory cannot invalidate across %s "
+                "workers (use redis)",
+                name, settings.WEB_CONCURRENCY,
+            )
+            ttl = 0
+        cache = LocalCache(name, maxsize=maxsize, ttl=ttl)
+    CACHES[name] = cache
+    return cache
+
+
+def build_generations(name: str) -> Union[LocalGenerations, RedisGenerations]:
+    if settings.CACHE_BACKEND == "redis":
+        generations = RedisGenerations(name)
+    else:
+        generations = LocalGenerations(name)
+    GENERATIONS[name] = generations
+    return generations
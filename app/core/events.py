@@ -0,0 +1,143 @@
+# app/core/events.py
+"""
+Broadcaster de eventos de clientes para GET /customers/stream (SSE).
+
+El service layer publica después de cada commit (publish() es sync y se
+llama desde el threadpool); cada conexión SSE tiene su Subscription con una
+asyncio.Queue acotada en el event loop. Con EVENTS_BACKEND=redis, publish()
+va a un canal pub/sub y un hilo por worker reparte lo que llega a sus
+suscriptores locales, así un evento llega a todos los workers.
+"""
+import asyncio
+import json
+import threading
+from typing import Optional, Set
+
+from app.config import settings
+from app.core.cache import get_redis
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Se encola cuando el buffer de un cliente se llena: el cliente debe resincronizar
+OVERFLOW = {"type": "overflow"}
+
+
+class Subscription:
+    def __init__(
+            self, loop: asyncio.AbstractEventLoop, owner_id: Optional[int], maxsize: int
+    ):
+        self.loop = loop
+        self.owner_id = owner_id          # None = admin, recibe todo
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def accepts(self, event: dict) -> bool:
+        # owner_id None en el evento = dueño desconocido (bulk de admin): va a todos
+        return self.owner_id is None or event.get("owner_id") in (None, self.owner_id)
+
+    def offer(self, event: dict) -> None:
+        """Corre en el event loop del cliente (vía call_soon_threadsafe)."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente lento: se descarta lo pendiente y se le avisa que resincronice
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class EventBroker:
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.published = 0
+
+    @property
+    def use_redis(self) -> bool:
+        return settings.EVENTS_BACKEND == "redis"
+
+    # ---- suscripciones (desde el event loop) ----
+    def subscribe(self, owner_id: Optional[int]) -> Subscription:
+        subscription = Subscription(
+            asyncio.get_running_loop(), owner_id, settings.SSE_CLIENT_BUFFER
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    # ---- publicación (desde cualquier hilo) ----
+    def publish(self, event: dict) -> None:
+        """Nunca rompe la escritura que lo originó: los errores solo se loguean."""
+        self.published += 1
+        if not self.use_redis:
+            self.dispatch(event)
+            return
+        try:
+            get_redis().publish(
+                f"events:{self.channel}", json.dumps(event, default=str)
+            )
+        except Exception:
+            logger.exception("Could not publish %s event", self.channel)
+
+    def dispatch(self, event: dict) -> None:
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.accepts(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:  # loop cerrado: la conexión ya no existe
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.EVENTS_BACKEND,
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+        }
+
+    # ---- fan-out Redis (un hilo por worker) ----
+    def start(self) -> None:
+        if not self.use_redis or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name=f"events-{self.channel}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(f"events:{self.channel}")
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self.dispatch(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Redis event listener failed, reconnecting")
+                self._stop.wait(1.0)
+            finally:
+                pubsub.close()
+
+
+customer_events = EventBroker("customers")
@@ -3,7 +3,7 @@ from pathlib import Path
 # Ruta a las claves
 PRIVATE_KEY_PATH = Path("keys/private.pem")
 PUBLIC_KEY_PATH = Path("keys/public.pem")  # la pública actual
-KID_CURRENT = "2025-11-23-v1"
+KID_CURRENT = "2026-10-20-v2"  # rotada: la v1 quedó expuesta
 
 # Carga de claves
 with PRIVATE_KEY_PATH.open() as f:
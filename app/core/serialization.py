@@ -0,0 +1,66 @@
+# app/core/serialization.py
+"""
+Camino rápido para serializar listados.
+
+Los datos que salen de la BD ya se validaron al escribirse, así que para leer
+se usa una variante "confiable" del modelo de respuesta: mismos campos, pero
+EmailStr pasa a str (validar emails es de lejos lo más caro de model_validate).
+Toda la página se valida en una sola llamada a un TypeAdapter y, con
+FAST_JSON_RESPONSES, se serializa una sola vez con FastJSONResponse en lugar
+de re-validarla contra response_model y pasarla por jsonable_encoder + json.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter, create_model
+
+try:
+    import orjson
+except ImportError:  # opcional: sin orjson se usa json de la stdlib
+    orjson = None
+
+
+def _relax(annotation):
+    if annotation is EmailStr:
+        return str
+    if annotation == Optional[EmailStr]:
+        return Optional[str]
+    return annotation
+
+
+@lru_cache(maxsize=256)
+def trusted_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Subclase de model sin validación de emails (para filas leídas de la BD)."""
+    relaxed = {
+        name: (_relax(field.annotation), field)
+        for name, field in model.model_fields.items()
+        if _relax(field.annotation) is not field.annotation
+    }
+    if not relaxed:
+        return model
+    return create_model(model.__name__, __base__=model, **relaxed)
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[trusted_model(model)])
+
+
+def validate_rows(model: Type[BaseModel], rows: Iterable[Any]) -> List[BaseModel]:
+    """Valida todas las filas (ORM o Row) en una sola pasada."""
+    return _list_adapter(model).validate_python(list(rows), from_attributes=True)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Los modelos pydantic se serializan con model_dump_json (una sola pasada en
+    pydantic-core, sin re-validar); el resto del contenido, con orjson si está.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
@@ -0,0 +1,120 @@
+# app/core/singleflight.py
+"""
+Coalescencia de lecturas idénticas concurrentes (single-flight).
+
+Mientras una consulta con cierta clave está en vuelo, los demás que piden la
+misma clave no van a la BD: esperan y reciben el mismo resultado (o la misma
+excepción). Cuando termina, la clave se libera; no es una cache. Si el que la
+ejecuta se cancela (cliente desconectado, shutdown) no hay resultado que
+compartir: se libera la clave y uno de los que esperaban la vuelve a ejecutar.
+
+El resultado viaja en un concurrent.futures.Future, así que sirve igual para
+endpoints sync (threadpool) y async (se espera con asyncio.wrap_future).
+Lo que se devuelve se comparte entre requests: tiene que ser inmutable y no
+depender de la sesión del que lo calculó (DTOs, ints, tuplas).
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.config import settings
+
+# Resultado del líder que se canceló: los que esperaban reintentan
+_ABANDONED = object()
+
+
+class SingleFlight:
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0    # consultas que realmente fueron a la BD
+        self.coalesced = 0   # llamadas que esperaron a una en vuelo
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """(future, es_líder): el primero para la clave la ejecuta, el resto espera."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.executed += 1
+            return future, True
+
+    def _finish(
+            self, key: str, future: Future, result: Any = None,
+            error: BaseException = None
+    ) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return fn()
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            result = future.result()
+            if result is not _ABANDONED:
+                return result
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            # Cancelación / interrupción propia del líder: no se contagia a los demás
+            self._finish(key, future, _ABANDONED)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await fn()
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            # shield: si se cancela este que espera, no se cancela el future compartido
+            result = await asyncio.shield(asyncio.wrap_future(future))
+            if result is not _ABANDONED:
+                return result
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, _ABANDONED)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self) -> dict:
+        total = self.executed + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+
+# Registro (para /metrics/singleflight)
+FLIGHTS: Dict[str, SingleFlight] = {}
+
+
+def build_flight(name: str) -> SingleFlight:
+    flight = SingleFlight(name)
+    FLIGHTS[name] = flight
+    return flight
@@ -1,11 +1,39 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.util import identity_key
 from app.config import settings
 
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}/{settings.DB_NAME}"
+_MYSQL_AUTH = (
+    f"{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}/{settings.DB_NAME}"
+)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL or f"mysql+pymysql://{_MYSQL_AUTH}"
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or f"mysql+asyncmy://{_MYSQL_AUTH}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _connect_args(url: str) -> dict:
+    if url.startswith("mysql"):
+        # Sesión en UTC: los server_default (NOW()) coinciden con los defaults de Python
+        return {"init_command": "SET time_zone = '+00:00'"}
+    if url.startswith("sqlite") and "aiosqlite" not in url:
+        # los endpoints sync corren en el threadpool
+        return {"check_same_thread": False}
+    return {}
+
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, pool_pre_ping=True,
+    connect_args=_connect_args(SQLALCHEMY_DATABASE_URL)
+)
+# expire_on_commit=False: después del commit las entidades siguen cargadas y no
+# hace falta un refresh() (un SELECT más) para devolverlas
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Dependency
 def get_connection():
@@ -13,4 +41,169 @@ def get_connection():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# =========================
+# STACK ASYNC (DB_ASYNC=1)
+# =========================
+# Se crea al primer uso: con DB_ASYNC=0 no hace falta tener instalado el driver async
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, pool_pre_ping=True,
+            connect_args=_connect_args(ASYNC_DATABASE_URL)
+        )
+        _async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_connection():
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+# Driver sync de cada driver async: mismo servidor, misma base
+_SYNC_DRIVERS = {
+    "asyncmy": "pymysql", "aiomysql": "pymysql", "aiosqlite": "pysqlite",
+    "asyncpg": "psycopg2"
+}
+_sync_engines: Dict[str, Engine] = {}
+_sync_engines_lock = threading.Lock()
+
+
+def sync_engine_for(bind: Engine) -> Engine:
+    """
+    Engine sync sobre la misma base que bind. El sync_engine de un AsyncEngine sigue
+    usando el driver async y solo anda dentro del event loop: para los hilos de
+    background (audit writer) se crea una vez otro con la misma URL y el driver sync.
+    """
+    if not bind.dialect.is_async:
+        return bind
+    driver = _SYNC_DRIVERS.get(bind.url.get_driver_name())
+    if driver is None:
+        raise ValueError(f"No sync driver known for {bind.url.drivername}")
+    sync_url = bind.url.set(drivername=f"{bind.url.get_backend_name()}+{driver}")
+    url = sync_url.render_as_string(hide_password=False)
+    with _sync_engines_lock:
+        if url not in _sync_engines:
+            if url == engine.url.render_as_string(hide_password=False):
+                _sync_engines[url] = engine
+            else:
+                _sync_engines[url] = create_engine(
+                    url, pool_pre_ping=True, connect_args=_connect_args(url)
+                )
+        return _sync_engines[url]
+
+def stream_with_own_session(db: Session, build_chunks):
+    """
+    Para respuestas en streaming: abre una sesión propia sobre el mismo engine
+    (la del request se cierra al terminar el endpoint) y la cierra cuando el
+    stream termina o el cliente se desconecta.
+    """
+    own_db = Session(bind=db.get_bind(), autoflush=False)
+    try:
+        chunks = build_chunks(own_db)
+    except Exception:
+        own_db.close()
+        raise
+
+    def _iterate():
+        try:
+            yield from chunks
+        finally:
+            own_db.close()
+
+    return _iterate()
+
+
+def update_returning(db: Session, stmt, model, pk) -> Optional[dict]:
+    """
+    Ejecuta un UPDATE de una sola fila y devuelve su estado nuevo ({columna: valor})
+    o None si el WHERE no matcheó. Con RETURNING (SQLite, PostgreSQL) es una sola
+    sentencia; en MySQL, UPDATE + SELECT por PK dentro de la misma transacción.
+    """
+    table = model.__table__
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*table.c)).mappings().first()
+    # pymysql usa CLIENT_FOUND_ROWS: rowcount = filas que matchearon, aunque no cambien
+    elif db.execute(stmt).rowcount == 0:
+        row = None
+    else:
+        row = db.execute(select(table).where(table.c.id == pk)).mappings().one()
+    if row is None:
+        return None
+    expire_identities(db, model, [pk])
+    return dict(row)
+
+
+def expire_identities(db: Session, model, ids: Iterable) -> None:
+    """
+    Con expire_on_commit=False el commit ya no invalida las entidades cargadas:
+    después de un UPDATE Core (synchronize_session=False) se expiran las que
+    haya en la sesión, sin consultar nada, para que no se lean valores viejos.
+    """
+    for pk in ids:
+        instance = db.identity_map.get(identity_key(model, pk))
+        if instance is not None:
+            db.expire(instance)
+
+
+# =========================
+# EFECTOS POST-COMMIT Y TRANSACCIÓN DE BATCH
+# =========================
+# None = no hay batch abierto: los efectos corren en el acto
+_pending_effects: ContextVar[Optional[List[Callable[[], None]]]] = ContextVar(
+    "pending_effects", default=None
+)
+
+
+def after_commit(effect: Callable[[], None]) -> None:
+    """
+    Efectos que solo valen si la escritura se confirmó (audit, eventos, caches).
+    Se llama después del commit: fuera de un batch corre ya; dentro, se encola
+    hasta que el batch confirme (o se descarta si vuelve atrás).
+    """
+    pending = _pending_effects.get()
+    if pending is None:
+        effect()
+    else:
+        pending.append(effect)
+
+
+@contextmanager
+def collect_after_commit():
+    """Junta los after_commit del bloque; quien lo abre decide si correrlos."""
+    pending: List[Callable[[], None]] = []
+    token = _pending_effects.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_effects.reset(token)
+
+
+@contextmanager
+def batch_session(db: Session):
+    """
+    Sesión sobre una conexión con la transacción ya abierta: con
+    join_transaction_mode="create_savepoint" los commit() de servicios y
+    repositorios son RELEASE SAVEPOINT y sus rollback() vuelven solo a su
+    savepoint. El commit real lo hace quien la abre (session.bind.commit());
+    si no lo hace, al salir se descarta todo.
+    """
+    connection = db.get_bind().connect()
+    connection.begin()
+    session = Session(
+        bind=connection, join_transaction_mode="create_savepoint", autoflush=False,
+        expire_on_commit=False
+    )
+    try:
+        yield session
+    finally:
+        session.close()
+        connection.close()
@@ -0,0 +1,26 @@
+# app/db/types.py
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# DATETIME de MySQL sin fsp redondea a segundos: dos escrituras en el mismo segundo
+# quedarían con la misma versión (ETag / If-Match). SQLite y
+# PostgreSQL ya guardan microsegundos
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+class now_precise(FunctionElement):
+    """CURRENT_TIMESTAMP con el fsp de PreciseDateTime (MySQL exige el mismo)."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(now_precise)
+def _now_precise_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(now_precise, "mysql")
+def _now_precise_mysql(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP(6)"
@@ -1,8 +1,10 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_connection
+from app.db.session import get_async_connection, get_connection
 from app.models.user import User
+from app.repositories.async_auth_repository import AsyncAuthRepository
 from app.services.revoked_token_service import RevokedTokenService
 from app.services.auth_service import AuthService
 
@@ -30,3 +32,25 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
 
     return user
 
+
+async def get_current_user_async(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_connection)
+) -> User:
+    """get_current_user sobre AsyncSession (rutas async con DB_ASYNC=1)."""
+    payload = AuthService.decode_access_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    if await AsyncAuthRepository.is_token_revoked(db, payload.get("jti")):
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    user_id: int = int(payload.get("sub"))
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    user = await AsyncAuthRepository.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return user
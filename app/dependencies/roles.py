@@ -1,6 +1,6 @@
 # app/dependencies/roles.py
 from fastapi import Depends, HTTPException
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, get_current_user_async
 from app.models.user import User
 
 def role_required(*roles: str):
@@ -12,4 +12,13 @@ def role_required(*roles: str):
         if getattr(current_user, "role", "user") not in roles:
             raise HTTPException(status_code=403, detail="Permiso denegado")
         return current_user
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def role_required_async(*roles: str):
+    """role_required para rutas async: mismo chequeo, sin pasar por el threadpool."""
+    async def wrapper(current_user: User = Depends(get_current_user_async)):
+        if getattr(current_user, "role", "user") not in roles:
+            raise HTTPException(status_code=403, detail="Permiso denegado")
+        return current_user
+    return wrapper
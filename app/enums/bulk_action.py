@@ -0,0 +1,10 @@
+from enum import Enum
+
+class CustomerBulkAction(str, Enum):
+    SET_STATUS = "set_status"
+    SET_SOURCE = "set_source"
+    ADD_TAGS = "add_tags"
+    REMOVE_TAGS = "remove_tags"
+    SOFT_DELETE = "soft_delete"
+    REACTIVATE = "reactivate"
+    TRANSFER_OWNER = "transfer_owner"
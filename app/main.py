@@ -1,11 +1,50 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.customers import router as customer_router
+from app.api.v1.customers_async import router as async_customer_router
 from app.api.v1.users import router as user_router
 from app.api.v1.auth import router as authorization_router
+from app.api.v1.metrics import router as metrics_router
+from app.api.v1.batch import router as batch_router
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.config import settings
+from app.core import audit  # noqa: F401  (registra los listeners del audit log)
+from app.core.events import customer_events
+from app.workers.archiver import archiver
+from app.workers.audit_writer import audit_writer
+
+# -----------------------------
+# ⏱️ Jobs en background (arrancan y paran con la app)
+# -----------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_writer.start()
+    archiver.start()
+    customer_events.start()
+    yield
+    customer_events.stop()
+    archiver.stop()
+    audit_writer.stop()  # vacía la cola antes de salir
+
+app = FastAPI(title="Customer Manager API", lifespan=lifespan)
 
-app = FastAPI(title="Customer Manager API")
+# -----------------------------
+# 🔁 Idempotency-Key (reintentos de POST sin duplicar escrituras)
+# Se registra antes que CORS para que CORS quede por fuera y también
+# agregue sus headers a las respuestas reproducidas.
+# -----------------------------
+app.add_middleware(IdempotencyMiddleware)
+
+# -----------------------------
+# 🗜️ Compresión (gzip; br / zstd si están instalados)
+# Por fuera de Idempotency: se guardan las respuestas sin comprimir y cada
+# reintento se comprime según su propio Accept-Encoding.
+# -----------------------------
+app.add_middleware(CompressionMiddleware)
 
 # -----------------------------
 # 🚀 CORS CONFIG (SOLUCIÓN AL 405)
@@ -21,9 +60,14 @@ app.add_middleware(
 # -----------------------------
 # 🔗 Rutas
 # -----------------------------
+if settings.DB_ASYNC:
+    # Primero: las rutas calientes async tapan a sus equivalentes sync
+    app.include_router(async_customer_router, prefix="/customers", tags=["Customers"])
 app.include_router(customer_router, prefix="/customers", tags=["Customers"])
 app.include_router(user_router, prefix="/users", tags=["Users"])
 app.include_router(authorization_router, prefix="/auth", tags=["auth"])
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
+app.include_router(batch_router, prefix="/batch", tags=["Batch"])
 
 @app.get("/")
 def root():
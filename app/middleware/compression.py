@@ -0,0 +1,242 @@
+# app/middleware/compression.py
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli no se ofrece br
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # opcional: sin zstandard no se ofrece zstd
+    zstandard = None
+
+# Niveles: buena relación tamaño / CPU para JSON de pocos cientos de KB
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Ya comprimidos (o que no ganan nada) y SSE, que necesita cada evento al instante
+SKIPPED_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/woff", "application/zip", "application/gzip",
+    "application/x-7z-compressed", "application/octet-stream", "text/event-stream",
+)
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> Dict[str, Callable]:
+    encoders = {"gzip": _GzipEncoder}
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    return encoders
+
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Primera codificación de preference que el cliente acepta (q > 0), o None."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+
+    for encoding in preference:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Comprime las respuestas según Accept-Encoding (zstd / br si están
+    instalados, gzip siempre; el orden lo da COMPRESSION_ENCODINGS).
+
+    - Respuestas de un solo mensaje: solo si pesan al menos COMPRESSION_MIN_SIZE.
+    - Streaming (export): se comprime por chunk con flush, así el cliente
+      recibe cada tanda a medida que sale, sin juntar todo en memoria.
+    - No toca las que ya traen Content-Encoding, ni tipos ya comprimidos o SSE.
+    - El ETag pasa a débil (W/): el cuerpo comprimido no es byte a byte el mismo,
+      pero If-None-Match sigue coincidiendo (comparación débil, ver etag_matches).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None,
+                 encodings: Optional[List[str]] = None):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+        encoders = available_encoders()
+        self.encoders = {
+            name: encoders[name]
+            for name in (
+                encodings if encodings is not None else settings.COMPRESSION_ENCODINGS
+            )
+            if name in encoders
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encoders:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), list(self.encoders)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressedResponder(
+            self.app, self.encoders[encoding], encoding, self.minimum_size
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(
+            self, app: ASGIApp, encoder_factory: Callable, encoding: str,
+            minimum_size: int
+    ):
+        self.app = app
+        self.encoder_factory = encoder_factory
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Se retiene hasta ver el primer chunk: de él depende si se comprime
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or content_type.startswith(SKIPPED_CONTENT_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body and len(body) < self.minimum_size:
+                # Chico: no compensa; igual varía según Accept-Encoding
+                self._vary()
+                self.passthrough = True
+                await self._send_start()
+                await self.send(message)
+                return
+
+            self.encoder = self.encoder_factory()
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            self._vary()
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send_start()
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self._send_start()
+
+        if more_body:
+            chunk = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            chunk = self.encoder.compress(body) + self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    def _vary(self) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        vary = headers.get("vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+
+    async def _send_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
@@ -0,0 +1,196 @@
+# app/middleware/idempotency.py
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from typing import Iterable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.cache import build_cache
+from app.services.auth_service import AuthService
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+idempotency_store = build_cache(
+    "idempotency",
+    maxsize=settings.IDEMPOTENCY_MAXSIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    # por proceso igual sirve: cubre los reintentos que caen en el mismo worker
+    invalidated_on_write=False,
+)
+
+
+class IdempotencyMiddleware:
+    """
+    Reintentos seguros de POST con header Idempotency-Key.
+
+    - La primera request con una clave toma un lock (add atómico en el store)
+      y se ejecuta; su respuesta queda guardada IDEMPOTENCY_TTL_SECONDS.
+    - Las repeticiones con la misma clave y el mismo body reciben la respuesta
+      guardada sin tocar la BD (header Idempotent-Replayed: true).
+    - Si llega un duplicado mientras la primera sigue en curso, espera a que
+      termine (hasta IDEMPOTENCY_WAIT_SECONDS) y la reproduce; si no, 409.
+    - Misma clave con otro body => 422. Las respuestas 5xx no se guardan.
+
+    La clave se aísla por usuario (sub del access token) + path, así dos usuarios
+    no chocan y un reintento con el token ya refrescado sigue siendo el mismo.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Optional[Iterable[str]] = None):
+        self.app = app
+        self.paths = set(paths if paths is not None else settings.IDEMPOTENT_PATHS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http" or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None or not idempotency_store.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"},
+                status_code=400
+            )(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        store_key = hashlib.sha256(
+            b"|".join([_principal(headers), scope["path"].encode(), raw_key])
+        ).hexdigest()
+
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while not await run_in_threadpool(
+                idempotency_store.add, store_key, pending,
+                settings.IDEMPOTENCY_LOCK_TTL_SECONDS
+        ):
+            raw = await run_in_threadpool(idempotency_store.get, store_key)
+            if raw is None:
+                # la original terminó con 5xx y liberó el lock: se intenta tomarlo
+                continue
+            record = json.loads(raw)
+            if record["fingerprint"] != fingerprint:
+                detail = "Idempotency-Key was already used with a different payload"
+                await JSONResponse({"detail": detail}, status_code=422)(
+                    scope, receive, send
+                )
+                return
+            if record["state"] == "done":
+                await _replay(record, send)
+                return
+            if time.monotonic() >= deadline:
+                detail = "A request with this Idempotency-Key is still in progress"
+                await JSONResponse({"detail": detail}, status_code=409)(
+                    scope, receive, send
+                )
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+
+        await self._execute(
+            scope, _replay_body(body, receive), send, store_key, fingerprint
+        )
+
+    async def _execute(
+            self, scope: Scope, receive: Receive, send: Send, store_key: str,
+            fingerprint: str
+    ):
+        status = 500
+        response_headers: List[List[str]] = []
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [
+                    [k.decode("latin-1"), v.decode("latin-1")]
+                    for k, v in message["headers"]
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            await run_in_threadpool(idempotency_store.delete, store_key)
+            raise
+
+        if status >= 500:
+            # Error del servidor: se libera el lock para que
+            # el reintento se ejecute de nuevo
+            await run_in_threadpool(idempotency_store.delete, store_key)
+            return
+
+        record = json.dumps({
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status": status,
+            "headers": response_headers,
+            "body": base64.b64encode(b"".join(chunks)).decode(),
+        })
+        await run_in_threadpool(idempotency_store.set, store_key, record)
+
+
+def _principal(headers: dict) -> bytes:
+    """
+    Dueño de la clave: el usuario del access token, no el string del token (un
+    reintento después de refrescarlo es la misma operación). Sin token válido se
+    usa el header tal cual: esa request igual termina en 401.
+    """
+    authorization = headers.get(b"authorization", b"")
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = AuthService.decode_access_token(token.strip())
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}".encode()
+    return b"raw:" + authorization
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """receive que entrega el body ya leído y después delega en el original."""
+    sent = False
+
+    async def wrapper() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return wrapper
+
+
+async def _replay(record: dict, send: Send) -> None:
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+    headers.append((REPLAYED_HEADER, b"true"))
+    await send(
+        {"type": "http.response.start", "status": record["status"], "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
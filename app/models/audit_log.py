@@ -0,0 +1,28 @@
+# app/models/audit_log.py
+from datetime import datetime, timezone
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, JSON, Index
+from app.db.base import Base
+
+class AuditLog(Base):
+    """
+    Historial de cambios por campo de customers / users. Sin FKs: sobrevive al
+    archivado y su inserción no compite por locks con las tablas auditadas.
+    """
+    __tablename__ = "audit_log"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    entity = Column(String(30), nullable=False)        # "customer" | "user"
+    entity_id = Column(Integer, nullable=False)
+    # create | update | delete | reactivate | bulk_update ...
+    action = Column(String(30), nullable=False)
+    # {campo: {"old": ..., "new": ...}}
+    changes = Column(JSON, nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    created_at = Column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        # GET /customers/{id}/history: WHERE entity, entity_id ORDER BY id DESC
+        Index("ix_audit_log_entity", "entity", "entity_id", "id"),
+    )
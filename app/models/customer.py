@@ -1,16 +1,29 @@
 # app/models/customer.py
 from datetime import datetime, timezone
-from sqlalchemy import Column, Boolean, Integer, String, DateTime, JSON, Enum as SAEnum, ForeignKey
+from sqlalchemy.orm import validates
+from sqlalchemy import (
+    Column, Boolean, Integer, String, DateTime, JSON, Enum as SAEnum, ForeignKey, Index,
+    func
+)
 from app.db.base import Base
+from app.db.types import PreciseDateTime, now_precise
 from app.enums.lead_status import LeadStatus
 from app.enums.lead_source import LeadSource
+from app.utils.dedupe_keys import normalize_email, normalize_name
 
 class Customer(Base):
     __tablename__ = "customers"
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(120), nullable=False)
+    # full_name normalizado (minúsculas, sin acentos) para el typeahead por prefijo.
+    # Por ORM se mantiene con @validates; los INSERT/UPDATE
+    # Core lo setean en el repositorio
+    name_search = Column(String(120), nullable=True)
     email = Column(String(120), unique=True, nullable=True)
+    # email normalizado (minúsculas) para el typeahead,
+    # mismo mantenimiento que name_search
+    email_search = Column(String(120), nullable=True)
     phone = Column(String(30), nullable=True)
 
     source = Column(SAEnum(LeadSource), nullable=False, default=LeadSource.MANUAL)
@@ -23,8 +36,40 @@ class Customer(Base):
     deleted_at = Column(DateTime, nullable=True)
 
     # Auditoría
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), server_default=func.now()
+    )
+    # Es la versión de la fila (ETag, If-Match, cursor del
+    # change feed): con microsegundos
+    updated_at = Column(
+        PreciseDateTime, default=lambda: datetime.now(timezone.utc),
+        server_default=now_precise(), onupdate=lambda: datetime.now(timezone.utc)
+    )
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     deleted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    __table_args__ = (
+        # Candidatos del archivado: WHERE is_deleted AND deleted_at < corte
+        Index("ix_customers_deleted_at", "is_deleted", "deleted_at"),
+        # Change feed: keyset (updated_at, id), global y por dueño
+        Index("ix_customers_updated_id", "updated_at", "id"),
+        Index("ix_customers_owner_updated_id", "created_by", "updated_at", "id"),
+        # Typeahead: range scan por prefijo (is_deleted
+        # adelante: está en todas las lecturas)
+        Index("ix_customers_name_search", "is_deleted", "name_search"),
+        Index(
+            "ix_customers_owner_name_search", "created_by", "is_deleted", "name_search"
+        ),
+        Index("ix_customers_email_search", "is_deleted", "email_search"),
+    )
+
+    @validates("full_name")
+    def _sync_name_search(self, key, value):
+        self.name_search = normalize_name(value)
+        return value
+
+    @validates("email")
+    def _sync_email_search(self, key, value):
+        self.email_search = normalize_email(value)
+        return value
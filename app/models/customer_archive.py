@@ -0,0 +1,40 @@
+# app/models/customer_archive.py
+from datetime import datetime, timezone
+from sqlalchemy import Column, Boolean, Integer, String, DateTime, JSON, Enum as SAEnum
+from app.db.base import Base
+from app.enums.lead_status import LeadStatus
+from app.enums.lead_source import LeadSource
+
+class CustomerArchive(Base):
+    """
+    Clientes eliminados hace más de ARCHIVE_AFTER_DAYS, fuera de la tabla caliente.
+    Mismas columnas que customers (mismo id) + archived_at; sin UNIQUE en email ni
+    FKs, para que el archivo no bloquee altas nuevas ni el archivado de usuarios.
+    """
+    __tablename__ = "customers_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    full_name = Column(String(120), nullable=False)
+    name_search = Column(String(120), nullable=True)
+    email = Column(String(120), nullable=True, index=True)
+    email_search = Column(String(120), nullable=True)
+    phone = Column(String(30), nullable=True)
+
+    source = Column(SAEnum(LeadSource), nullable=False)
+    status = Column(SAEnum(LeadStatus), nullable=False)
+
+    notes = Column(String(255), nullable=True)
+    tags = Column(JSON)
+
+    is_deleted = Column(Boolean, nullable=False)
+    deleted_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    created_by = Column(Integer, nullable=False, index=True)
+    updated_by = Column(Integer, nullable=False)
+    deleted_by = Column(Integer, nullable=True)
+
+    archived_at = Column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,18 @@
+# app/models/customer_dedupe_key.py
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from app.db.base import Base
+
+class CustomerDedupeKey(Base):
+    """Claves de bloqueo para duplicados (teléfono, nombre fonético, email local)."""
+    __tablename__ = "customer_dedupe_keys"
+
+    customer_id = Column(
+        Integer, ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind = Column(String(10), primary_key=True)   # phone | name | email
+    key = Column(String(120), primary_key=True)
+
+    __table_args__ = (
+        # (kind, key) primero: "¿quién más tiene esta clave?" es un range scan
+        Index("ix_customer_dedupe_keys_lookup", "kind", "key", "customer_id"),
+    )
@@ -0,0 +1,17 @@
+# app/models/customer_tag.py
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from app.db.base import Base
+
+class CustomerTag(Base):
+    """Customer.tags (JSON) normalizado para filtrar y agrupar por tag con índices."""
+    __tablename__ = "customer_tags"
+
+    customer_id = Column(
+        Integer, ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag = Column(String(50), primary_key=True)
+
+    __table_args__ = (
+        # tag primero: resuelve tags_any / tags_all y las facetas sin tocar customers
+        Index("ix_customer_tags_tag_customer", "tag", "customer_id"),
+    )
@@ -44,19 +44,19 @@ class UserToken(Base):
     revoked_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     revoked_by_user = relationship("User", foreign_keys=[revoked_by])
     revoked_reason = Column(String(255), nullable=True)
-    revoked_at = Column(DateTime(timezone=True), nullable=True, default=datetime.now(timezone.utc))
+    revoked_at = Column(DateTime(timezone=True), nullable=True)  # se setea al revocar
 
     # Auditoría
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc)
     )
     updated_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc)
     )
 
     # Expiración real del token
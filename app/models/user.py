@@ -18,8 +18,12 @@ class User(Base):
     deleted_at = Column(DateTime, nullable=True)
 
     # Auditoría
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    # Defaults por fila (callables): el valor viaja en el INSERT y no hay que releerlo
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc)
+    )
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     deleted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
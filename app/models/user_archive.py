@@ -0,0 +1,28 @@
+# app/models/user_archive.py
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from app.db.base import Base
+
+class UserArchive(Base):
+    """Usuarios borrados hace más de ARCHIVE_AFTER_DAYS (users + archived_at)."""
+    __tablename__ = "users_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    username = Column(String, nullable=False, index=True)
+    email = Column(String, nullable=False)
+    full_name = Column(String, nullable=True)
+    hashed_password = Column(String, nullable=False)
+    role = Column(String)
+
+    is_deleted = Column(Boolean, nullable=False)
+    deleted_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    created_by = Column(Integer, nullable=False)
+    updated_by = Column(Integer, nullable=False)
+    deleted_by = Column(Integer, nullable=True)
+
+    archived_at = Column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,177 @@
+# repositories/archive_repository.py
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import DateTime, Table, delete, exists, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.customer import Customer
+from app.models.customer_archive import CustomerArchive
+from app.models.customer_dedupe_key import CustomerDedupeKey
+from app.models.customer_tag import CustomerTag
+# Registran en el metadata sus FKs a users (ver _unreferenced)
+from app.models.security.two_factor_codes import TwoFactorCode  # noqa: F401
+from app.models.security.user_security_info import UserSecurityInfo  # noqa: F401
+from app.models.security.user_tokens import UserToken  # noqa: F401
+from app.models.user import User
+from app.models.user_archive import UserArchive
+from app.repositories.customer_dedupe_repository import CustomerDedupeRepository
+from app.repositories.customer_tag_repository import CustomerTagRepository
+
+customers = Customer.__table__
+users = User.__table__
+
+
+class ArchiveRepository:
+
+    # =========================
+    # ARCHIVADO (tabla caliente -> archivo), un batch por transacción
+    # =========================
+    @staticmethod
+    def archive_customers_batch(db: Session, cutoff: datetime, limit: int) -> int:
+        ids = db.scalars(
+            select(customers.c.id)
+            .where(customers.c.is_deleted == True, customers.c.deleted_at < cutoff)
+            .order_by(customers.c.id)
+            .limit(limit)
+        ).all()
+        if not ids:
+            return 0
+
+        ArchiveRepository._copy(db, customers, CustomerArchive.__table__, ids)
+        # customer_tags / customer_dedupe_keys tienen ON DELETE CASCADE, pero
+        # SQLite no lo aplica sin PRAGMA
+        db.execute(delete(CustomerTag).where(CustomerTag.customer_id.in_(ids)))
+        db.execute(delete(CustomerDedupeKey).where(CustomerDedupeKey.customer_id.in_(ids)))
+        db.execute(delete(customers).where(customers.c.id.in_(ids)))
+        db.commit()
+        return len(ids)
+
+    @staticmethod
+    def archive_users_batch(db: Session, cutoff: datetime, limit: int) -> int:
+        """Solo usuarios que nadie referencia (clientes, tokens, otros usuarios...)."""
+        ids = db.scalars(
+            select(users.c.id)
+            .where(
+                users.c.is_deleted == True,
+                users.c.deleted_at < cutoff,
+                *ArchiveRepository._unreferenced(users),
+            )
+            .order_by(users.c.id)
+            .limit(limit)
+        ).all()
+        if not ids:
+            return 0
+
+        ArchiveRepository._copy(db, users, UserArchive.__table__, ids)
+        db.execute(delete(users).where(users.c.id.in_(ids)))
+        db.commit()
+        return len(ids)
+
+    @staticmethod
+    def _copy(db: Session, source: Table, archive: Table, ids: List[int]) -> None:
+        """INSERT INTO archive (...) SELECT ..., now FROM source WHERE id IN (...)."""
+        columns = [c.name for c in source.c]
+        now = literal(datetime.now(timezone.utc), DateTime)
+        db.execute(
+            insert(archive).from_select(
+                columns + ["archived_at"],
+                select(*source.c, now).where(source.c.id.in_(ids)),
+            )
+        )
+
+    @staticmethod
+    def _unreferenced(table: Table) -> list:
+        """
+        NOT EXISTS por cada FK que apunta a table.id, leídas del metadata (así un
+        modelo nuevo con FK a users no rompe el archivado). Las auto-referencias
+        de una fila a sí misma (created_by = id) no cuentan.
+        """
+        conditions = []
+        for other in Base.metadata.tables.values():
+            for fk in other.foreign_keys:
+                if fk.column.table is not table:
+                    continue
+                if other is table:
+                    ref = other.alias()
+                    where = [
+                        ref.c[fk.parent.name] == table.c.id, ref.c.id != table.c.id
+                    ]
+                else:
+                    where = [fk.parent == table.c.id]
+                conditions.append(~exists().where(*where))
+        return conditions
+
+    # =========================
+    # RESTAURACIÓN (archivo -> tabla caliente, mismo id; sin commit)
+    # =========================
+    @staticmethod
+    def restore_customer(db: Session, customer_id: int) -> bool:
+        archive = CustomerArchive.__table__
+        if not ArchiveRepository._restore(db, archive, customers, customer_id):
+            return False
+        row = db.execute(
+            select(
+                customers.c.tags, customers.c.full_name, customers.c.phone,
+                customers.c.email
+            )
+            .where(customers.c.id == customer_id)
+        ).one()
+        CustomerTagRepository.sync(db, {customer_id: row.tags})
+        CustomerDedupeRepository.sync(
+            db, {customer_id: (row.full_name, row.phone, row.email)}
+        )
+        return True
+
+    @staticmethod
+    def restore_user(db: Session, user_id: int) -> bool:
+        return ArchiveRepository._restore(db, UserArchive.__table__, users, user_id)
+
+    @staticmethod
+    def missing_customer_references(db: Session, customer_id: int) -> List[str]:
+        return ArchiveRepository._missing_references(
+            db, CustomerArchive.__table__, customers, customer_id
+        )
+
+    @staticmethod
+    def missing_user_references(db: Session, user_id: int) -> List[str]:
+        return ArchiveRepository._missing_references(
+            db, UserArchive.__table__, users, user_id
+        )
+
+    @staticmethod
+    def _missing_references(
+            db: Session, archive: Table, target: Table, row_id: int
+    ) -> List[str]:
+        """
+        Columnas FK de la fila archivada que apuntan a filas que ya no están en la
+        tabla caliente (p. ej. el dueño también se archivó): restaurarla violaría la FK.
+        """
+        row = db.execute(select(archive).where(archive.c.id == row_id)).first()
+        if row is None:
+            return []
+        missing = []
+        for fk in target.foreign_keys:
+            value = row._mapping[fk.parent.name]
+            if value is None or (fk.column.table is target and value == row_id):
+                continue
+            if not db.scalar(select(exists().where(fk.column == value))):
+                missing.append(fk.parent.name)
+        return sorted(missing)
+
+    @staticmethod
+    def _restore(db: Session, archive: Table, target: Table, row_id: int) -> bool:
+        columns = [c.name for c in target.c]
+        result = db.execute(
+            insert(target).from_select(
+                columns,
+                select(*[archive.c[name] for name in columns]).where(
+                    archive.c.id == row_id
+                )
+            )
+        )
+        if not result.rowcount:
+            return False
+        db.execute(delete(archive).where(archive.c.id == row_id))
+        return True
@@ -0,0 +1,19 @@
+# repositories/async_auth_repository.py
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.security.user_tokens import RevokedToken
+from app.models.user import User
+
+
+class AsyncAuthRepository:
+    """Las lecturas de get_current_user en cada request, sobre AsyncSession."""
+
+    @staticmethod
+    async def is_token_revoked(db: AsyncSession, jti: str) -> bool:
+        stmt = select(RevokedToken.id).where(RevokedToken.jti == jti).limit(1)
+        return await db.scalar(stmt) is not None
+
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        return await db.scalar(select(User).where(User.id == user_id))
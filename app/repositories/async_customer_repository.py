@@ -0,0 +1,59 @@
+# repositories/async_customer_repository.py
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.customer import Customer
+from app.repositories.customer_filter_repository import CustomerFilterRepository
+from app.repositories.customer_repository import CustomerRepository
+
+
+class AsyncCustomerRepository:
+    """
+    Lecturas calientes de clientes sobre AsyncSession. Usa los mismos
+    statements y la misma cache de entidades que los repositorios sync;
+    las escrituras pasan por los repositorios sync con AsyncSession.run_sync.
+    """
+
+    @staticmethod
+    async def count_and_last_update(
+            db: AsyncSession, conditions: Sequence
+    ) -> Tuple[int, Optional[object]]:
+        stmt = CustomerFilterRepository.count_and_last_update_stmt(conditions)
+        return (await db.execute(stmt)).one()
+
+    @staticmethod
+    async def select_rows(
+            db: AsyncSession, columns: Sequence[str], conditions: Sequence, order_by,
+            offset: int, limit: int
+    ) -> List:
+        stmt = CustomerFilterRepository.select_rows_stmt(
+            columns, conditions, order_by, offset, limit
+        )
+        return (await db.execute(stmt)).all()
+
+    @staticmethod
+    async def count_all_customers(
+            db: AsyncSession, user_id: int = None, is_admin: bool = False
+    ) -> int:
+        stmt = select(func.count(Customer.id)).where(Customer.is_deleted == False)
+        if not is_admin and user_id:
+            stmt = stmt.where(Customer.created_by == user_id)
+        return await db.scalar(stmt)
+
+    @staticmethod
+    async def get_customer_snapshot(
+            db: AsyncSession, customer_id: int
+    ) -> Optional[dict]:
+        """Como CustomerRepository.get_customer_snapshot: cache y, en miss, la BD."""
+        cached = CustomerRepository.cached_snapshot(customer_id)
+        if cached is not None:
+            return cached
+
+        customer = await db.scalar(
+            select(Customer).where(
+                Customer.id == customer_id, Customer.is_deleted == False
+            )
+        )
+        if not customer:
+            return None
+        return CustomerRepository.cache_snapshot(customer)
@@ -0,0 +1,29 @@
+# repositories/audit_repository.py
+from typing import List, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+
+
+class AuditRepository:
+
+    @staticmethod
+    def insert_many(bind, rows: List[dict]) -> None:
+        """Un INSERT por lote (executemany => multi-VALUES) en su propia transacción."""
+        if not rows:
+            return
+        with bind.begin() as conn:
+            conn.execute(insert(AuditLog), rows)
+
+    @staticmethod
+    def history(
+            db: Session, entity: str, entity_id: int, limit: int, offset: int
+    ) -> Tuple[int, List[AuditLog]]:
+        where = (AuditLog.entity == entity, AuditLog.entity_id == entity_id)
+        total = db.scalar(select(func.count(AuditLog.id)).where(*where))
+        items = db.scalars(
+            select(AuditLog).where(*where).order_by(AuditLog.id.desc()).offset(offset).limit(limit)
+        ).all()
+        return total, items
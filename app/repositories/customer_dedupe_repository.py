@@ -0,0 +1,96 @@
+# app/repositories/customer_dedupe_repository.py
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+from app.models.customer_dedupe_key import CustomerDedupeKey
+from app.utils.dedupe_keys import dedupe_keys
+
+
+class CustomerDedupeRepository:
+    """
+    Mantiene customer_dedupe_keys en sync con nombre / teléfono / email. Igual
+    que CustomerTagRepository, no hace commit: corre en la transacción de la escritura.
+    """
+
+    @staticmethod
+    def sync(
+            db: Session,
+            customers: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]
+    ) -> None:
+        """customers = {id: (full_name, phone, email)}"""
+        if not customers:
+            return
+        db.execute(delete(CustomerDedupeKey).where(CustomerDedupeKey.customer_id.in_(list(customers))))
+        rows = [
+            {"customer_id": customer_id, "kind": kind, "key": key}
+            for customer_id, fields in customers.items()
+            for kind, key in dedupe_keys(*fields)
+        ]
+        if rows:
+            db.execute(insert(CustomerDedupeKey), rows)
+
+    @staticmethod
+    def keys_of(db: Session, customer_id: int) -> List[Tuple[str, str]]:
+        return db.execute(
+            select(CustomerDedupeKey.kind, CustomerDedupeKey.key).where(
+                CustomerDedupeKey.customer_id == customer_id
+            )
+        ).all()
+
+    @staticmethod
+    def candidates(
+            db: Session, keys: Iterable[Tuple[str, str]], exclude_id: Optional[int],
+            owner_id: Optional[int], max_block: int
+    ) -> List[Tuple[Customer, List[str]]]:
+        """
+        Clientes activos que comparten alguna clave, con las claves que coinciden.
+        Bloques más grandes que max_block (p. ej. un nombre muy común) se ignoran:
+        no discriminan y harían la búsqueda lineal otra vez.
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+
+        sizes = db.execute(
+            select(CustomerDedupeKey.kind, CustomerDedupeKey.key, func.count())
+            .where(tuple_(CustomerDedupeKey.kind, CustomerDedupeKey.key).in_(keys))
+            .group_by(CustomerDedupeKey.kind, CustomerDedupeKey.key)
+        ).all()
+        keys = [(kind, key) for kind, key, size in sizes if size <= max_block]
+        if not keys:
+            return []
+
+        query = (
+            db.query(Customer, CustomerDedupeKey.kind)
+            .join(CustomerDedupeKey, CustomerDedupeKey.customer_id == Customer.id)
+            .filter(
+                tuple_(CustomerDedupeKey.kind, CustomerDedupeKey.key).in_(keys),
+                Customer.is_deleted == False,
+            )
+        )
+        if exclude_id is not None:
+            query = query.filter(Customer.id != exclude_id)
+        if owner_id is not None:
+            query = query.filter(Customer.created_by == owner_id)
+
+        matches: Dict[int, Tuple[Customer, List[str]]] = {}
+        for customer, kind in query.all():
+            matches.setdefault(customer.id, (customer, []))[1].append(kind)
+        return list(matches.values())
+
+    @staticmethod
+    def shared_blocks(
+            db: Session, max_block: int, after: Tuple[str, str], limit: int
+    ) -> List[Tuple[str, str]]:
+        """Claves compartidas por 2..max_block clientes, en orden (para el batch)."""
+        return db.execute(
+            select(CustomerDedupeKey.kind, CustomerDedupeKey.key)
+            .where(tuple_(CustomerDedupeKey.kind, CustomerDedupeKey.key) > after)
+            .group_by(CustomerDedupeKey.kind, CustomerDedupeKey.key)
+            .having(func.count().between(2, max_block))
+            .order_by(CustomerDedupeKey.kind, CustomerDedupeKey.key)
+            .limit(limit)
+        ).all()
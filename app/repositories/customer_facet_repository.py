@@ -0,0 +1,59 @@
+# app/repositories/customer_facet_repository.py
+from datetime import date, datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+
+BUCKETS = ("day", "week", "month")
+
+
+class CustomerFacetRepository:
+
+    @staticmethod
+    def created_bucket(dialect: str, bucket: str):
+        """Expresión que trunca created_at al inicio del día / semana (lunes) / mes."""
+        column = Customer.created_at
+        if dialect == "mysql":
+            if bucket == "month":
+                return func.date_format(column, "%Y-%m-01")
+            if bucket == "week":
+                return func.subdate(func.date(column), func.weekday(column))
+            return func.date(column)
+        if dialect == "sqlite":
+            if bucket == "month":
+                return func.strftime("%Y-%m-01", column)
+            if bucket == "week":
+                return func.date(column, "weekday 0", "-6 days")
+            return func.date(column)
+        # PostgreSQL y demás
+        return func.date(func.date_trunc(bucket, column))
+
+    @staticmethod
+    def grouped_counts(db: Session, scoped_query, bucket: str):
+        """
+        Una sola pasada GROUP BY (status, source, bucket). Las tres facetas se
+        obtienen sumando sobre este resultado, que tiene a lo sumo
+        |status| x |source| x |buckets| filas.
+        """
+        bucket_expr = CustomerFacetRepository.created_bucket(
+            db.get_bind().dialect.name, bucket
+        ).label("bucket")
+        count = func.count(Customer.id).label("count")
+        rows = (
+            scoped_query.order_by(None)
+            .with_entities(Customer.status, Customer.source, bucket_expr, count)
+            .group_by(Customer.status, Customer.source, bucket_expr)
+            .all()
+        )
+        return [
+            (status, source, CustomerFacetRepository._bucket_str(value), total)
+            for status, source, value, total in rows
+        ]
+
+    @staticmethod
+    def _bucket_str(value) -> str:
+        if isinstance(value, (date, datetime)):
+            return value.strftime("%Y-%m-%d")
+        return str(value)[:10] if value is not None else ""
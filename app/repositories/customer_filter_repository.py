@@ -1,30 +1,42 @@
 # app/repositories/customer_filter_repository.py
+from typing import List, Optional, Sequence, Tuple
+
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select, union
 
 from app.models.customer import Customer
-from app.schemas.customer_schema import CustomerQuery
+from app.repositories.customer_tag_repository import CustomerTagRepository
+from app.schemas.customer_schema import CustomerQuery, split_tags
 
 class CustomerFilterRepository:
 
     @staticmethod
-    def filter_customers(db: Session, filters: CustomerQuery):
-        query = db.query(Customer).filter(Customer.is_deleted == False)
+    def conditions(filters: CustomerQuery) -> list:
+        """Condiciones WHERE de los filtros, para la query ORM y para un SELECT Core."""
+        conditions = [Customer.is_deleted == False]
 
         # Filtros básicos
         if filters.email:
-            query = query.filter(Customer.email.ilike(f"%{filters.email}%"))
+            conditions.append(Customer.email.ilike(f"%{filters.email}%"))
         if filters.phone:
-            query = query.filter(Customer.phone.ilike(f"%{filters.phone}%"))
+            conditions.append(Customer.phone.ilike(f"%{filters.phone}%"))
         if filters.source:
-            query = query.filter(Customer.source == filters.source)
+            conditions.append(Customer.source == filters.source)
         if filters.status:
-            query = query.filter(Customer.status == filters.status)
+            conditions.append(Customer.status == filters.status)
+
+        # Tags (resueltos contra el índice de customer_tags)
+        tags_any = split_tags(getattr(filters, "tags_any", None))
+        if tags_any:
+            conditions.append(Customer.id.in_(CustomerTagRepository.customers_with_any(tags_any)))
+        tags_all = split_tags(getattr(filters, "tags_all", None))
+        if tags_all:
+            conditions.append(Customer.id.in_(CustomerTagRepository.customers_with_all(tags_all)))
 
         # Búsqueda general
         if filters.q:
             q_like = f"%{filters.q}%"
-            query = query.filter(
+            conditions.append(
                 or_(
                     Customer.full_name.ilike(q_like),
                     Customer.email.ilike(q_like),
@@ -34,8 +46,102 @@ class CustomerFilterRepository:
 
         # Filtros avanzados (ejemplos)
         if getattr(filters, "created_from", None):
-            query = query.filter(Customer.created_at >= filters.created_from)
+            conditions.append(Customer.created_at >= filters.created_from)
         if getattr(filters, "created_to", None):
-            query = query.filter(Customer.created_at <= filters.created_to)
+            conditions.append(Customer.created_at <= filters.created_to)
+
+        return conditions
+
+    @staticmethod
+    def filter_customers(db: Session, filters: CustomerQuery):
+        return db.query(Customer).filter(*CustomerFilterRepository.conditions(filters))
+
+    # =========================
+    # LECTURA SIN ORM (listados)
+    # =========================
+    @staticmethod
+    def count_and_last_update(
+            db: Session, conditions: Sequence
+    ) -> Tuple[int, Optional[object]]:
+        return db.execute(
+            CustomerFilterRepository.count_and_last_update_stmt(conditions)
+        ).one()
+
+    @staticmethod
+    def count_and_last_update_stmt(conditions: Sequence):
+        # Los statements se arman aparte para compartirlos con el repositorio async
+        return select(
+            func.count(Customer.id), func.max(Customer.updated_at)
+        ).where(*conditions)
+
+    @staticmethod
+    def select_rows(db: Session, columns: Sequence[str], conditions: Sequence, order_by,
+                    offset: int, limit: int) -> List:
+        """
+        SELECT Core de las columnas pedidas: devuelve Row (tuplas con acceso por
+        nombre), sin instancias ORM, identity map ni seguimiento de cambios.
+        """
+        return db.execute(
+            CustomerFilterRepository.select_rows_stmt(
+                columns, conditions, order_by, offset, limit
+            )
+        ).all()
+
+    @staticmethod
+    def select_rows_stmt(
+            columns: Sequence[str], conditions: Sequence, order_by, offset: int,
+            limit: int
+    ):
+        return (
+            select(*[getattr(Customer, c) for c in columns])
+            .where(*conditions)
+            .order_by(order_by)
+            .offset(offset)
+            .limit(limit)
+        )
+
+    # =========================
+    # TYPEAHEAD (prefijo de nombre normalizado o de email)
+    # =========================
+    @staticmethod
+    def suggest(
+            db: Session, name_prefix: str, email_prefix: str, owner_id: Optional[int],
+            limit: int
+    ) -> List:
+        """
+        Dos range scans acotados (ix_*name_search / ix_customers_email_search) unidos
+        con UNION; sin COUNT ni ILIKE '%q%'. Devuelve Row(id, full_name, email, phone,
+        name_search).
+        """
+        columns = (
+            Customer.id, Customer.full_name, Customer.email, Customer.phone,
+            Customer.name_search
+        )
+        scope = [Customer.is_deleted == False]
+        if owner_id is not None:
+            scope.append(Customer.created_by == owner_id)
+
+        branches = []
+        for column, prefix in (
+            (Customer.name_search, name_prefix), (Customer.email_search, email_prefix)
+        ):
+            if not prefix:
+                continue
+            # col >= 'ana' AND col < 'anb' en vez de LIKE 'ana%':
+            # rango de índice en cualquier motor
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            branches.append(
+                select(*columns)
+                .where(*scope, column >= prefix, column < upper)
+                .order_by(column)
+                .limit(limit)
+                .subquery()
+            )
+        if not branches:
+            return []
 
-        return query
\ No newline at end of file
+        # Cada rama va como subquery: SQLite no acepta LIMIT por rama en un UNION
+        stmt = union(*[select(*branch.c) for branch in branches]).subquery()
+        return db.execute(
+            select(stmt).order_by(stmt.c.name_search, stmt.c.id).limit(limit)
+        ).all()
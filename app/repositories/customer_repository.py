@@ -1,18 +1,172 @@
 # repositories/customer_repository.py
+import json
+from datetime import datetime, timezone
+from sqlalchemy import and_, bindparam, insert, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.core import audit
+from app.core.cache import build_cache
+from app.db.session import after_commit, expire_identities, update_returning
 from app.models.customer import Customer
+from app.repositories.customer_dedupe_repository import CustomerDedupeRepository
+from app.repositories.customer_tag_repository import CustomerTagRepository
+from app.schemas.customer_schema import CustomerRead
 from app.enums.lead_status import LeadStatus
+from app.utils.dedupe_keys import normalize_email, normalize_name
+
+# Read-through por id: {"created_by": ..., "customer": CustomerRead serializado}
+customer_cache = build_cache(
+    "customer_entity", settings.ENTITY_CACHE_MAXSIZE, settings.ENTITY_CACHE_TTL_SECONDS
+)
+
+# @@auto_increment_increment por engine (se lee una sola vez; >1 en multi-primario)
+_auto_increment_steps = {}
 
 class CustomerRepository:
 
     @staticmethod
     def insert_customer(db: Session, entity: Customer) -> Customer:
         db.add(entity)
+        db.flush()
+        CustomerTagRepository.sync(db, {entity.id: entity.tags})
+        CustomerDedupeRepository.sync(
+            db, {entity.id: (entity.full_name, entity.phone, entity.email)}
+        )
+        # expire_on_commit=False + defaults del lado del cliente: sin SELECT de vuelta
         db.commit()
-        db.refresh(entity)
         return entity
 
+    @staticmethod
+    def _with_search_columns(rows: List[dict]) -> List[dict]:
+        # Los INSERT Core no pasan por @validates: se agregan acá
+        # (sin tocar las filas que van al audit)
+        return [
+            {
+                **row, "name_search": normalize_name(row.get("full_name")),
+                "email_search": normalize_email(row.get("email"))
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def bulk_insert_customers(db: Session, rows: List[dict]) -> Optional[List[int]]:
+        """
+        INSERT multi-fila (una sola sentencia por chunk), sin hidratar entidades.
+        Devuelve los ids, o None si no se pudieron deducir: la transacción se deshizo y
+        hay que usar insert_customers_one_by_one.
+        """
+        if not rows:
+            return []
+        dialect = db.get_bind().dialect.name
+        if dialect in ("mysql", "sqlite"):
+            # Un INSERT multi-VALUES es un "simple insert": InnoDB y SQLite le asignan
+            # ids consecutivos (de a @@auto_increment_increment en MySQL). MySQL reporta
+            # el primero (LAST_INSERT_ID), SQLite el último.
+            # created_at explícito (a segundo: DATETIME(0) en MySQL) para verificar ids
+            created_at = datetime.now(timezone.utc).replace(microsecond=0)
+            values = [
+                {"created_at": created_at, **row}
+                for row in CustomerRepository._with_search_columns(rows)
+            ]
+            last_id = db.execute(insert(Customer).values(values)).lastrowid
+            step = CustomerRepository._auto_increment_step(db)
+            first_id = (
+                last_id if dialect == "mysql" else last_id - step * (len(rows) - 1)
+            )
+            ids = list(range(first_id, first_id + step * len(rows), step))
+            if not CustomerRepository._ids_match_rows(db, ids, values):
+                db.rollback()
+                return None
+        else:
+            ids = list(db.scalars(
+                insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+                CustomerRepository._with_search_columns(rows)
+            ))
+
+        CustomerTagRepository.sync(
+            db, {cid: row.get("tags") for cid, row in zip(ids, rows)}
+        )
+        CustomerDedupeRepository.sync(db, {
+            cid: (row.get("full_name"), row.get("phone"), row.get("email"))
+            for cid, row in zip(ids, rows)
+        })
+        for customer_id, row in zip(ids, rows):
+            audit.record(
+                db, "customer", [customer_id], "create", row, row.get("created_by")
+            )
+        db.commit()
+        return ids
+
+    @staticmethod
+    def _auto_increment_step(db: Session) -> int:
+        bind = db.get_bind()
+        if bind.dialect.name != "mysql":
+            return 1
+        engine = getattr(bind, "engine", bind)
+        if engine not in _auto_increment_steps:
+            step = db.execute(text("SELECT @@auto_increment_increment")).scalar()
+            _auto_increment_steps[engine] = step or 1
+        return _auto_increment_steps[engine]
+
+    @staticmethod
+    def _ids_match_rows(db: Session, ids: List[int], rows: List[dict]) -> bool:
+        """
+        Verifica los ids deducidos: tienen que existir todos y ser de esta sentencia. Se
+        compara (email, full_name, created_by, created_at): con email NULL, el id solo
+        no distingue una fila propia de la de un INSERT concurrente que tomó ese rango.
+        """
+        def _key(email, full_name, created_by, created_at):
+            if created_at is not None and created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            return email, full_name, created_by, created_at
+
+        found = {
+            row.id: _key(row.email, row.full_name, row.created_by, row.created_at)
+            for row in db.execute(
+                select(
+                    Customer.id, Customer.email, Customer.full_name,
+                    Customer.created_by, Customer.created_at
+                )
+                .where(Customer.id.in_(ids))
+            )
+        }
+        return len(found) == len(rows) and all(
+            found.get(cid) == _key(
+                row.get("email"), row["full_name"], row["created_by"], row["created_at"]
+            )
+            for cid, row in zip(ids, rows)
+        )
+
+    @staticmethod
+    def insert_customers_one_by_one(db: Session, rows: List[dict]) -> List[int]:
+        """Inserta fila a fila con SAVEPOINT; devuelve los índices que fallaron."""
+        failed = []
+        for index, row in enumerate(rows):
+            try:
+                with db.begin_nested():
+                    customer_id = db.execute(
+                        insert(Customer).values(CustomerRepository._with_search_columns([row])[0])
+                    ).inserted_primary_key[0]
+                    CustomerTagRepository.sync(db, {customer_id: row.get("tags")})
+                    CustomerDedupeRepository.sync(
+                        db,
+                        {
+                            customer_id: (
+                                row.get("full_name"), row.get("phone"), row.get("email")
+                            )
+                        }
+                    )
+            except IntegrityError:
+                failed.append(index)
+                continue
+            audit.record(
+                db, "customer", [customer_id], "create", row, row.get("created_by")
+            )
+        db.commit()
+        return failed
+
     @staticmethod
     def base_query(db: Session):
         return db.query(Customer).filter(Customer.is_deleted == False)
@@ -25,35 +179,175 @@ class CustomerRepository:
     def get_by_email(db: Session, email: str):
         return CustomerRepository.base_query(db).filter(Customer.email == email).first()
 
+    @staticmethod
+    def get_existing_emails(db: Session, emails: Iterable[str]) -> Set[str]:
+        """Emails ya usados (también de eliminados: es UNIQUE) en un solo IN (...)."""
+        emails = list(emails)
+        if not emails:
+            return set()
+        rows = db.query(Customer.email).filter(Customer.email.in_(emails)).all()
+        return {email.lower() for (email,) in rows}
+
     @staticmethod
     def get_customer_by_id(db: Session, customer_id: int) -> Optional[Customer]:
         return CustomerRepository.base_query(db).filter(Customer.id == customer_id).first()
 
+    @staticmethod
+    def get_customer_snapshot(db: Session, customer_id: int) -> Optional[dict]:
+        """Lectura por id pasando por la cache; en miss carga de la BD y la puebla."""
+        cached = CustomerRepository.cached_snapshot(customer_id)
+        if cached is not None:
+            return cached
+
+        customer = CustomerRepository.get_customer_by_id(db, customer_id)
+        if not customer:
+            return None
+        return CustomerRepository.cache_snapshot(customer)
+
+    @staticmethod
+    def cached_snapshot(customer_id: int) -> Optional[dict]:
+        cached = customer_cache.get(str(customer_id))
+        return json.loads(cached) if cached is not None else None
+
+    @staticmethod
+    def cache_snapshot(customer: Customer) -> dict:
+        snapshot = {
+            "created_by": customer.created_by,
+            "customer": CustomerRead.model_validate(customer).model_dump(mode="json"),
+        }
+        # add y no set: si una escritura invalidó la clave mientras leíamos, su
+        # TOMBSTONE sigue ahí y este snapshot (quizá previo al commit) no se guarda
+        customer_cache.add(str(customer.id), json.dumps(snapshot))
+        return snapshot
+
+    @staticmethod
+    def get_customer_snapshots(db: Session, customer_ids: List[int]) -> dict:
+        """
+        Versión por lote de get_customer_snapshot: {id: snapshot} de los que existen.
+        Un get_many a la cache y un solo SELECT ... IN (...) para los que faltan.
+        """
+        cached = customer_cache.get_many(
+            [str(customer_id) for customer_id in customer_ids]
+        )
+        snapshots = {int(key): json.loads(value) for key, value in cached.items()}
+
+        missing = [
+            customer_id for customer_id in customer_ids if customer_id not in snapshots
+        ]
+        if missing:
+            for customer in CustomerRepository.base_query(db).filter(
+                Customer.id.in_(missing)
+            ):
+                snapshots[customer.id] = CustomerRepository.cache_snapshot(customer)
+        return snapshots
+
+    @staticmethod
+    def invalidate_cached(customer_ids: Iterable[int]) -> None:
+        keys = [str(customer_id) for customer_id in customer_ids]
+        after_commit(lambda: customer_cache.invalidate_many(keys))
+
     @staticmethod
     def get_customer_by_id_for_reactivation(db: Session, customer_id: int) -> Optional[Customer]:
         return db.query(Customer).filter(Customer.id == customer_id).first()
 
     @staticmethod
-    def update_customer(db: Session, customer: Customer) -> Customer:
+    def patch_customer(
+            db: Session, customer_id: int, values: dict, owner_id: Optional[int] = None,
+            expected_updated_at: Optional[datetime] = None
+    ) -> Optional[dict]:
+        """
+        UPDATE condicional en una sola sentencia (sin cargar la entidad antes):
+        WHERE id AND is_deleted=0 [AND created_by] [AND updated_at = If-Match].
+        Devuelve la fila nueva ({columna: valor}) o None si no matcheó.
+        """
+        stmt = (
+            update(Customer)
+            .where(Customer.id == customer_id, Customer.is_deleted == False)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if "full_name" in values:
+            stmt = stmt.values(name_search=normalize_name(values["full_name"]))
+        if "email" in values:
+            stmt = stmt.values(email_search=normalize_email(values["email"]))
+        if owner_id is not None:
+            stmt = stmt.where(Customer.created_by == owner_id)
+        if expected_updated_at is not None:
+            stmt = stmt.where(Customer.updated_at == expected_updated_at)
+
+        row = update_returning(db, stmt, Customer, customer_id)
+        if row is None:
+            db.rollback()
+            return None
+        if "tags" in values:
+            CustomerTagRepository.sync(db, {customer_id: row["tags"]})
+        if values.keys() & {"full_name", "phone", "email"}:
+            CustomerDedupeRepository.sync(
+                db, {customer_id: (row["full_name"], row["phone"], row["email"])}
+            )
+        audit.record(
+            db, "customer", [customer_id], "update", values, values.get("updated_by")
+        )
         db.commit()
-        db.refresh(customer)
-        return customer
+        CustomerRepository.invalidate_cached([customer_id])
+        return row
 
     @staticmethod
     def soft_delete(db: Session, customer: Customer) -> None:
+        customer_id = customer.id
         customer.is_deleted = True
         db.commit()
+        CustomerRepository.invalidate_cached([customer_id])
 
     @staticmethod
     def reactivate_customer(db: Session, customer: Customer) -> Customer:
         customer.is_deleted = False
         customer.deleted_at = None
         customer.deleted_by = None
+        customer_id = customer.id
         db.commit()
-        db.refresh(customer)
+        CustomerRepository.invalidate_cached([customer_id])
         return customer
 
+    @staticmethod
+    def merge_customers(db: Session, target: Customer, duplicates: List[Customer],
+                        moved_email: Optional[str] = None) -> Customer:
+        """
+        Confirma un merge armado en el servicio: primero se bajan los duplicados
+        (liberan el email UNIQUE) y después el destino, todo en una transacción.
+        """
+        db.flush()
+        if moved_email:
+            target.email = moved_email
+        db.flush()
+        CustomerTagRepository.sync(db, {target.id: target.tags})
+        CustomerDedupeRepository.sync(db, {
+            target.id: (target.full_name, target.phone, target.email),
+            # dados de baja: fuera de los bloques
+            **{d.id: (None, None, None) for d in duplicates},
+        })
+        ids = [target.id, *(d.id for d in duplicates)]
+        db.commit()
+        CustomerRepository.invalidate_cached(ids)
+        return target
 
+    @staticmethod
+    def get_changes(db: Session, after: Optional[Tuple[datetime, int]], until: datetime,
+                    owner_id: Optional[int], limit: int) -> List[Customer]:
+        """
+        Filas (incluidas las eliminadas) con (updated_at, id) > after y
+        updated_at <= until, en orden de cambio. Usa ix_customers_*updated_id.
+        """
+        query = db.query(Customer).filter(Customer.updated_at <= until)
+        if after is not None:
+            updated_at, last_id = after
+            query = query.filter(or_(
+                Customer.updated_at > updated_at,
+                and_(Customer.updated_at == updated_at, Customer.id > last_id),
+            ))
+        if owner_id is not None:
+            query = query.filter(Customer.created_by == owner_id)
+        return query.order_by(Customer.updated_at, Customer.id).limit(limit).all()
 
     @staticmethod
     def count_all_customers(db: Session, user_id: int = None, is_admin: bool = False) -> int:
@@ -65,3 +359,109 @@ class CustomerRepository:
 
         return query.count()
 
+    # =========================
+    # OPERACIONES SET-BASED (bulk)
+    # =========================
+    @staticmethod
+    def get_ids_chunk(query, after_id: int, limit: int) -> List[int]:
+        """Keyset sobre ids: estable aunque el UPDATE cambie las filas ya leídas."""
+        rows = (
+            query.with_entities(Customer.id)
+            .filter(Customer.id > after_id)
+            .order_by(None)
+            .order_by(Customer.id)
+            .limit(limit)
+            .all()
+        )
+        return [row_id for (row_id,) in rows]
+
+    @staticmethod
+    def bulk_update_by_ids(
+            db: Session, ids: List[int], values: dict, deleted: bool = False,
+            owner_id: Optional[int] = None
+    ) -> int:
+        """Un UPDATE ... WHERE id IN (...) que re-aplica las condiciones de alcance."""
+        if not ids:
+            return 0
+        stmt = (
+            update(Customer)
+            .where(Customer.id.in_(ids), Customer.is_deleted == deleted)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if owner_id is not None:
+            stmt = stmt.where(Customer.created_by == owner_id)
+        result = db.execute(stmt)
+        expire_identities(db, Customer, ids)
+        audit.record(
+            db, "customer", ids, "bulk_update", values, values.get("updated_by")
+        )
+        db.commit()
+        CustomerRepository.invalidate_cached(ids)
+        return result.rowcount
+
+    @staticmethod
+    def get_tags_by_ids(
+            db: Session, ids: List[int]
+    ) -> List[Tuple[int, list, Optional[datetime]]]:
+        """(id, tags, updated_at): updated_at es la versión contra la que se escribe."""
+        return (
+            db.query(Customer.id, Customer.tags, Customer.updated_at)
+            .filter(Customer.id.in_(ids))
+            .all()
+        )
+
+    @staticmethod
+    def bulk_update_rows(
+            db: Session, rows: List[dict], owner_id: Optional[int] = None
+    ) -> int:
+        """
+        UPDATE por primary key en lote (executemany). Cada dict trae su id, los valores
+        nuevos y read_updated_at (el updated_at leído al calcularlos): el WHERE
+        re-aplica el alcance (no eliminado, dueño) y exige esa versión, así una baja,
+        cambio de dueño o edición concurrente no se pisa ni se resucita. Devuelve las
+        filas escritas.
+        """
+        if not rows:
+            return 0
+        table = Customer.__table__
+        columns = [key for key in rows[0] if key not in ("id", "read_updated_at")]
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                table.c.updated_at.is_not_distinct_from(bindparam("b_read_updated_at")),
+                table.c.is_deleted == False,
+            )
+            .values({column: bindparam(f"b_{column}") for column in columns})
+        )
+        if owner_id is not None:
+            stmt = stmt.where(table.c.created_by == owner_id)
+        params = [{f"b_{key}": value for key, value in row.items()} for row in rows]
+        affected = db.execute(stmt, params).rowcount
+
+        if affected < len(rows):
+            # Alguna cambió en el medio: solo siguen las que
+            # quedaron con la versión escrita acá
+            written = set(db.scalars(select(table.c.id).where(
+                table.c.id.in_([row["id"] for row in rows]),
+                table.c.updated_at.in_({row["updated_at"] for row in rows}),
+            )))
+            rows = [row for row in rows if row["id"] in written]
+
+        ids = [row["id"] for row in rows]
+        expire_identities(db, Customer, ids)
+        CustomerTagRepository.sync(
+            db, {row["id"]: row["tags"] for row in rows if "tags" in row}
+        )
+        for row in rows:
+            values = {
+                key: value for key, value in row.items() if key != "read_updated_at"
+            }
+            audit.record(
+                db, "customer", [row["id"]], "bulk_update", values,
+                row.get("updated_by")
+            )
+        db.commit()
+        CustomerRepository.invalidate_cached(ids)
+        return len(rows)
@@ -0,0 +1,51 @@
+# app/repositories/customer_tag_repository.py
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.customer_tag import CustomerTag
+
+
+class CustomerTagRepository:
+    """
+    Mantiene customer_tags en sync con Customer.tags. No hace commit: siempre
+    corre dentro de la transacción de la escritura del cliente.
+    """
+
+    @staticmethod
+    def sync(db: Session, tags_by_customer: Dict[int, Iterable[str]]) -> None:
+        if not tags_by_customer:
+            return
+        db.execute(delete(CustomerTag).where(CustomerTag.customer_id.in_(list(tags_by_customer))))
+        rows = [
+            {"customer_id": customer_id, "tag": tag}
+            for customer_id, tags in tags_by_customer.items()
+            for tag in dict.fromkeys(tags or [])
+        ]
+        if rows:
+            db.execute(insert(CustomerTag), rows)
+
+    @staticmethod
+    def customers_with_any(tags: List[str]):
+        return select(CustomerTag.customer_id).where(CustomerTag.tag.in_(tags))
+
+    @staticmethod
+    def customers_with_all(tags: List[str]):
+        return (
+            select(CustomerTag.customer_id)
+            .where(CustomerTag.tag.in_(tags))
+            .group_by(CustomerTag.customer_id)
+            .having(func.count(CustomerTag.tag) == len(tags))
+        )
+
+    @staticmethod
+    def tag_counts(db: Session, customer_ids_select, limit: int):
+        count = func.count(CustomerTag.customer_id).label("count")
+        return db.execute(
+            select(CustomerTag.tag, count)
+            .where(CustomerTag.customer_id.in_(customer_ids_select))
+            .group_by(CustomerTag.tag)
+            .order_by(count.desc(), CustomerTag.tag)
+            .limit(limit)
+        ).all()
@@ -31,7 +31,6 @@ class TokenRepository:
         )
         db.add(token)
         db.commit()
-        db.refresh(token)
         return token
 
     @staticmethod
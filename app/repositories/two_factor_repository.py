@@ -15,7 +15,6 @@ class TwoFactorCodeRepository:
         )
         db.add(db_code)
         db.commit()
-        db.refresh(db_code)
         return db_code
 
     @staticmethod
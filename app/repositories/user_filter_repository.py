@@ -1,29 +1,31 @@
 # app/repositories/user_filter_repository.py
+from typing import List, Sequence
+
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
 from app.models.user import User
 from app.schemas.user_schema import UserQuery
 
 class UserFilterRepository:
 
     @staticmethod
-    def filter_users(db: Session, filters: UserQuery):
-        query = db.query(User).filter(User.is_deleted == False)
+    def conditions(filters: UserQuery) -> list:
+        conditions = [User.is_deleted == False]
 
         # Filtros básicos
         if filters.username:
-            query = query.filter(User.username.ilike(f"%{filters.username}%"))
+            conditions.append(User.username.ilike(f"%{filters.username}%"))
         if filters.email:
-            query = query.filter(User.email.ilike(f"%{filters.email}%"))
+            conditions.append(User.email.ilike(f"%{filters.email}%"))
         if filters.full_name:
-            query = query.filter(User.full_name.ilike(f"%{filters.full_name}%"))
+            conditions.append(User.full_name.ilike(f"%{filters.full_name}%"))
         if filters.role:
-            query = query.filter(User.role == filters.role)
+            conditions.append(User.role == filters.role)
 
         # Búsqueda general
         if filters.q:
             q_like = f"%{filters.q}%"
-            query = query.filter(
+            conditions.append(
                 or_(
                     User.full_name.ilike(q_like),
                     User.email.ilike(q_like),
@@ -33,8 +35,32 @@ class UserFilterRepository:
 
         # Filtros avanzados (ejemplos)
         if getattr(filters, "created_from", None):
-            query = query.filter(User.created_at >= filters.created_from)
+            conditions.append(User.created_at >= filters.created_from)
         if getattr(filters, "created_to", None):
-            query = query.filter(User.created_at <= filters.created_to)
+            conditions.append(User.created_at <= filters.created_to)
+
+        return conditions
 
-        return query
\ No newline at end of file
+    @staticmethod
+    def filter_users(db: Session, filters: UserQuery):
+        return db.query(User).filter(*UserFilterRepository.conditions(filters))
+
+    # =========================
+    # LECTURA SIN ORM (listados)
+    # =========================
+    @staticmethod
+    def count(db: Session, conditions: Sequence) -> int:
+        return db.execute(select(func.count(User.id)).where(*conditions)).scalar_one()
+
+    @staticmethod
+    def select_rows(db: Session, columns: Sequence[str], conditions: Sequence, order_by,
+                    offset: int, limit: int) -> List:
+        """SELECT Core de las columnas pedidas (Row, sin instancias ORM)."""
+        stmt = (
+            select(*[getattr(User, c) for c in columns])
+            .where(*conditions)
+            .order_by(order_by)
+            .offset(offset)
+            .limit(limit)
+        )
+        return db.execute(stmt).all()
@@ -1,17 +1,27 @@
 # repositories/user_repository.py
 from typing import List, Optional
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.core import audit
+from app.core.cache import build_cache
+from app.db.session import after_commit, update_returning
 from app.models.user import User
+from app.schemas.user_schema import UserRead
 
+# Read-through por id: UserRead serializado
+user_cache = build_cache(
+    "user_entity", settings.ENTITY_CACHE_MAXSIZE, settings.ENTITY_CACHE_TTL_SECONDS
+)
 
 class UserRepository:
 
     @staticmethod
     def insert_user(db: Session, entity: User) -> User:
         db.add(entity)
+        # expire_on_commit=False + defaults del lado del cliente: sin SELECT de vuelta
         db.commit()
-        db.refresh(entity)
         return entity
 
     @staticmethod
@@ -30,26 +40,62 @@ class UserRepository:
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         return UserRepository.base_query(db).filter(User.id == user_id).first()
 
+    @staticmethod
+    def get_user_read(db: Session, user_id: int) -> Optional[UserRead]:
+        """Lectura por id pasando por la cache; en miss carga de la BD y la puebla."""
+        cached = user_cache.get(str(user_id))
+        if cached is not None:
+            return UserRead.model_validate_json(cached)
+
+        user = UserRepository.get_user_by_id(db, user_id)
+        if not user:
+            return None
+
+        dto = UserRead.model_validate(user)
+        # add: no pisa el TOMBSTONE de una escritura confirmada mientras leíamos
+        user_cache.add(str(user_id), dto.model_dump_json())
+        return dto
+
+    @staticmethod
+    def invalidate_cached(user_id: int) -> None:
+        keys = [str(user_id)]
+        after_commit(lambda: user_cache.invalidate_many(keys))
+
     @staticmethod
     def get_user_by_id_for_reactivation(db: Session, user_id: int) -> Optional[User]:
         return db.query(User).filter(User.id == user_id).first()
 
     @staticmethod
-    def update_user(db: Session, user: User) -> User:
+    def patch_user(db: Session, user_id: int, values: dict) -> Optional[dict]:
+        """UPDATE ... WHERE id AND is_deleted=0 en una sentencia; None si no existe."""
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.is_deleted == False)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        row = update_returning(db, stmt, User, user_id)
+        if row is None:
+            db.rollback()
+            return None
+        audit.record(db, "user", [user_id], "update", values, values.get("updated_by"))
         db.commit()
-        db.refresh(user)
-        return user
+        UserRepository.invalidate_cached(user_id)
+        return row
 
     @staticmethod
     def soft_delete(db: Session, user: User) -> None:
+        user_id = user.id
         user.is_deleted = True
         db.commit()
+        UserRepository.invalidate_cached(user_id)
 
     @staticmethod
     def reactivate_user(db: Session, user: User) -> User:
         user.is_deleted = False
         user.deleted_at = None
         user.deleted_by = None
+        user_id = user.id
         db.commit()
-        db.refresh(user)
+        UserRepository.invalidate_cached(user_id)
         return user
\ No newline at end of file
@@ -0,0 +1,16 @@
+# app/schemas/audit_schema.py
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+# =========================
+# OUTPUT (historial de cambios)
+# =========================
+class AuditEntry(BaseModel):
+    id: int
+    action: str
+    changes: Dict[str, Dict[str, Any]]   # {campo: {"old": ..., "new": ...}}
+    actor_id: Optional[int]
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,70 @@
+from typing import Annotated, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+
+from app.schemas.customer_schema import CustomerCreate, CustomerPatch, CustomerRead
+
+
+# =========================
+# OPERACIONES (una por mutación encolada en el cliente)
+# =========================
+class CreateCustomerOp(BaseModel):
+    op: Literal["create"]
+    data: CustomerCreate
+
+
+class UpdateCustomerOp(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: CustomerCreate
+    if_match: Optional[str] = None     # mismo ETag que el header If-Match
+
+
+class PatchCustomerOp(BaseModel):
+    op: Literal["patch"]
+    id: int
+    data: CustomerPatch
+    if_match: Optional[str] = None
+
+
+class DeleteCustomerOp(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+class ReactivateCustomerOp(BaseModel):
+    op: Literal["reactivate"]
+    id: int
+
+
+CustomerOperation = Annotated[
+    Union[
+        CreateCustomerOp, UpdateCustomerOp, PatchCustomerOp, DeleteCustomerOp,
+        ReactivateCustomerOp
+    ],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: List[CustomerOperation] = Field(..., min_length=1)
+    # True: todo o nada (la primera falla vuelve atrás el batch).
+    # False: savepoint por operación; las que fallan se descartan y el resto se confirma
+    atomic: bool = True
+
+# =========================
+# RESULTADO
+# =========================
+class BatchOperationResult(BaseModel):
+    index: int
+    op: str
+    # como la respuesta HTTP de la operación suelta; 424 = no se ejecutó
+    status: int
+    id: Optional[int] = None
+    customer: Optional[CustomerRead] = None
+    error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    # False => no se aplicó nada (atomic con una falla)
+    committed: bool
+    results: List[BatchOperationResult]
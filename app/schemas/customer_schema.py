@@ -1,10 +1,23 @@
 import re
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from functools import lru_cache
+from typing import Optional, List, Tuple, Type
+from pydantic import (
+    BaseModel, EmailStr, Field, create_model, field_validator, model_validator
+)
 
 from app.enums.lead_status import LeadStatus
 from app.enums.lead_source import LeadSource
+from app.enums.bulk_action import CustomerBulkAction
+
+TAG_MAX_LENGTH = 50
+
+
+def split_tags(value: Optional[str]) -> List[str]:
+    """Tags de query params separados por coma, normalizados como en CustomerCreate."""
+    if not value:
+        return []
+    return list(dict.fromkeys(t.strip().lower() for t in value.split(",") if t.strip()))
 
 # =========================
 # INPUT (para crear o actualizar)
@@ -40,6 +53,12 @@ class CustomerCreate(BaseModel):
             return []
         return [t.strip().lower() for t in v]
 
+    @field_validator("tags")
+    def validate_tags(cls, v):
+        if any(len(t) > TAG_MAX_LENGTH for t in v):
+            raise ValueError(f"Tags must be at most {TAG_MAX_LENGTH} characters")
+        return v
+
     @field_validator("status")
     def validate_status(cls, v):
         allowed_status = [s.value for s in LeadStatus]
@@ -47,6 +66,17 @@ class CustomerCreate(BaseModel):
             raise ValueError(f"Status must be one of {allowed_status}")
         return v
 
+# =========================
+# PATCH (parcial: solo se aplican los campos enviados)
+# =========================
+class CustomerPatch(CustomerCreate):
+    # Sin default de validación: omitido => no se toca; null
+    # explícito en columnas NOT NULL => 422
+    full_name: str = Field(None, min_length=2, max_length=120)
+    source: LeadSource = None
+    status: LeadStatus = None
+    tags: List[str] = None
+
 # =========================
 # OUTPUT (para devolver al cliente)
 # =========================
@@ -64,6 +94,36 @@ class CustomerRead(BaseModel):
 
     model_config = {"from_attributes": True}
 
+# =========================
+# PROYECCIÓN (fields=): subconjunto de CustomerRead
+# =========================
+CUSTOMER_READ_FIELDS = tuple(CustomerRead.model_fields)
+
+
+def split_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Campos pedidos en ?fields=a,b,c, en el orden de CustomerRead y siempre con
+    "id". None si no se pidió proyección. ValueError si alguno no es válido.
+    """
+    if not value:
+        return None
+    requested = {f.strip() for f in value.split(",") if f.strip()}
+    unknown = requested - set(CUSTOMER_READ_FIELDS)
+    if unknown:
+        raise ValueError(f"Invalid fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(f for f in CUSTOMER_READ_FIELDS if f in requested)
+
+
+@lru_cache(maxsize=256)
+def customer_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Modelo de respuesta con solo esos campos (uno por combinación, cacheado)."""
+    return create_model(
+        "CustomerRead_" + "_".join(fields),
+        __config__={"from_attributes": True},
+        **{f: (CustomerRead.model_fields[f].annotation, ...) for f in fields},
+    )
+
 # =========================
 # QUERY PARAMS (filtros + paginación)
 # =========================
@@ -74,6 +134,10 @@ class CustomerQuery(BaseModel):
     status: Optional[str] = None
     q: Optional[str] = None
 
+    # Tags separados por coma: al menos uno (any) / todos (all)
+    tags_any: Optional[str] = None
+    tags_all: Optional[str] = None
+
     # Paginación
     limit: int = Field(20, ge=1, le=100)
     offset: int = Field(0, ge=0)
@@ -82,8 +146,145 @@ class CustomerQuery(BaseModel):
     order_by: str = "created_at"
     order_dir: str = "desc"
 
+    # Proyección: campos de CustomerRead separados por coma (por defecto, todos)
+    fields: Optional[str] = None
+
     # Filtros avanzados
     created_from: Optional[datetime] = None
     created_to: Optional[datetime] = None
     updated_from: Optional[datetime] = None
-    updated_to: Optional[datetime] = None
\ No newline at end of file
+    updated_to: Optional[datetime] = None
+
+class TagFacet(BaseModel):
+    tag: str
+    count: int
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class CustomerFacets(BaseModel):
+    total: int
+    bucket: str
+    status: List[FacetCount]
+    source: List[FacetCount]
+    created: List[FacetCount]
+
+# =========================
+# IMPORTACIÓN MASIVA (CSV / NDJSON)
+# =========================
+class CustomerImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    errors: List[str]
+
+
+class CustomerImportReport(BaseModel):
+    total_rows: int
+    inserted: int
+    failed: int
+    errors: List[CustomerImportError]
+    errors_truncated: bool = False
+
+
+# =========================
+# OPERACIONES MASIVAS (bulk)
+# =========================
+class CustomerBulkRequest(BaseModel):
+    action: CustomerBulkAction
+
+    # Alcance: lista de ids o los mismos filtros que GET /customers/
+    ids: Optional[List[int]] = None
+    filters: Optional[CustomerQuery] = None
+
+    # Parámetros según la acción
+    status: Optional[LeadStatus] = None
+    source: Optional[LeadSource] = None
+    tags: List[str] = []
+    owner_id: Optional[int] = None
+
+    @field_validator("tags", mode="before")
+    def normalize_tags(cls, v):
+        if not v:
+            return []
+        return [t.strip().lower() for t in v]
+
+    @model_validator(mode="after")
+    def validate_action(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide either ids or filters")
+        if self.ids is not None and not self.ids:
+            raise ValueError("ids must not be empty")
+
+        required = {
+            CustomerBulkAction.SET_STATUS: ("status", self.status),
+            CustomerBulkAction.SET_SOURCE: ("source", self.source),
+            CustomerBulkAction.ADD_TAGS: ("tags", self.tags),
+            CustomerBulkAction.REMOVE_TAGS: ("tags", self.tags),
+            CustomerBulkAction.TRANSFER_OWNER: ("owner_id", self.owner_id),
+        }
+        if self.action in required:
+            name, value = required[self.action]
+            if not value:
+                raise ValueError(f"'{name}' is required for action {self.action.value}")
+
+        if self.action == CustomerBulkAction.REACTIVATE and self.ids is None:
+            raise ValueError("reactivate only accepts ids")
+        return self
+
+
+class CustomerBulkResult(BaseModel):
+    action: CustomerBulkAction
+    matched: int
+    affected: int
+
+# =========================
+# LECTURA POR LOTE (GET/POST /customers/batch)
+# =========================
+class CustomerBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+
+class CustomerBatch(BaseModel):
+    items: List[CustomerRead]    # en el orden pedido, sin repetidos
+    missing: List[int]           # inexistentes, eliminados o de otro dueño
+
+# =========================
+# TYPEAHEAD (GET /customers/suggest)
+# =========================
+class CustomerSuggestion(BaseModel):
+    id: int
+    full_name: str
+    email: Optional[str]
+    phone: Optional[str]
+
+    model_config = {"from_attributes": True}
+
+# =========================
+# DUPLICADOS / MERGE
+# =========================
+class DuplicateCandidate(BaseModel):
+    customer: CustomerRead
+    score: float                 # 0..1
+    matched: List[str]           # claves compartidas: phone | name | email
+
+
+class CustomerMergeRequest(BaseModel):
+    duplicate_ids: List[int] = Field(..., min_length=1, max_length=50)
+
+# =========================
+# CHANGE FEED (sincronización incremental)
+# =========================
+class CustomerChange(BaseModel):
+    op: str                              # "upsert" | "delete" (tombstone)
+    id: int
+    updated_at: Optional[datetime]
+    customer: Optional[CustomerRead] = None   # None en los tombstones
+
+
+class CustomerChangeFeed(BaseModel):
+    items: List[CustomerChange]
+    next_cursor: Optional[str]           # pasar como ?since= en la próxima llamada
+    has_more: bool
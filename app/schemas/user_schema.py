@@ -17,6 +17,15 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str = Field(..., min_length=6)
 
+# -----------------------------
+# User para PATCH (parcial)
+# -----------------------------
+class UserPatch(BaseModel):
+    username: str = Field(None, max_length=50)
+    email: EmailStr = None
+    full_name: Optional[str] = None
+    password: str = Field(None, min_length=6)
+
 # -----------------------------
 # User para lectura (output)
 # -----------------------------
@@ -0,0 +1,35 @@
+# app/services/archive_service.py
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.repositories.archive_repository import ArchiveRepository
+
+
+class ArchiveService:
+
+    # =========================
+    # ARCHIVADO DE ELIMINADOS (clientes primero: liberan a sus usuarios)
+    # =========================
+    @staticmethod
+    def archive_expired(
+            db: Session, days: Optional[int] = None, batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+        moved = {"customers": 0, "users": 0}
+        for key, archive_batch in (
+                ("customers", ArchiveRepository.archive_customers_batch),
+                ("users", ArchiveRepository.archive_users_batch),
+        ):
+            # Transacciones cortas: cada batch hace commit y suelta los locks
+            while True:
+                count = archive_batch(db, cutoff, batch_size)
+                moved[key] += count
+                if count < batch_size:
+                    break
+        return moved
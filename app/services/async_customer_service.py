@@ -0,0 +1,132 @@
+# app/services/async_customer_service.py
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.repositories.async_customer_repository import AsyncCustomerRepository
+from app.schemas.customer_schema import (
+    CustomerCreate, CustomerRead, CUSTOMER_READ_FIELDS
+)
+from app.schemas.pagination import Page
+from app.services.customer_dedupe_service import CustomerDedupeService
+from app.services.customer_service import CustomerService, customer_reads_flight
+from app.utils.helpers import etag_matches
+
+
+class AsyncCustomerService:
+    """
+    Rutas calientes de /customers con DB_ASYNC=1. Las lecturas esperan a la BD
+    sin ocupar un hilo del threadpool; reglas, caches, ETags y single-flight son
+    los de CustomerService (las mismas claves: un request sync y uno async
+    idénticos comparten la consulta en vuelo).
+    Las escrituras corren el servicio sync sobre la sesión async (run_sync):
+    mismo código, mismo audit / tags / dedupe, sin bloquear el event loop.
+    """
+
+    # =========================
+    # CREATE
+    # =========================
+    @staticmethod
+    async def create_customer(
+            db: AsyncSession, payload: CustomerCreate, user: User
+    ) -> CustomerRead:
+        return await db.run_sync(
+            lambda session: CustomerService.create_customer(session, payload, user)
+        )
+
+    @staticmethod
+    async def possible_duplicates(
+            db: AsyncSession, customer: CustomerRead, user: User
+    ) -> List[int]:
+        return await db.run_sync(
+            lambda session: CustomerDedupeService.possible_duplicates(
+                session, customer, user
+            )
+        )
+
+    # =========================
+    # LIST + FILTROS + PAGINACIÓN + ORDEN
+    # =========================
+    @staticmethod
+    async def list_customers_conditional(
+            db: AsyncSession, filters, user: User, if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[Page]]:
+        # Ver CustomerService._end_read_transaction
+        if db.in_transaction():
+            await db.commit()
+        order, fields, read_model, cache_key = CustomerService._list_request(
+            filters, user
+        )
+        cached = CustomerService._cached_list(cache_key, read_model, if_none_match)
+        if cached is not None:
+            return cached
+
+        conditions = CustomerService._scoped_conditions(filters, user)
+        total_items, last_update = await customer_reads_flight.do_async(
+            f"{cache_key}|count",
+            lambda: AsyncCustomerRepository.count_and_last_update(db, conditions)
+        )
+
+        etag = CustomerService._list_etag(filters, user, total_items, last_update)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        async def _load_page() -> Page:
+            items = await AsyncCustomerRepository.select_rows(
+                db, fields or CUSTOMER_READ_FIELDS, conditions, order, filters.offset,
+                filters.limit
+            )
+            return CustomerService._build_page(
+                filters, read_model, items, total_items, cache_key, etag
+            )
+
+        return etag, await customer_reads_flight.do_async(
+            f"{cache_key}|{etag}", _load_page
+        )
+
+    # =========================
+    # GET CANT TOTAL ACTIVE LEADS
+    # =========================
+    @staticmethod
+    async def count_all_customers(db: AsyncSession, user: User) -> int:
+        if db.in_transaction():
+            await db.commit()
+        return await customer_reads_flight.do_async(
+            f"count:{CustomerService._owner_scope(user)}:{CustomerService._generations(user)}",
+            lambda: AsyncCustomerRepository.count_all_customers(
+                db, user_id=user.id, is_admin=user.role == "admin"
+            )
+        )
+
+    # =========================
+    # GET ONE
+    # =========================
+    @staticmethod
+    async def get_customer_conditional(
+            db: AsyncSession, customer_id: int, user: User,
+            if_none_match: Optional[str] = None, fields: Optional[str] = None
+    ):
+        _, read_model = CustomerService._read_model(fields)
+        snapshot = await AsyncCustomerRepository.get_customer_snapshot(db, customer_id)
+        return CustomerService._conditional_read(
+            snapshot, customer_id, user, if_none_match, read_model
+        )
+
+    # =========================
+    # UPDATE / PATCH / DELETE
+    # =========================
+    @staticmethod
+    async def patch_customer(
+            db: AsyncSession, customer_id: int, payload, user: User,
+            if_match: Optional[str] = None
+    ) -> Tuple[str, CustomerRead]:
+        return await db.run_sync(
+            lambda session: CustomerService.patch_customer(
+                session, customer_id, payload, user, if_match
+            )
+        )
+
+    @staticmethod
+    async def delete_customer(db: AsyncSession, customer_id: int, user: User) -> bool:
+        return await db.run_sync(
+            lambda session: CustomerService.delete_customer(session, customer_id, user)
+        )
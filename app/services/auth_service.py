@@ -265,7 +265,6 @@ class AuthService:
             )
             db.add(security_info)
             db.commit()
-            db.refresh(security_info)
 
         now = datetime.now(timezone.utc)
         if security_info.locked_until and security_info.locked_until > now:
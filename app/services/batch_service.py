@@ -0,0 +1,108 @@
+# app/services/batch_service.py
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.logger import get_logger
+from app.db.session import batch_session, collect_after_commit
+from app.models.user import User
+from app.schemas.batch_schema import BatchOperationResult, BatchRequest, BatchResult
+from app.schemas.customer_schema import CustomerRead
+from app.services.customer_service import CustomerService
+
+logger = get_logger(__name__)
+
+# Operación que no se ejecutó porque una anterior falló (modo atomic)
+NOT_EXECUTED = 424
+
+
+class BatchService:
+
+    # =========================
+    # BATCH DE OPERACIONES (una sesión, un commit)
+    # =========================
+    @staticmethod
+    def run(db: Session, payload: BatchRequest, user: User) -> BatchResult:
+        """
+        Ejecuta las operaciones en orden con los mismos servicios que los
+        endpoints sueltos. Cada una corre en su savepoint; el commit real es
+        uno solo al final. Audit, eventos e invalidaciones de cache esperan a
+        ese commit (y se descartan con lo que se vuelve atrás).
+        """
+        if len(payload.operations) > settings.BATCH_MAX_OPERATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BATCH_MAX_OPERATIONS} operations per batch"
+            )
+
+        results = []
+        failed = False
+        with batch_session(db) as session, collect_after_commit() as effects:
+            connection = session.bind
+            for index, operation in enumerate(payload.operations):
+                if failed and payload.atomic:
+                    results.append(BatchOperationResult(
+                        index=index, op=operation.op, status=NOT_EXECUTED,
+                        id=getattr(operation, "id", None)
+                    ))
+                    continue
+
+                savepoint = connection.begin_nested()
+                with collect_after_commit() as operation_effects:
+                    error = None
+                    try:
+                        status, customer = BatchService._apply(session, operation, user)
+                    except HTTPException as e:
+                        status, error = e.status_code, str(e.detail)
+                    except Exception:
+                        # Error de BD no previsto (deadlock,
+                        # constraint): falla solo esta operación
+                        logger.exception(
+                            "Batch operation %s (%s) failed", index, operation.op
+                        )
+                        status, error = 500, "Internal server error"
+                    if error is not None:
+                        # Primero el savepoint de la sesión
+                        # (anidado), después el de la operación
+                        session.rollback()
+                        savepoint.rollback()
+                        failed = True
+                        results.append(BatchOperationResult(
+                            index=index, op=operation.op, status=status,
+                            id=getattr(operation, "id", None), error=error
+                        ))
+                        continue
+                savepoint.commit()
+                effects.extend(operation_effects)
+                results.append(BatchOperationResult(
+                    index=index, op=operation.op, status=status,
+                    id=customer.id if customer else operation.id, customer=customer
+                ))
+
+            committed = not (failed and payload.atomic)
+            if committed:
+                connection.commit()
+
+        # Fuera del batch: los efectos corren recién con la transacción confirmada
+        if committed:
+            for effect in effects:
+                effect()
+        return BatchResult(committed=committed, results=results)
+
+    @staticmethod
+    def _apply(
+            db: Session, operation, user: User
+    ) -> Tuple[int, Optional[CustomerRead]]:
+        if operation.op == "create":
+            return 200, CustomerService.create_customer(db, operation.data, user)
+        if operation.op in ("update", "patch"):
+            _, customer = CustomerService.patch_customer(
+                db, operation.id, operation.data, user, operation.if_match
+            )
+            return 200, customer
+        if operation.op == "delete":
+            CustomerService.delete_customer(db, operation.id, user)
+            return 200, None
+        return 200, CustomerService.reactivate_customer(db, operation.id, user)
@@ -0,0 +1,144 @@
+# app/services/customer_bulk_service.py
+from datetime import datetime, timezone
+from typing import Iterator, List
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.enums.bulk_action import CustomerBulkAction
+from app.models.customer import Customer
+from app.models.user import User
+from app.repositories.customer_filter_repository import CustomerFilterRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.user_repository import UserRepository
+from app.services.customer_service import CustomerService
+from app.schemas.customer_schema import CustomerBulkRequest, CustomerBulkResult
+
+ADMIN_ONLY_ACTIONS = {CustomerBulkAction.REACTIVATE, CustomerBulkAction.TRANSFER_OWNER}
+
+
+class CustomerBulkService:
+
+    # =========================
+    # BULK UPDATE / SOFT DELETE (UPDATE set-based por chunks)
+    # =========================
+    @staticmethod
+    def run(
+            db: Session, payload: CustomerBulkRequest, user: User
+    ) -> CustomerBulkResult:
+        is_admin = user.role == "admin"
+
+        if payload.action in ADMIN_ONLY_ACTIONS and not is_admin:
+            raise HTTPException(
+                status_code=403, detail=f"Only admin can run {payload.action.value}"
+            )
+        if payload.ids is not None and len(payload.ids) > settings.BULK_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BULK_MAX_IDS} ids per request"
+            )
+        if payload.action == CustomerBulkAction.TRANSFER_OWNER:
+            if not UserRepository.get_user_by_id(db, payload.owner_id):
+                raise HTTPException(status_code=404, detail="Target owner not found")
+
+        # Los no-admin solo pueden tocar sus propios clientes
+        owner_id = None if is_admin else user.id
+        deleted = payload.action == CustomerBulkAction.REACTIVATE
+
+        matched = 0
+        affected = 0
+        for ids in CustomerBulkService._iter_id_chunks(db, payload, owner_id, deleted):
+            matched += len(ids)
+            if payload.action in (
+                CustomerBulkAction.ADD_TAGS, CustomerBulkAction.REMOVE_TAGS
+            ):
+                affected += CustomerBulkService._update_tags(
+                    db, ids, payload, user, owner_id
+                )
+            else:
+                values = CustomerBulkService._values_for(payload, user)
+                affected += CustomerRepository.bulk_update_by_ids(
+                    db, ids, values, deleted=deleted, owner_id=owner_id
+                )
+
+        if affected:
+            # admin: los dueños afectados pueden ser cualquiera
+            CustomerService.invalidate_reads(owner_id)
+            CustomerService.publish_change("bulk", None, owner_id)
+
+        return CustomerBulkResult(
+            action=payload.action, matched=matched, affected=affected
+        )
+
+    @staticmethod
+    def _iter_id_chunks(
+            db: Session, payload: CustomerBulkRequest, owner_id, deleted: bool
+    ) -> Iterator[List[int]]:
+        if payload.ids is not None:
+            query = db.query(Customer).filter(
+                Customer.id.in_(set(payload.ids)),
+                Customer.is_deleted == deleted
+            )
+        else:
+            query = CustomerFilterRepository.filter_customers(db, payload.filters)
+
+        if owner_id is not None:
+            query = query.filter(Customer.created_by == owner_id)
+
+        last_id = 0
+        while True:
+            ids = CustomerRepository.get_ids_chunk(
+                query, last_id, settings.BULK_CHUNK_SIZE
+            )
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    @staticmethod
+    def _values_for(payload: CustomerBulkRequest, user: User) -> dict:
+        now = datetime.now(timezone.utc)
+        values = {"updated_by": user.id, "updated_at": now}
+
+        action = payload.action
+        if action == CustomerBulkAction.SET_STATUS:
+            values["status"] = payload.status
+        elif action == CustomerBulkAction.SET_SOURCE:
+            values["source"] = payload.source
+        elif action == CustomerBulkAction.SOFT_DELETE:
+            values.update(is_deleted=True, deleted_at=now, deleted_by=user.id)
+        elif action == CustomerBulkAction.REACTIVATE:
+            values.update(is_deleted=False, deleted_at=None, deleted_by=None)
+        elif action == CustomerBulkAction.TRANSFER_OWNER:
+            values["created_by"] = payload.owner_id
+        return values
+
+    @staticmethod
+    def _update_tags(
+            db: Session, ids: List[int], payload: CustomerBulkRequest, user: User,
+            owner_id
+    ) -> int:
+        # tags es JSON: se calcula el nuevo valor en Python y se escribe en
+        # un solo executemany, condicionado al updated_at leído (lo que
+        # cambió en el medio no se pisa)
+        now = datetime.now(timezone.utc)
+        rows = []
+        current_rows = CustomerRepository.get_tags_by_ids(db, ids)
+        for customer_id, tags, read_updated_at in current_rows:
+            current = list(tags or [])
+            if payload.action == CustomerBulkAction.ADD_TAGS:
+                new_tags = current + [
+                    t for t in dict.fromkeys(payload.tags) if t not in current
+                ]
+            else:
+                new_tags = [t for t in current if t not in payload.tags]
+            if new_tags != current:
+                rows.append(
+                    {
+                        "id": customer_id, "tags": new_tags, "updated_by": user.id,
+                        "updated_at": now, "read_updated_at": read_updated_at
+                    }
+                )
+
+        return CustomerRepository.bulk_update_rows(db, rows, owner_id)
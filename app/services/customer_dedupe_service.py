@@ -0,0 +1,214 @@
+# app/services/customer_dedupe_service.py
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from typing import Iterator, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.customer import Customer
+from app.models.customer_dedupe_key import CustomerDedupeKey
+from app.models.user import User
+from app.repositories.customer_dedupe_repository import CustomerDedupeRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.schemas.customer_schema import CustomerRead, DuplicateCandidate
+from app.services.customer_service import CustomerService
+from app.utils.dedupe_keys import dedupe_keys, normalize_name
+
+# Peso de cada clave compartida; el resto del score sale de la similitud de nombres
+KEY_WEIGHTS = {"phone": 0.5, "email": 0.35, "name": 0.25}
+NAME_SIMILARITY_WEIGHT = 0.2
+
+Fields = Tuple[Optional[str], Optional[str], Optional[str]]  # (full_name, phone, email)
+
+
+class CustomerDedupeService:
+
+    # =========================
+    # SCORE
+    # =========================
+    @staticmethod
+    def score(
+            name_a: Optional[str], name_b: Optional[str], matched: List[str]
+    ) -> float:
+        similarity = SequenceMatcher(
+            None, normalize_name(name_a), normalize_name(name_b)
+        ).ratio()
+        total = sum(KEY_WEIGHTS[kind] for kind in set(matched))
+        total += NAME_SIMILARITY_WEIGHT * similarity
+        return round(min(total, 1.0), 3)
+
+    @staticmethod
+    def _candidates(db: Session, fields: Fields, exclude_id: Optional[int], user: User,
+                    min_score: float) -> List[DuplicateCandidate]:
+        owner_id = None if user.role == "admin" else user.id
+        matches = CustomerDedupeRepository.candidates(
+            db, dedupe_keys(*fields), exclude_id, owner_id, settings.DEDUPE_MAX_BLOCK
+        )
+        result = []
+        for customer, matched in matches:
+            score = CustomerDedupeService.score(fields[0], customer.full_name, matched)
+            if score >= min_score:
+                result.append(DuplicateCandidate(
+                    customer=CustomerRead.model_validate(customer), score=score,
+                    matched=sorted(set(matched))
+                ))
+        return sorted(result, key=lambda c: (-c.score, c.customer.id))
+
+    # =========================
+    # AL CREAR: ids de posibles duplicados (header X-Possible-Duplicates)
+    # =========================
+    @staticmethod
+    def possible_duplicates(
+            db: Session, customer: CustomerRead, user: User
+    ) -> List[int]:
+        fields = (customer.full_name, customer.phone, customer.email)
+        candidates = CustomerDedupeService._candidates(
+            db, fields, customer.id, user, settings.DEDUPE_MIN_SCORE
+        )
+        return [c.customer.id for c in candidates]
+
+    # =========================
+    # GET /customers/{id}/duplicates
+    # =========================
+    @staticmethod
+    def find_duplicates(db: Session, customer_id: int, user: User,
+                        min_score: Optional[float] = None) -> List[DuplicateCandidate]:
+        customer = CustomerDedupeService._owned_customer(db, customer_id, user)
+        fields = (customer.full_name, customer.phone, customer.email)
+        min_score = settings.DEDUPE_MIN_SCORE if min_score is None else min_score
+        return CustomerDedupeService._candidates(
+            db, fields, customer_id, user, min_score
+        )
+
+    @staticmethod
+    def _owned_customer(db: Session, customer_id: int, user: User) -> Customer:
+        customer = CustomerRepository.get_customer_by_id(db, customer_id)
+        if not customer:
+            raise HTTPException(status_code=404, detail="Customer not found")
+        if user.role != "admin" and customer.created_by != user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to view this customer"
+            )
+        return customer
+
+    # =========================
+    # MERGE (los duplicados se fusionan en el cliente destino y se dan de baja)
+    # =========================
+    @staticmethod
+    def merge(
+            db: Session, target_id: int, duplicate_ids: List[int], user: User
+    ) -> CustomerRead:
+        if target_id in duplicate_ids:
+            raise HTTPException(
+                status_code=400, detail="A customer cannot be merged into itself"
+            )
+
+        target = CustomerDedupeService._owned_customer(db, target_id, user)
+        duplicates = [
+            CustomerDedupeService._owned_customer(db, i, user)
+            for i in dict.fromkeys(duplicate_ids)
+        ]
+
+        now = datetime.now(timezone.utc)
+        moved_email = None
+        tags = list(target.tags or [])
+        for duplicate in duplicates:
+            # Se completan los huecos del destino; lo que ya tiene no se pisa
+            if not target.email and not moved_email and duplicate.email:
+                moved_email = duplicate.email
+                duplicate.email = None  # email es UNIQUE: se libera antes de moverlo
+            target.phone = target.phone or duplicate.phone
+            target.notes = target.notes or duplicate.notes
+            tags += [t for t in (duplicate.tags or []) if t not in tags]
+
+            duplicate.is_deleted = True
+            duplicate.deleted_at = now
+            duplicate.deleted_by = user.id
+            duplicate.updated_by = user.id
+
+        target.tags = tags
+        target.updated_by = user.id
+
+        removed = [(d.id, d.created_by) for d in duplicates]
+        target = CustomerRepository.merge_customers(db, target, duplicates, moved_email)
+
+        CustomerService.invalidate_reads(
+            target.created_by, *(owner_id for _, owner_id in removed)
+        )
+        dto = CustomerRead.model_validate(target)
+        CustomerService.publish_change("updated", dto.id, target.created_by, dto)
+        for duplicate_id, owner_id in removed:
+            CustomerService.publish_change("deleted", duplicate_id, owner_id)
+        return dto
+
+    # =========================
+    # JOB BATCH (scripts/dedupe_scan.py)
+    # =========================
+    @staticmethod
+    def backfill_keys(db: Session, batch_size: int = 1000) -> int:
+        """Recalcula customer_dedupe_keys de los clientes activos, por keyset de ids."""
+        last_id, total = 0, 0
+        while True:
+            rows = db.execute(
+                select(Customer.id, Customer.full_name, Customer.phone, Customer.email)
+                .where(Customer.id > last_id, Customer.is_deleted == False)
+                .order_by(Customer.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return total
+            CustomerDedupeRepository.sync(
+                db, {r.id: (r.full_name, r.phone, r.email) for r in rows}
+            )
+            db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+
+    @staticmethod
+    def scan(db: Session, min_score: Optional[float] = None,
+             batch_size: int = 500) -> Iterator[Tuple[int, int, float, List[str]]]:
+        """
+        Pares (id, id_duplicado, score, claves) comparando solo dentro de cada
+        bloque compartido: el costo depende de los bloques, no del tamaño de la tabla.
+        """
+        min_score = settings.DEDUPE_MIN_SCORE if min_score is None else min_score
+        seen: Set[Tuple[int, int]] = set()
+        after = ("", "")
+        while True:
+            blocks = CustomerDedupeRepository.shared_blocks(
+                db, settings.DEDUPE_MAX_BLOCK, after, batch_size
+            )
+            if not blocks:
+                return
+            for kind, key in blocks:
+                members = (
+                    db.query(Customer)
+                    .join(
+                        CustomerDedupeKey, CustomerDedupeKey.customer_id == Customer.id
+                    )
+                    .filter(
+                        CustomerDedupeKey.kind == kind, CustomerDedupeKey.key == key,
+                        Customer.is_deleted == False
+                    )
+                    .order_by(Customer.id)
+                    .all()
+                )
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if (a.id, b.id) in seen:
+                            continue
+                        seen.add((a.id, b.id))
+                        matched = sorted(
+                            k for k, _ in dedupe_keys(a.full_name, a.phone, a.email)
+                            & dedupe_keys(b.full_name, b.phone, b.email)
+                        )
+                        score = CustomerDedupeService.score(
+                            a.full_name, b.full_name, matched
+                        )
+                        if score >= min_score:
+                            yield a.id, b.id, score, matched
+            after = tuple(blocks[-1])
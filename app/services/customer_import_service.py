@@ -0,0 +1,217 @@
+# app/services/customer_import_service.py
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+from app.repositories.customer_repository import CustomerRepository
+from app.services.customer_service import CustomerService
+from app.schemas.customer_schema import (
+    CustomerCreate, CustomerImportError, CustomerImportReport
+)
+
+# (número de fila, datos crudos, error de parseo)
+RawRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+class CustomerImportService:
+
+    FORMATS = ("csv", "ndjson")
+
+    # =========================
+    # DETECCIÓN DE FORMATO
+    # =========================
+    @staticmethod
+    def detect_format(
+            explicit: Optional[str], filename: Optional[str],
+            content_type: Optional[str]
+    ) -> str:
+        if explicit:
+            fmt = explicit.lower()
+            if fmt not in CustomerImportService.FORMATS:
+                raise HTTPException(
+                    status_code=400, detail="Invalid format (csv|ndjson)"
+                )
+            return fmt
+
+        name = (filename or "").lower()
+        if name.endswith(".csv"):
+            return "csv"
+        if name.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+
+        ctype = (content_type or "").lower()
+        if "csv" in ctype:
+            return "csv"
+        if "ndjson" in ctype or "jsonl" in ctype:
+            return "ndjson"
+
+        raise HTTPException(
+            status_code=400, detail="Cannot detect file format, use ?format=csv|ndjson"
+        )
+
+    # =========================
+    # LECTURA EN STREAMING (línea a línea, nunca el archivo completo)
+    # =========================
+    @staticmethod
+    def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[RawRow]:
+        lines = codecs.iterdecode(stream, "utf-8-sig")
+        if fmt == "csv":
+            yield from CustomerImportService._iter_csv(lines)
+        else:
+            yield from CustomerImportService._iter_ndjson(lines)
+
+    @staticmethod
+    def _iter_csv(lines) -> Iterator[RawRow]:
+        reader = csv.DictReader(lines)
+        for row_number, row in enumerate(reader, start=1):
+            if None in row:
+                yield row_number, None, "Too many columns"
+                continue
+
+            data = {}
+            for key, value in row.items():
+                value = (value or "").strip()
+                if not value:
+                    continue  # vacío => usa el default del schema
+                if key.strip() == "tags":
+                    data["tags"] = [
+                        t for t in value.replace("|", ";").split(";") if t.strip()
+                    ]
+                else:
+                    data[key.strip()] = value
+            yield row_number, data, None
+
+    @staticmethod
+    def _iter_ndjson(lines) -> Iterator[RawRow]:
+        row_number = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Each line must be a JSON object"
+                continue
+            yield row_number, data, None
+
+    # =========================
+    # IMPORT (validación + dedupe + INSERT multi-fila por chunk)
+    # =========================
+    @staticmethod
+    def import_customers(
+            db: Session, stream: BinaryIO, fmt: str, user: User
+    ) -> CustomerImportReport:
+        chunk_size = settings.IMPORT_CHUNK_SIZE
+        max_errors = settings.IMPORT_MAX_REPORTED_ERRORS
+
+        total_rows = 0
+        inserted = 0
+        failed = 0
+        errors: List[CustomerImportError] = []
+
+        def add_error(row: int, messages: List[str], email: Optional[str] = None):
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append(
+                    CustomerImportError(row=row, email=email, errors=messages)
+                )
+
+        rows = CustomerImportService.iter_rows(stream, fmt)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            total_rows += len(chunk)
+
+            # 1) Validación con el mismo schema que POST /customers/
+            valid: List[Tuple[int, CustomerCreate]] = []
+            for row_number, data, parse_error in chunk:
+                if parse_error:
+                    add_error(row_number, [parse_error])
+                    continue
+                try:
+                    valid.append((row_number, CustomerCreate.model_validate(data)))
+                except ValidationError as e:
+                    messages = [
+                        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ]
+                    # En NDJSON el email puede venir con cualquier tipo
+                    # JSON: solo se reporta si es texto
+                    email = data.get("email")
+                    add_error(
+                        row_number, messages,
+                        email=email if isinstance(email, str) else None
+                    )
+
+            # 2) Dedupe de emails: un solo IN (...) por
+            # chunk + duplicados dentro del chunk
+            existing = CustomerRepository.get_existing_emails(
+                db, {str(p.email) for _, p in valid if p.email}
+            )
+            seen = set()
+            to_insert: List[Tuple[int, dict]] = []
+            for row_number, payload in valid:
+                if payload.email:
+                    key = str(payload.email).lower()
+                    if key in existing or key in seen:
+                        add_error(
+                            row_number, ["Email already exists"],
+                            email=str(payload.email)
+                        )
+                        continue
+                    seen.add(key)
+                to_insert.append((row_number, {
+                    **payload.model_dump(),
+                    "created_by": user.id,
+                    "updated_by": user.id,
+                }))
+
+            # 3) INSERT multi-fila; si choca con una carrera concurrente (o no se pueden
+            #    deducir los ids generados), aislamos fila a fila
+            try:
+                ids = CustomerRepository.bulk_insert_customers(
+                    db, [row for _, row in to_insert]
+                )
+            except IntegrityError:
+                db.rollback()
+                ids = None
+            if ids is not None:
+                inserted += len(ids)
+            else:
+                failed_indexes = CustomerRepository.insert_customers_one_by_one(
+                    db, [row for _, row in to_insert]
+                )
+                inserted += len(to_insert) - len(failed_indexes)
+                for index in failed_indexes:
+                    row_number, row = to_insert[index]
+                    add_error(
+                        row_number, ["Email already exists"], email=row.get("email")
+                    )
+
+        if inserted:
+            CustomerService.invalidate_reads(user.id)
+            CustomerService.publish_change("bulk", None, user.id)
+
+        return CustomerImportReport(
+            total_rows=total_rows,
+            inserted=inserted,
+            failed=failed,
+            errors=errors,
+            errors_truncated=failed > len(errors),
+        )
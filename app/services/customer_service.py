@@ -1,13 +1,55 @@
 # app/service/customer_service.py
+import csv
+import io
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.repositories.customer_filter_repository import CustomerFilterRepository
-from app.schemas.customer_schema import CustomerCreate, CustomerRead
+from app.schemas.customer_schema import (
+    CustomerCreate, CustomerRead, CustomerFacets, FacetCount, TagFacet, CustomerChange,
+    CustomerChangeFeed, CustomerSuggestion, CustomerBatch, CUSTOMER_READ_FIELDS,
+    customer_projection, split_fields
+)
+from app.schemas.audit_schema import AuditEntry
 from app.schemas.pagination import Page
 from app.models.customer import Customer
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.audit_repository import AuditRepository
 from app.repositories.customer_repository import CustomerRepository
+from app.repositories.customer_tag_repository import CustomerTagRepository
+from app.repositories.customer_facet_repository import BUCKETS, CustomerFacetRepository
 from app.models.user import User
+from app.config import settings
+from app.core.cache import build_cache, build_generations
+from app.core.events import customer_events
+from app.core.singleflight import build_flight
+from app.core.serialization import trusted_model, validate_rows
+from app.db.session import after_commit
+from app.utils.dedupe_keys import normalize_email, normalize_name
+from app.utils.helpers import (
+    decode_cursor, encode_cursor, etag_matches, make_etag, query_cache_key
+)
+
+# Campos de CustomerQuery que no cambian el conjunto
+# filtrado (solo la página y su forma)
+PAGINATION_FIELDS = ("limit", "offset", "order_by", "order_dir", "fields")
+
+facets_cache = build_cache(
+    "customer_facets", settings.FACETS_CACHE_MAXSIZE, settings.FACETS_CACHE_TTL_SECONDS
+)
+list_cache = build_cache(
+    "customer_list", settings.LIST_CACHE_MAXSIZE, settings.LIST_CACHE_TTL_SECONDS
+)
+
+# Lecturas idénticas concurrentes (misma clave normalizada) comparten una consulta
+customer_reads_flight = build_flight("customer_reads")
+
+# Generaciones por scope: "owner:<id>" (lo ve ese vendedor), "all" (lo ven los admin)
+# y "global" (escrituras masivas cuyo dueño no se conoce: invalida todo).
+customer_generations = build_generations("customers")
 
 class CustomerService:
 
@@ -27,54 +69,405 @@ class CustomerService:
         )
 
         customer = CustomerRepository.insert_customer(db, entity)
+        CustomerService.invalidate_reads(customer.created_by)
 
-        return CustomerRead.model_validate(customer)
+        dto = CustomerRead.model_validate(customer)
+        CustomerService.publish_change("created", dto.id, user.id, dto)
+        return dto
 
     # =========================
     # LIST + FILTROS + PAGINACIÓN + ORDEN
     # =========================
     @staticmethod
     def list_customers(db: Session, filters, user: User) -> Page[CustomerRead]:
+        return CustomerService.list_customers_conditional(db, filters, user)[1]
+
+    @staticmethod
+    def list_customers_conditional(
+            db: Session, filters, user: User, if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[Page]]:
+        """
+        Devuelve (etag, página); la página es None si el cliente ya tiene esa versión.
+        Con filters.fields los items son del modelo proyectado, no CustomerRead.
+        """
+
+        CustomerService._end_read_transaction(db)
+        order, fields, read_model, cache_key = CustomerService._list_request(
+            filters, user
+        )
+        cached = CustomerService._cached_list(cache_key, read_model, if_none_match)
+        if cached is not None:
+            return cached
 
-        # Validaciones básicas
+        # FILTROS (repositorio) + alcance del usuario
+        conditions = CustomerService._scoped_conditions(filters, user)
+
+        # TOTAL ITEMS (sin paginar) + versión del set filtrado, en una sola consulta.
+        # Pedidos idénticos simultáneos (misma clave) comparten la consulta en vuelo
+        total_items, last_update = customer_reads_flight.do(
+            f"{cache_key}|count",
+            lambda: CustomerFilterRepository.count_and_last_update(db, conditions)
+        )
+
+        etag = CustomerService._list_etag(filters, user, total_items, last_update)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        def _load_page() -> Page:
+            # PROYECCIÓN + ORDENAMIENTO + PAGINACIÓN: SELECT Core de solo las columnas
+            # pedidas (sin notes/tags si no hacen falta), filas sin pasar por el ORM
+            items = CustomerFilterRepository.select_rows(
+                db, fields or CUSTOMER_READ_FIELDS, conditions, order, filters.offset,
+                filters.limit
+            )
+            return CustomerService._build_page(
+                filters, read_model, items, total_items, cache_key, etag
+            )
+
+        return etag, customer_reads_flight.do(f"{cache_key}|{etag}", _load_page)
+
+    # Pasos del listado sin acceso a la BD (los comparte AsyncCustomerService)
+    @staticmethod
+    def _list_request(filters, user: User):
+        """(orden, campos, modelo de respuesta, clave de cache) ya validados."""
         if filters.limit < 1 or filters.limit > 200:
             raise HTTPException(400, "Limit must be between 1 and 200")
         if filters.offset < 0:
             raise HTTPException(400, "Offset must be >= 0")
 
+        order = CustomerService._order_clause(filters)
+        fields, read_model = CustomerService._read_model(filters.fields)
+
+        # CACHE: la generación se lee antes de consultar la BD, así una escritura
+        # concurrente deja esta entrada bajo una generación que ya nadie pide
+        cache_key = query_cache_key(
+            "list", filters,
+            owner=CustomerService._owner_scope(user),
+            gen=CustomerService._generations(user)
+        )
+        return order, fields, read_model, cache_key
+
+    @staticmethod
+    def _cached_list(
+            cache_key: str, read_model, if_none_match: Optional[str]
+    ) -> Optional[Tuple[str, Optional[Page]]]:
+        cached = list_cache.get(cache_key)
+        if cached is None:
+            return None
+        etag, page_json = cached.split("\n", 1)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        return etag, Page[trusted_model(read_model)].model_validate_json(page_json)
+
+    @staticmethod
+    def _list_etag(filters, user: User, total_items: int, last_update) -> str:
+        return make_etag(
+            query_cache_key("list", filters, owner=CustomerService._owner_scope(user)),
+            total_items,
+            last_update
+        )
+
+    @staticmethod
+    def _build_page(
+            filters, read_model, items, total_items: int, cache_key: str, etag: str
+    ) -> Page:
+        # ARMAMOS EL DTO DE RESPUESTA
+        total_pages = (total_items + filters.limit - 1) // filters.limit
+
+        page = Page[read_model](
+            items=validate_rows(read_model, items),
+            total_items=total_items,
+            total_pages=total_pages,
+            limit=filters.limit,
+            offset=filters.offset
+        )
+        list_cache.set(cache_key, f"{etag}\n{page.model_dump_json()}")
+        return page
+
+    @staticmethod
+    def _order_clause(filters):
         allowed_sort_fields = ["id", "full_name", "created_at", "updated_at"]
         if filters.order_by not in allowed_sort_fields:
             raise HTTPException(400, "Invalid order_by field")
         if filters.order_dir not in ["asc", "desc"]:
             raise HTTPException(400, "Invalid order_dir (asc|desc)")
 
-        # FILTROS (repositorio)
-        query = CustomerFilterRepository.filter_customers(db, filters)
+        field = getattr(Customer, filters.order_by)
+        return field.desc() if filters.order_dir == "desc" else field.asc()
+
+    @staticmethod
+    def _read_model(fields_param: Optional[str]):
+        """(campos, modelo) para ?fields=; sin proyección => (None, CustomerRead)."""
+        try:
+            fields = split_fields(fields_param)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return fields, customer_projection(fields) if fields else CustomerRead
+
+    @staticmethod
+    def _owner_scope(user: User):
+        return "all" if user.role == "admin" else user.id
+
+    @staticmethod
+    def _end_read_transaction(db: Session) -> None:
+        """
+        Cierra la transacción que abrió la autenticación (SELECT del usuario) antes de
+        leer la generación: así el snapshot de la consulta empieza después de esa
+        lectura y una escritura confirmada en el medio no queda bajo la generación
+        nueva.
+        """
+        if db.in_transaction():
+            db.commit()
+
+    @staticmethod
+    def _generations(user: User):
+        scope = "all" if user.role == "admin" else f"owner:{user.id}"
+        return customer_generations.get("global", scope)
+
+    @staticmethod
+    def invalidate_reads(*owner_ids: Optional[int]) -> None:
+        """
+        Llamar después de cada escritura confirmada. Invalida las lecturas
+        cacheadas del dueño y las de los admin; sin dueño conocido, todas.
+        """
+        if not owner_ids or None in owner_ids:
+            scopes = ["global"]
+        else:
+            scopes = ["all", *{f"owner:{owner_id}" for owner_id in owner_ids}]
+        after_commit(lambda: customer_generations.bump(*scopes))
+
+    @staticmethod
+    def publish_change(
+            event_type: str, customer_id: Optional[int], owner_id: Optional[int],
+            customer: Optional[CustomerRead] = None
+    ) -> None:
+        """
+        Evento para GET /customers/stream (llamar después del commit). "bulk" sin
+        id avisa que cambiaron muchos clientes del dueño (None = de cualquiera).
+        """
+        event = {
+            "type": event_type,
+            "id": customer_id,
+            "owner_id": owner_id,
+            "customer": customer.model_dump(mode="json") if customer else None,
+        }
+        after_commit(lambda: customer_events.publish(event))
+
+    @staticmethod
+    def _scoped_conditions(filters, user: User) -> list:
+        conditions = CustomerFilterRepository.conditions(filters)
 
         # FILTRO: solo los clientes del usuario actual
         if user.role != "admin":
-            query = query.filter(Customer.created_by == user.id)
+            conditions.append(Customer.created_by == user.id)
 
-        # TOTAL ITEMS (sin paginar)
-        total_items = query.order_by(None).count()
+        return conditions
 
-        # ORDENAMIENTO
-        field = getattr(Customer, filters.order_by)
-        field = field.desc() if filters.order_dir == "desc" else field.asc()
-        query = query.order_by(field)
+    @staticmethod
+    def _scoped_query(db: Session, filters, user: User):
+        return db.query(Customer).filter(
+            *CustomerService._scoped_conditions(filters, user)
+        )
 
-        # PAGINACIÓN
-        items = query.offset(filters.offset).limit(filters.limit).all()
+    # =========================
+    # EXPORT (streaming, sin paginar)
+    # =========================
+    EXPORT_COLUMNS = list(CustomerRead.model_fields)
 
-        # ARMAMOS EL DTO DE RESPUESTA
-        total_pages = (total_items + filters.limit - 1) // filters.limit
+    @staticmethod
+    def export_customers(db: Session, filters, user: User, fmt: str) -> Iterator[str]:
+        if fmt not in ("csv", "ndjson"):
+            raise HTTPException(400, "Invalid format (csv|ndjson)")
 
-        return Page[CustomerRead](
-            items=[CustomerRead.model_validate(c) for c in items],
-            total_items=total_items,
-            total_pages=total_pages,
-            limit=filters.limit,
-            offset=filters.offset
+        # Se valida antes de empezar a streamear: después ya no se puede devolver un 400
+        order = CustomerService._order_clause(filters)
+        query = CustomerService._scoped_query(db, filters, user).order_by(
+            order, Customer.id
+        )
+
+        return CustomerService._export_rows(query, fmt)
+
+    @staticmethod
+    def _export_rows(query, fmt: str) -> Iterator[str]:
+        batch_size = settings.EXPORT_BATCH_SIZE
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+
+        if writer:
+            writer.writerow(CustomerService.EXPORT_COLUMNS)
+
+        pending = 0
+        # yield_per => cursor del lado del servidor (stream_results), memoria constante
+        for customer in query.yield_per(batch_size):
+            dto = CustomerRead.model_validate(customer)
+            if writer:
+                row = dto.model_dump(mode="json")
+                row["tags"] = ";".join(row["tags"])
+                writer.writerow([row[c] for c in CustomerService.EXPORT_COLUMNS])
+            else:
+                buffer.write(dto.model_dump_json())
+                buffer.write("\n")
+
+            pending += 1
+            if pending >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    # =========================
+    # TYPEAHEAD (prefijo de nombre / email, sin COUNT)
+    # =========================
+    @staticmethod
+    def suggest(
+            db: Session, prefix: str, user: User, limit: int = 10
+    ) -> List[CustomerSuggestion]:
+        if limit < 1 or limit > settings.SUGGEST_MAX_LIMIT:
+            raise HTTPException(
+                400, f"Limit must be between 1 and {settings.SUGGEST_MAX_LIMIT}"
+            )
+
+        name_prefix = normalize_name(prefix)
+        email_prefix = normalize_email(prefix) or ""
+        if " " in email_prefix:
+            email_prefix = ""
+        # Prefijos muy cortos matchean media tabla: no se consulta
+        if len(name_prefix) < settings.SUGGEST_MIN_PREFIX:
+            name_prefix = ""
+        if len(email_prefix) < settings.SUGGEST_MIN_PREFIX:
+            email_prefix = ""
+
+        owner_id = None if user.role == "admin" else user.id
+        rows = CustomerFilterRepository.suggest(
+            db, name_prefix, email_prefix, owner_id, limit
+        )
+        return validate_rows(CustomerSuggestion, rows)
+
+    # =========================
+    # FACETAS (status / source / fecha de alta) EN UNA SOLA PASADA
+    # =========================
+    @staticmethod
+    def facets(db: Session, filters, user: User, bucket: str = "day") -> CustomerFacets:
+        if bucket not in BUCKETS:
+            raise HTTPException(400, f"Invalid bucket ({'|'.join(BUCKETS)})")
+
+        CustomerService._end_read_transaction(db)
+        key = query_cache_key(
+            "facets", filters, exclude=PAGINATION_FIELDS,
+            owner=CustomerService._owner_scope(user),
+            gen=CustomerService._generations(user), bucket=bucket
+        )
+        cached = facets_cache.get(key)
+        if cached is not None:
+            return CustomerFacets.model_validate_json(cached)
+
+        query = CustomerService._scoped_query(db, filters, user)
+        rows = CustomerFacetRepository.grouped_counts(db, query, bucket)
+
+        by_status, by_source, by_created = Counter(), Counter(), Counter()
+        for status, source, created, count in rows:
+            by_status[status.value] += count
+            by_source[source.value] += count
+            by_created[created] += count
+
+        result = CustomerFacets(
+            total=sum(by_status.values()),
+            bucket=bucket,
+            status=[FacetCount(value=v, count=c) for v, c in by_status.most_common()],
+            source=[FacetCount(value=v, count=c) for v, c in by_source.most_common()],
+            created=[
+                FacetCount(value=v, count=c) for v, c in sorted(by_created.items())
+            ],
+        )
+        facets_cache.set(key, result.model_dump_json())
+        return result
+
+    # =========================
+    # FACETAS DE TAGS (cardinalidad por tag sobre el set filtrado)
+    # =========================
+    @staticmethod
+    def tag_facets(db: Session, filters, user: User, top: int = 20) -> List[TagFacet]:
+        if top < 1 or top > 200:
+            raise HTTPException(400, "Top must be between 1 and 200")
+
+        scoped = CustomerService._scoped_query(db, filters, user)
+        customer_ids = scoped.with_entities(Customer.id)
+        rows = CustomerTagRepository.tag_counts(db, customer_ids.statement, top)
+        return [TagFacet(tag=tag, count=count) for tag, count in rows]
+
+    # =========================
+    # CHANGE FEED (altas, cambios y bajas desde un cursor)
+    # =========================
+    @staticmethod
+    def changes(
+            db: Session, user: User, since: Optional[str], limit: int
+    ) -> CustomerChangeFeed:
+        if limit < 1 or limit > 1000:
+            raise HTTPException(400, "Limit must be between 1 and 1000")
+
+        after = None
+        if since:
+            try:
+                data = decode_cursor(since)
+                updated_at = datetime.fromisoformat(data["u"])
+                if updated_at.tzinfo is not None:
+                    # updated_at se guarda naive en UTC
+                    updated_at = updated_at.astimezone(timezone.utc)
+                    updated_at = updated_at.replace(tzinfo=None)
+                after = (updated_at, int(data["i"]))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(400, "Invalid cursor")
+
+            # Los tombstones más viejos que el corte del
+            # archivado ya no están en customers
+            if settings.ARCHIVE_AFTER_DAYS > 0:
+                horizon = datetime.now(timezone.utc) - timedelta(
+                    days=settings.ARCHIVE_AFTER_DAYS
+                )
+                if after[0] < horizon.replace(tzinfo=None):
+                    raise HTTPException(
+                        410, "Cursor expired, resync from the full list"
+                    )
+
+        # Un cambio con updated_at reciente puede pertenecer a una
+        # transacción que aún no confirmó: se deja fuera hasta que pase el
+        # margen, así el cursor nunca lo saltea
+        until = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.CHANGES_SAFETY_LAG_SECONDS
+        )
+        owner_id = None if user.role == "admin" else user.id
+
+        rows = CustomerRepository.get_changes(db, after, until, owner_id, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [
+            CustomerChange(op="delete", id=c.id, updated_at=c.updated_at)
+            if c.is_deleted
+            else CustomerChange(
+                op="upsert", id=c.id, updated_at=c.updated_at,
+                customer=CustomerRead.model_validate(c)
+            )
+            for c in rows
+        ]
+        if rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                {"u": last.updated_at.isoformat(), "i": last.id}
+            )
+        elif after is not None and after[0] >= until.replace(tzinfo=None):
+            next_cursor = since
+        else:
+            # Nada cambió hasta until: el cursor avanza igual (si
+            # no, envejece y termina en 410)
+            next_cursor = encode_cursor(
+                {"u": until.replace(tzinfo=None).isoformat(), "i": 0}
+            )
+        return CustomerChangeFeed(
+            items=items, next_cursor=next_cursor, has_more=has_more
         )
 
     # =========================
@@ -82,10 +475,14 @@ class CustomerService:
     # =========================
     @staticmethod
     def count_all_customers(db: Session, user: User) -> int:
-        return CustomerRepository.count_all_customers(
-            db,
-            user_id=user.id,
-            is_admin=user.role == "admin"
+        CustomerService._end_read_transaction(db)
+        return customer_reads_flight.do(
+            # con la generación: quien llega después de una escritura
+            # no se suma a una consulta previa
+            f"count:{CustomerService._owner_scope(user)}:{CustomerService._generations(user)}",
+            lambda: CustomerRepository.count_all_customers(
+                db, user_id=user.id, is_admin=user.role == "admin"
+            )
         )
 
     # =========================
@@ -93,32 +490,185 @@ class CustomerService:
     # =========================
     @staticmethod
     def get_customer(db: Session, customer_id: int, user: User) -> CustomerRead:
-        customer = CustomerRepository.get_customer_by_id(db, customer_id)
-        if not customer:
+        return CustomerService.get_customer_conditional(db, customer_id, user)[1]
+
+    @staticmethod
+    def get_customer_conditional(
+            db: Session, customer_id: int, user: User,
+            if_none_match: Optional[str] = None, fields: Optional[str] = None
+    ):
+        """
+        Devuelve (etag, cliente); el cliente es None si el If-None-Match coincide (304).
+        Con fields el cliente es del modelo proyectado (se recorta el snapshot
+        cacheado).
+        """
+        _, read_model = CustomerService._read_model(fields)
+        snapshot = CustomerRepository.get_customer_snapshot(db, customer_id)
+        return CustomerService._conditional_read(
+            snapshot, customer_id, user, if_none_match, read_model
+        )
+
+    @staticmethod
+    def _conditional_read(snapshot: Optional[dict], customer_id: int, user: User,
+                          if_none_match: Optional[str], read_model):
+        if not snapshot:
             raise HTTPException(status_code=404, detail="Customer not found")
 
-        if user.role != "admin" and customer.created_by != user.id:
+        if user.role != "admin" and snapshot["created_by"] != user.id:
             raise HTTPException(status_code=403, detail="You do not have permission to view this customer")
 
-        return CustomerRead.model_validate(customer)
+        data = snapshot["customer"]
+        updated_at = (
+            datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None
+        )
+        etag = CustomerService.customer_etag(customer_id, updated_at)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        return etag, read_model.model_validate(data)
+
+    # =========================
+    # GET POR LOTE (un get_many a la cache + un IN para los que faltan)
+    # =========================
+    @staticmethod
+    def parse_ids(raw: str) -> List[int]:
+        try:
+            return [int(part) for part in raw.split(",") if part.strip()]
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail="ids must be a comma separated list of integers"
+            )
+
+    @staticmethod
+    def get_customers_batch(
+            db: Session, customer_ids: List[int], user: User
+    ) -> CustomerBatch:
+        ids = list(dict.fromkeys(customer_ids))
+        if not ids:
+            raise HTTPException(status_code=400, detail="ids must not be empty")
+        if len(ids) > settings.BATCH_GET_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BATCH_GET_MAX_IDS} ids per request"
+            )
+
+        snapshots = CustomerRepository.get_customer_snapshots(db, ids)
+        is_admin = user.role == "admin"
+
+        found, missing = [], []
+        for customer_id in ids:
+            snapshot = snapshots.get(customer_id)
+            # Mismo filtro que get_customer, pero los ajenos van a
+            # missing en vez de cortar con 403
+            if snapshot and (is_admin or snapshot["created_by"] == user.id):
+                found.append(snapshot["customer"])
+            else:
+                missing.append(customer_id)
+        return CustomerBatch(items=validate_rows(CustomerRead, found), missing=missing)
+
+    # =========================
+    # HISTORIAL (audit log)
+    # =========================
+    @staticmethod
+    def history(
+            db: Session, customer_id: int, user: User, limit: int, offset: int
+    ) -> Page[AuditEntry]:
+        # Los admin ven también el historial de eliminados / archivados
+        if user.role != "admin":
+            snapshot = CustomerRepository.get_customer_snapshot(db, customer_id)
+            if not snapshot:
+                raise HTTPException(status_code=404, detail="Customer not found")
+            if snapshot["created_by"] != user.id:
+                raise HTTPException(
+                    status_code=403,
+                    detail="You do not have permission to view this customer"
+                )
+
+        total_items, items = AuditRepository.history(
+            db, "customer", customer_id, limit, offset
+        )
+        return Page[AuditEntry](
+            items=[AuditEntry.model_validate(e) for e in items],
+            total_items=total_items,
+            total_pages=(total_items + limit - 1) // limit,
+            limit=limit,
+            offset=offset
+        )
+
+    @staticmethod
+    def customer_etag(customer_id: int, updated_at: Optional[datetime]) -> str:
+        version = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+        return f'"{customer_id}-{version}"'
 
     # =========================
-    # UPDATE
+    # UPDATE / PATCH (un solo UPDATE condicional, sin load + refresh)
     # =========================
     @staticmethod
     def update_customer(db: Session, customer_id: int, payload: CustomerCreate, user: User) -> CustomerRead:
-        customer = CustomerRepository.get_customer_by_id(db, customer_id)
-        if not customer:
-            raise HTTPException(status_code=404, detail="Customer not found")
+        return CustomerService.patch_customer(db, customer_id, payload, user)[1]
 
-        for key, value in payload.model_dump(exclude_unset=True).items():
-            setattr(customer, key, value)
+    @staticmethod
+    def patch_customer(
+            db: Session, customer_id: int, payload, user: User,
+            if_match: Optional[str] = None
+    ) -> Tuple[str, CustomerRead]:
+        """
+        Aplica solo los campos enviados. Con If-Match el UPDATE exige que
+        updated_at siga siendo el de ese ETag (concurrencia optimista => 412).
+        Devuelve (etag nuevo, cliente).
+        """
+        expected_updated_at = CustomerService._if_match_version(customer_id, if_match)
+        owner_id = None if user.role == "admin" else user.id
+
+        values = payload.model_dump(exclude_unset=True)
+        values.update(updated_by=user.id, updated_at=datetime.now(timezone.utc))
 
-        customer.updated_by = user.id
+        try:
+            row = CustomerRepository.patch_customer(
+                db, customer_id, values, owner_id, expected_updated_at
+            )
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Email already exists")
 
-        updated = CustomerRepository.update_customer(db, customer)
+        if row is None:
+            # Solo en el camino de error: una lectura para saber qué condición falló
+            current = CustomerRepository.get_customer_by_id(db, customer_id)
+            if not current:
+                raise HTTPException(status_code=404, detail="Customer not found")
+            if owner_id is not None and current.created_by != owner_id:
+                raise HTTPException(
+                    status_code=403,
+                    detail="You do not have permission to update this customer"
+                )
+            raise HTTPException(
+                status_code=412, detail="Customer was modified by another request"
+            )
+
+        CustomerService.invalidate_reads(row["created_by"])
+        customer = CustomerRead.model_validate(row)
+        CustomerService.publish_change(
+            "updated", customer_id, row["created_by"], customer
+        )
+        return CustomerService.customer_etag(customer_id, customer.updated_at), customer
 
-        return CustomerRead.model_validate(updated)
+    @staticmethod
+    def _if_match_version(
+            customer_id: int, if_match: Optional[str]
+    ) -> Optional[datetime]:
+        """updated_at del ETag de If-Match (ver customer_etag); None = sin condición."""
+        if not if_match or if_match.strip() == "*":
+            return None
+        tag = if_match.strip().removeprefix("W/").strip('"')
+        tag_id, _, version = tag.partition("-")
+        try:
+            if int(tag_id) != customer_id:
+                raise ValueError
+            return datetime.strptime(version, "%Y%m%d%H%M%S%f")
+        except ValueError:
+            raise HTTPException(
+                status_code=412, detail="If-Match does not match the current version"
+            )
 
     # =========================
     # DELETE
@@ -131,8 +681,11 @@ class CustomerService:
 
         customer.deleted_by = user.id
         customer.deleted_at = datetime.now(timezone.utc)
+        owner_id = customer.created_by
 
         CustomerRepository.soft_delete(db, customer)
+        CustomerService.invalidate_reads(owner_id)
+        CustomerService.publish_change("deleted", customer_id, owner_id)
 
         return True
 
@@ -141,12 +694,41 @@ class CustomerService:
     # =========================
     @staticmethod
     def reactivate_customer(db: Session, customer_id: int, user: User) -> CustomerRead:
-        customer = CustomerRepository.get_customer_by_id_for_reactivation(db, customer_id)
-        if not customer:
-            raise HTTPException(status_code=404, detail="Customer not found")
-
         if user.role != "admin":
             raise HTTPException(status_code=403, detail="Only admin can reactivate customers")
 
+        customer = CustomerRepository.get_customer_by_id_for_reactivation(
+            db, customer_id
+        )
+        if not customer:
+            # Ya archivado: vuelve a la tabla caliente en la misma transacción
+            missing = ArchiveRepository.missing_customer_references(db, customer_id)
+            if missing:
+                raise HTTPException(
+                    status_code=409,
+                    detail=(
+                        f"Customer references archived users ({', '.join(missing)}); "
+                        "restore them first"
+                    )
+                )
+            try:
+                restored = ArchiveRepository.restore_customer(db, customer_id)
+            except IntegrityError:
+                db.rollback()
+                raise HTTPException(
+                    status_code=409, detail="Email already belongs to another customer"
+                )
+            if not restored:
+                raise HTTPException(status_code=404, detail="Customer not found")
+            customer = CustomerRepository.get_customer_by_id_for_reactivation(
+                db, customer_id
+            )
+
         customer = CustomerRepository.reactivate_customer(db, customer)
-        return CustomerRead.model_validate(customer)
\ No newline at end of file
+        CustomerService.invalidate_reads(customer.created_by)
+
+        dto = CustomerRead.model_validate(customer)
+        CustomerService.publish_change(
+            "reactivated", customer_id, customer.created_by, dto
+        )
+        return dto
\ No newline at end of file
@@ -8,7 +8,6 @@ class RevokedTokenService:
         revoked = RevokedToken(jti=jti)
         db.add(revoked)
         db.commit()
-        db.refresh(revoked)
         return revoked
 
     @staticmethod
@@ -22,7 +22,6 @@ class TwoFactorService:
         )
         db.add(db_code)
         db.commit()
-        db.refresh(db_code)
 
         # Aquí podrías enviar el código por SMS/email según tu proveedor
         print(f"[2FA] Código para usuario {user_id}: {code}")
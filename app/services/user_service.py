@@ -1,12 +1,15 @@
 # app/service/user_service.py
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.user import User
+from app.repositories.archive_repository import ArchiveRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.user_filter_repository import UserFilterRepository
 from app.schemas.pagination import Page
 from app.schemas.user_schema import UserCreate, UserRead
 from app.core.security import get_password_hash
+from app.core.serialization import validate_rows
 from datetime import datetime, timezone
 
 
@@ -54,24 +57,26 @@ class UserService:
             raise HTTPException(status_code=403, detail="You do not have permission to view this users")
 
         # Filtros (repositorio)
-        query = UserFilterRepository.filter_users(db, filters)
+        conditions = UserFilterRepository.conditions(filters)
 
         # TOTAL ITEMS (sin paginar)
-        total_items = query.order_by(None).count()
+        total_items = UserFilterRepository.count(db, conditions)
 
         # ORDENAMIENTO
         field = getattr(User, filters.order_by)
         field = field.desc() if filters.order_dir == "desc" else field.asc()
-        query = query.order_by(field)
 
-        # PAGINACIÓN
-        items = query.offset(filters.offset).limit(filters.limit).all()
+        # PAGINACIÓN: SELECT Core de las columnas de UserRead, sin instancias ORM
+        items = UserFilterRepository.select_rows(
+            db, list(UserRead.model_fields), conditions, field, filters.offset,
+            filters.limit
+        )
 
         # ARMAMOS EL DTO DE RESPUESTA
         total_pages = (total_items + filters.limit - 1) // filters.limit
 
         return Page[UserRead](
-            items=[UserRead.model_validate(c) for c in items],
+            items=validate_rows(UserRead, items),
             total_items=total_items,
             total_pages=total_pages,
             limit=filters.limit,
@@ -83,38 +88,41 @@ class UserService:
     # =========================
     @staticmethod
     def get_user(db: Session, user_id: int, current_user: User) -> UserRead:
-        user = UserRepository.get_user_by_id(db, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
         if current_user.role != "admin":
             raise HTTPException(status_code=403, detail="You do not have permission to view this user")
 
-        return UserRead.model_validate(user)
+        user = UserRepository.get_user_read(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        return user
 
     # =========================
     # UPDATE
     # =========================
     @staticmethod
-    def update_user(db: Session, user_id: int, payload: UserCreate, current_user: User) -> UserRead:
-        user = UserRepository.get_user_by_id(db, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
+    def update_user(db: Session, user_id: int, payload, current_user: User) -> UserRead:
+        """PUT (UserCreate) y PATCH (UserPatch): un solo UPDATE con lo enviado."""
         if current_user.role != "admin":
             raise HTTPException(status_code=403, detail="You do not have permission to update this user")
 
         data = payload.model_dump(exclude_unset=True)
         if "password" in data:
-            user.hashed_password = get_password_hash(data.pop("password"))
-
-        for key, value in data.items():
-            setattr(user, key, value)
-
-        user.updated_by = current_user.id
+            data["hashed_password"] = get_password_hash(data.pop("password"))
+        data.update(updated_by=current_user.id, updated_at=datetime.now(timezone.utc))
+
+        try:
+            row = UserRepository.patch_user(db, user_id, data)
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=400, detail="Username or email already exists"
+            )
+
+        if row is None:
+            raise HTTPException(status_code=404, detail="User not found")
 
-        updated = UserRepository.update_user(db, user)
-        return UserRead.model_validate(updated)
+        return UserRead.model_validate(row)
 
     # =========================
     # DELETE
@@ -140,12 +148,32 @@ class UserService:
     # =========================
     @staticmethod
     def reactivate_user(db: Session, user_id: int, current_user: User) -> UserRead:
-        user = UserRepository.get_user_by_id_for_reactivation(db, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
         if current_user.role != "admin":
             raise HTTPException(status_code=403, detail="You do not have permission to update this user")
 
+        user = UserRepository.get_user_by_id_for_reactivation(db, user_id)
+        if not user:
+            # Ya archivado: vuelve a la tabla caliente en la misma transacción
+            missing = ArchiveRepository.missing_user_references(db, user_id)
+            if missing:
+                raise HTTPException(
+                    status_code=409,
+                    detail=(
+                        f"User references archived users ({', '.join(missing)}); "
+                        "restore them first"
+                    )
+                )
+            try:
+                restored = ArchiveRepository.restore_user(db, user_id)
+            except IntegrityError:
+                db.rollback()
+                raise HTTPException(
+                    status_code=409,
+                    detail="Username or email already belongs to another user"
+                )
+            if not restored:
+                raise HTTPException(status_code=404, detail="User not found")
+            user = UserRepository.get_user_by_id_for_reactivation(db, user_id)
+
         user = UserRepository.reactivate_user(db, user)
         return UserRead.model_validate(user)
\ No newline at end of file
@@ -0,0 +1,75 @@
+# app/utils/dedupe_keys.py
+"""
+Claves de bloqueo para detectar leads duplicados sin comparar todos contra todos:
+dos clientes solo se comparan si comparten al menos una clave (lookup indexado).
+"""
+import re
+import unicodedata
+from typing import Optional, Set, Tuple
+
+PHONE_DIGITS = 8  # últimos dígitos: ignora +54 / 9 / 0 / 15 y demás prefijos
+
+# Soundex adaptado: b/f/p/v, c/g/j/k/q/s/x/z, d/t, l, m/n, r (vocales, h, w, y no suman)
+_SOUNDEX = {c: str(code) for code, letters in enumerate(
+    ("bfpv", "cgjkqsxz", "dt", "l", "mn", "r"), start=1) for c in letters}
+
+
+def strip_accents(value: str) -> str:
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c)
+    )
+
+
+def normalize_name(value: Optional[str]) -> str:
+    return " ".join(
+        re.findall(r"[a-zñ]+", strip_accents((value or "").lower().replace("ñ", "n")))
+    )
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    """Email para búsqueda por prefijo: minúsculas y sin acentos, como el typeahead."""
+    return strip_accents(value.strip().lower()) if value else None
+
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-PHONE_DIGITS:] if len(digits) >= PHONE_DIGITS else None
+
+
+def _soundex(word: str) -> str:
+    # En castellano la h inicial es muda ("Hernan" ~ "Ernan")
+    word = word[1:] if word.startswith("h") and len(word) > 1 else word
+    codes = [_SOUNDEX.get(c, "") for c in word]
+    key, last = word[0], codes[0]
+    for c, code in zip(word[1:], codes[1:]):
+        if code and code != last:
+            key += code
+        if c not in "hw":
+            last = code
+    return (key + "000")[:4]
+
+
+def name_key(full_name: Optional[str]) -> Optional[str]:
+    """Clave fonética sin importar el orden ("Perez Ana" == "Ana Pérez")."""
+    words = [w for w in normalize_name(full_name).split() if len(w) > 1]
+    if not words:
+        return None
+    return " ".join(sorted(_soundex(w) for w in words))
+
+
+def email_key(email: Optional[str]) -> Optional[str]:
+    """Parte local sin +etiqueta ni puntos (juan.perez+web@x == juanperez@y)."""
+    if not email or "@" not in email:
+        return None
+    local = email.split("@", 1)[0].lower().split("+", 1)[0].replace(".", "")
+    return local or None
+
+
+def dedupe_keys(
+        full_name: Optional[str], phone: Optional[str], email: Optional[str]
+) -> Set[Tuple[str, str]]:
+    keys = {
+        ("phone", phone_key(phone)), ("name", name_key(full_name)),
+        ("email", email_key(email))
+    }
+    return {(kind, key) for kind, key in keys if key}
@@ -0,0 +1,58 @@
+# app/utils/helpers.py
+import base64
+import hashlib
+import json
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+def query_cache_key(namespace: str, filters: BaseModel, exclude=(), **scope) -> str:
+    """
+    Clave estable para un set de filtros: ignora los valores None/por defecto
+    no seteados y el orden de los campos, así dos requests equivalentes
+    comparten entrada de cache.
+    """
+    data = filters.model_dump(mode="json", exclude=set(exclude), exclude_none=True)
+    raw = json.dumps(
+        {"f": data, "s": scope}, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return f"{namespace}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def make_etag(*parts) -> str:
+    """ETag fuerte (entre comillas) a partir de las partes que definen la versión."""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match con comparación débil (RFC 9110): sin W/, con listas y '*'."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(t) for t in if_none_match.split(",")}
+
+
+def encode_cursor(data: dict) -> str:
+    """Cursor opaco para paginación keyset (base64url de un JSON compacto)."""
+    raw = json.dumps(data, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Inverso de encode_cursor. ValueError si el cursor no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
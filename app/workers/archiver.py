@@ -0,0 +1,60 @@
+# app/workers/archiver.py
+import threading
+from typing import Optional
+
+from app.config import settings
+from app.core.logger import get_logger
+from app.db.session import SessionLocal
+from app.services.archive_service import ArchiveService
+
+logger = get_logger(__name__)
+
+
+class Archiver:
+    """Corre ArchiveService.archive_expired cada ARCHIVE_INTERVAL_SECONDS."""
+
+    def __init__(self, interval: Optional[float] = None, session_factory=SessionLocal):
+        self.interval = (
+            settings.ARCHIVE_INTERVAL_SECONDS if interval is None else interval
+        )
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=30)
+        self._thread = None
+
+    def run_once(self) -> dict:
+        db = self.session_factory()
+        try:
+            return ArchiveService.archive_expired(db)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                moved = self.run_once()
+                if moved["customers"] or moved["users"]:
+                    logger.info(
+                        "Archived %s customers and %s users", moved["customers"],
+                        moved["users"]
+                    )
+            except Exception:
+                # Con varios workers dos corridas pueden chocar en el mismo
+                # batch: se reintenta en la próxima
+                logger.exception("Archive run failed")
+
+
+archiver = Archiver()
@@ -0,0 +1,121 @@
+# app/workers/audit_writer.py
+import queue
+import threading
+from collections import defaultdict
+from typing import List, Optional
+
+from app.config import settings
+from app.core.logger import get_logger
+from app.repositories.audit_repository import AuditRepository
+
+logger = get_logger(__name__)
+
+
+class AuditWriter:
+    """
+    Persiste las entradas de auditoría fuera del request: una cola acotada
+    (AUDIT_QUEUE_MAXSIZE) que un hilo vacía en INSERTs de hasta
+    AUDIT_BATCH_SIZE filas, cada AUDIT_FLUSH_INTERVAL_SECONDS como máximo.
+
+    - Cola llena: el request escribe su lote él mismo (backpressure, no se pierde nada).
+    - Sin hilo corriendo (tests, scripts): escritura sincrónica.
+    - stop() vacía la cola antes de terminar.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, batch_size: Optional[int] = None,
+                 interval: Optional[float] = None):
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.interval = (
+            settings.AUDIT_FLUSH_INTERVAL_SECONDS if interval is None else interval
+        )
+        self._queue: "queue.Queue" = queue.Queue(
+            maxsize=maxsize or settings.AUDIT_QUEUE_MAXSIZE
+        )
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.inline_writes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=30)
+        self._thread = None
+        self._drain()  # lo que haya quedado encolado después de la última vuelta
+
+    def enqueue(self, bind, rows: List[dict]) -> None:
+        """bind = engine sync de la sesión que confirmó (el log va a la misma base)."""
+        if not rows:
+            return
+        if not self.running:
+            self._write(bind, rows)
+            return
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put_nowait((bind, row))
+            except queue.Full:
+                self.inline_writes += 1
+                self._write(bind, rows[index:])
+                return
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "inline_writes": self.inline_writes,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                continue
+            self._write_batch([first] + self._take(self.batch_size - 1))
+
+    def _take(self, limit: int) -> list:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _drain(self) -> None:
+        while True:
+            items = self._take(self.batch_size)
+            if not items:
+                return
+            self._write_batch(items)
+
+    def _write_batch(self, items: list) -> None:
+        by_bind = defaultdict(list)
+        for bind, row in items:
+            by_bind[bind].append(row)
+        for bind, rows in by_bind.items():
+            self._write(bind, rows)
+
+    def _write(self, bind, rows: List[dict]) -> None:
+        try:
+            AuditRepository.insert_many(bind, rows)
+            self.written += len(rows)
+        except Exception:
+            logger.exception("Could not write %s audit entries", len(rows))
+
+
+audit_writer = AuditWriter()
@@ -0,0 +1,34 @@
+"""
+Mueve a customers_archive / users_archive los registros eliminados hace más de N días.
+
+Uso:
+    python scripts/archive_deleted.py [--days 30] [--batch-size 500]
+
+Es la misma tarea que corre el job en background de la API (ARCHIVE_INTERVAL_SECONDS);
+sirve para correrla desde cron o a mano con ARCHIVE_INTERVAL_SECONDS=0.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.archive_service import ArchiveService  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = ArchiveService.archive_expired(
+            db, days=args.days, batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+    print(f"Archivados: {moved['customers']} clientes, {moved['users']} usuarios")
@@ -0,0 +1,159 @@
+"""
+Benchmark de carga: rutas calientes de /customers con el stack sync
+(def + Session en el threadpool) contra el async (async def + AsyncSession).
+
+Uso:
+    python scripts/bench_async_load.py [requests] [concurrencia] [espera_ms]
+
+Corre contra un SQLite en archivo temporal (sqlite / sqlite+aiosqlite) con
+las caches apagadas, así cada request va a la BD. SQLite local no tiene red:
+para modelar el tiempo que un request pasa esperando a MySQL, cada sesión
+espera espera_ms al abrirse (time.sleep en el sync, que ocupa un hilo del
+threadpool; asyncio.sleep en el async, que no ocupa nada). Con espera 0 se
+ve solo el overhead de cada stack.
+"""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.v1.customers import router as customer_router  # noqa: E402
+from app.api.v1.customers_async import router as async_customer_router  # noqa: E402
+from app.core.cache import CACHES  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import get_async_connection, get_connection  # noqa: E402
+from app.dependencies.auth import get_current_user, get_current_user_async  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+CUSTOMERS = 5000
+# límite por defecto de anyio.to_thread (el que usa Starlette para los def)
+THREADPOOL = 40
+
+
+def build_apps(path: str, wait: float, pool_size: int):
+    # Pool = concurrencia a propósito: que el límite sea el threadpool y no las
+    # conexiones (el stack sync retiene la sesión mientras espera hilo para el endpoint)
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False},
+        pool_size=pool_size, max_overflow=0
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": 1, "username": "admin", "email": "admin@example.com",
+                    "hashed_password": "x", "role": "admin", "created_by": 1,
+                    "updated_by": 1
+                }
+            ]
+        )
+        db.execute(insert(Customer), [
+            {"full_name": f"Cliente {i}", "name_search": f"cliente {i}",
+             "email": f"c{i}@example.com", "notes": "nota", "tags": ["vip"],
+             "created_by": 1, "updated_by": 1}
+            for i in range(CUSTOMERS)
+        ])
+        db.commit()
+        admin = db.get(User, 1)
+
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", pool_size=pool_size, max_overflow=0
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    def sync_db():
+        time.sleep(wait)
+        with SessionLocal() as db:
+            yield db
+
+    async def async_db():
+        await asyncio.sleep(wait)
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    sync_app = FastAPI()
+    sync_app.include_router(customer_router, prefix="/customers")
+    sync_app.dependency_overrides = {
+        get_connection: sync_db, get_current_user: lambda: admin
+    }
+
+    async_app = FastAPI()
+    async_app.include_router(async_customer_router, prefix="/customers")
+    async_app.dependency_overrides = {
+        get_async_connection: async_db, get_current_user_async: lambda: admin
+    }
+    return sync_app, async_app
+
+
+async def run(app: FastAPI, paths, concurrency: int) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        queue = list(paths)
+
+        async def worker():
+            while queue:
+                path = queue.pop()
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    return len(latencies) / elapsed, p50, p95
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    wait_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    for cache in CACHES.values():
+        cache.ttl = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_app, async_app = build_apps(
+            str(Path(tmp) / "bench.db"), wait_ms / 1000, concurrency
+        )
+        print(f"{total} requests, concurrencia {concurrency}, "
+              f"espera de BD simulada {wait_ms} ms, "
+              f"threadpool de Starlette: {THREADPOOL} hilos")
+
+        rng = random.Random(1)
+        workloads = {
+            "GET /customers/{id}": [
+                f"/customers/{rng.randint(1, CUSTOMERS)}" for _ in range(total)
+            ],
+            "GET /customers/?limit=50": [
+                f"/customers/?limit=50&offset={rng.randint(0, 99) * 50}"
+                for _ in range(total)
+            ],
+        }
+        for name, paths in workloads.items():
+            for label, app in (("sync ", sync_app), ("async", async_app)):
+                rps, p50, p95 = asyncio.run(run(app, paths, concurrency))
+                print(f"{name:<26} {label} {rps:8.0f} req/s   "
+                      f"p50 {p50 * 1e3:7.1f} ms   p95 {p95 * 1e3:7.1f} ms")
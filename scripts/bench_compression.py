@@ -0,0 +1,71 @@
+"""
+Benchmark: bytes en el cable y CPU de CompressionMiddleware.
+
+Uso:
+    python scripts/bench_compression.py [repeticiones]
+
+Arma una página de 200 CustomerRead con notas y tags (lo que devuelve
+GET /customers/?limit=200) y un export NDJSON de 10000 filas partido en
+chunks de EXPORT_BATCH_SIZE, y los comprime con cada codificación
+disponible (br / zstd solo si brotli / zstandard están instalados).
+El export se comprime chunk a chunk con flush, igual que en el middleware.
+"""
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.middleware.compression import available_encoders  # noqa: E402
+from app.schemas.customer_schema import CustomerRead  # noqa: E402
+from app.schemas.pagination import Page  # noqa: E402
+
+PAGE = 200
+EXPORT_ROWS = 10000
+
+
+def customer(i: int) -> CustomerRead:
+    now = datetime.now(timezone.utc)
+    return CustomerRead(
+        id=i, full_name=f"Cliente {i}", email=f"c{i}@example.com", phone="11 4567 8901",
+        source="web", status="NEW",
+        notes=f"Llamar después de las 17 hs. Interesado en el plan anual ({i}).",
+        tags=["vip", "mayorista", f"zona-{i % 7}"], created_at=now, updated_at=now,
+    )
+
+
+def compress(encoder_factory, chunks) -> bytes:
+    encoder = encoder_factory()
+    out = [encoder.compress(chunk) + encoder.flush() for chunk in chunks[:-1]]
+    out.append(encoder.compress(chunks[-1]) + encoder.finish())
+    return b"".join(out)
+
+
+def bench(name: str, chunks, total: int) -> None:
+    raw = sum(len(c) for c in chunks)
+    print(f"{name}: {raw / 1024:8.1f} KB sin comprimir, {len(chunks)} chunk(s)")
+    for encoding, factory in available_encoders().items():
+        compress(factory, chunks)  # warm-up
+        start = time.process_time()
+        for _ in range(total):
+            body = compress(factory, chunks)
+        cpu = (time.process_time() - start) / total
+        print(f"  {encoding:<5} {len(body) / 1024:8.1f} KB ({raw / len(body):5.1f}x)  "
+              f"CPU {cpu * 1e3:7.2f} ms  ({raw / cpu / 2**20:6.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    page = Page[CustomerRead](
+        items=[customer(i) for i in range(PAGE)], total_items=PAGE, total_pages=1,
+        limit=PAGE, offset=0
+    )
+    bench(f"GET /customers/ ({PAGE} filas)", [page.model_dump_json().encode()], total)
+
+    rows = [customer(i).model_dump_json() + "\n" for i in range(EXPORT_ROWS)]
+    batch = settings.EXPORT_BATCH_SIZE
+    chunks = ["".join(rows[i:i + batch]).encode() for i in range(0, EXPORT_ROWS, batch)]
+    bench(f"export ndjson ({EXPORT_ROWS} filas)", chunks, max(1, total // 10))
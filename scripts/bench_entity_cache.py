@@ -0,0 +1,84 @@
+"""
+Benchmark: vista de detalle (GET /customers/{id}) con y sin la cache de entidades.
+
+Uso:
+    python scripts/bench_entity_cache.py [lecturas] [rtt_ms]
+
+Corre contra SQLite en memoria. `rtt_ms` agrega una espera por sentencia para
+simular el round trip contra MySQL en otra máquina (por defecto 0.5 ms).
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.security.user_security_info import UserSecurityInfo  # noqa: E402,F401
+from app.repositories.customer_repository import customer_cache  # noqa: E402
+from app.services.customer_service import CustomerService  # noqa: E402
+
+CUSTOMERS = 1_000
+
+
+def make_session(rtt: float):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _round_trip(*args):
+        statements["count"] += 1
+        if rtt:
+            time.sleep(rtt)
+
+    db = sessionmaker(bind=engine)()
+    user = User(id=1, username="bench", email="bench@example.com", hashed_password="x",
+                role="admin", created_by=1, updated_by=1)
+    db.add(user)
+    db.commit()
+    db.execute(insert(Customer), [
+        {"full_name": f"Cliente {i}", "email": f"c{i}@example.com", "tags": ["bench"],
+         "created_by": 1, "updated_by": 1}
+        for i in range(CUSTOMERS)
+    ])
+    db.commit()
+    statements["count"] = 0
+    return db, user, statements
+
+
+def bench(reads: int, rtt: float, cached: bool):
+    db, user, statements = make_session(rtt)
+    customer_cache.clear()
+    customer_cache.ttl = customer_cache.ttl if cached else 0
+
+    # Acceso sesgado: pocas fichas concentran la mayoría de las lecturas
+    rng = random.Random(42)
+    ids = [min(int(rng.paretovariate(1.2)), CUSTOMERS) for _ in range(reads)]
+
+    start = time.perf_counter()
+    for customer_id in ids:
+        CustomerService.get_customer(db, customer_id, user)
+    elapsed = time.perf_counter() - start
+    return elapsed, statements["count"]
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    rtt = (float(sys.argv[2]) if len(sys.argv) > 2 else 0.5) / 1000
+
+    ttl = customer_cache.ttl
+    for name, cached in (("sin cache", False), ("con cache", True)):
+        customer_cache.ttl = ttl
+        elapsed, statements = bench(total, rtt, cached)
+        print(f"{name:<10} {total} lecturas en {elapsed:6.2f}s -> "
+              f"{elapsed / total * 1e6:8.1f} us/lectura, {statements} sentencias SQL")
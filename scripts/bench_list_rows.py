@@ -0,0 +1,120 @@
+"""
+Benchmark: página de 200 clientes / usuarios leída como instancias ORM (camino
+anterior) o como filas de un SELECT Core (select_rows).
+
+Uso:
+    python scripts/bench_list_rows.py [páginas]
+
+Corre contra SQLite en memoria. Cada página usa una sesión nueva, como un
+request. Mide latencia (query + validación a DTO) y el pico de memoria
+asignada por página (tracemalloc).
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.serialization import validate_rows  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.security.user_security_info import UserSecurityInfo  # noqa: E402,F401
+from app.repositories.customer_filter_repository import CustomerFilterRepository  # noqa: E402
+from app.repositories.user_filter_repository import UserFilterRepository  # noqa: E402
+# noqa: E402
+from app.schemas.customer_schema import (
+    CUSTOMER_READ_FIELDS, CustomerQuery, CustomerRead
+)
+from app.schemas.user_schema import UserQuery, UserRead  # noqa: E402
+
+PAGE = 200
+ROWS = 5_000
+
+
+def make_sessionmaker():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        db.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com",
+             "full_name": f"Usuario {i}", "hashed_password": "x", "role": "user",
+             "created_by": 1, "updated_by": 1}
+            for i in range(1, ROWS + 1)
+        ])
+        db.execute(insert(Customer), [
+            {"full_name": f"Cliente {i}", "email": f"c{i}@example.com",
+             "phone": "11 4567 8901", "notes": "nota de prueba",
+             "tags": ["bench", "vip"], "created_by": 1, "updated_by": 1}
+            for i in range(ROWS)
+        ])
+        db.commit()
+    return Session
+
+
+CASES = {
+    "customers": (
+        Customer, CustomerRead, CustomerFilterRepository, CustomerQuery(),
+        CUSTOMER_READ_FIELDS
+    ),
+    "users": (
+        User, UserRead, UserFilterRepository, UserQuery(), tuple(UserRead.model_fields)
+    ),
+}
+
+
+def orm_page(db, model, dto, repo, filters, columns, offset):
+    items = (
+        db.query(model).filter(*repo.conditions(filters))
+        .order_by(model.id).offset(offset).limit(PAGE).all()
+    )
+    return validate_rows(dto, items)
+
+
+def core_page(db, model, dto, repo, filters, columns, offset):
+    items = repo.select_rows(
+        db, columns, repo.conditions(filters), model.id, offset, PAGE
+    )
+    return validate_rows(dto, items)
+
+
+def bench(Session, read_page, case, pages: int):
+    args = CASES[case]
+    offsets = [(i * PAGE) % (ROWS - PAGE) for i in range(pages)]
+
+    gc.collect()
+    collections = sum(s["collections"] for s in gc.get_stats())
+    start = time.perf_counter()
+    for offset in offsets:
+        with Session() as db:
+            assert len(read_page(db, *args, offset)) == PAGE
+    elapsed = (time.perf_counter() - start) / pages
+    collections = sum(s["collections"] for s in gc.get_stats()) - collections
+
+    tracemalloc.start()
+    with Session() as db:
+        read_page(db, *args, 0)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, collections
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    Session = make_sessionmaker()
+
+    for case in CASES:
+        for name, read_page in (("ORM", orm_page), ("Core", core_page)):
+            elapsed, peak, collections = bench(Session, read_page, case, pages)
+            print(f"{case:<9} {name:<4} {elapsed * 1e3:6.2f} ms/página, "
+                  f"pico {peak / 1024:7.1f} KiB, "
+                  f"{collections} pasadas de GC en {pages} páginas")
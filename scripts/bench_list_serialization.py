@@ -0,0 +1,133 @@
+"""
+Benchmark: páginas de 200 filas de GET /customers/ y GET /users/ con y sin
+FAST_JSON_RESPONSES.
+
+Uso:
+    python scripts/bench_list_serialization.py [requests]
+
+Corre contra SQLite en memoria con la cache de listados apagada, así cada
+request consulta, valida y serializa la página completa. También mide la
+validación sola: model_validate fila por fila contra validate_rows.
+
+La diferencia entre los dos caminos depende de la versión de FastAPI: la de
+requirements.txt (0.110) re-valida la respuesta contra response_model antes de
+serializarla; las más nuevas ya la serializan directo con pydantic-core.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fastapi  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.core.serialization import orjson, validate_rows  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import get_connection  # noqa: E402
+from app.dependencies.auth import get_current_user  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.customer_schema import CustomerQuery, CustomerRead  # noqa: E402
+from app.schemas.user_schema import UserQuery, UserRead  # noqa: E402
+from app.services.customer_service import list_cache  # noqa: E402
+
+PAGE = 200
+
+
+def make_session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.execute(insert(User), [
+        {"id": i, "username": f"user{i}", "email": f"user{i}@example.com",
+         "full_name": f"Usuario {i}", "hashed_password": "x",
+         "role": "admin" if i == 1 else "user", "created_by": 1, "updated_by": 1}
+        for i in range(1, PAGE + 1)
+    ])
+    db.execute(insert(Customer), [
+        {"full_name": f"Cliente {i}", "email": f"c{i}@example.com",
+         "phone": "11 4567 8901", "notes": "nota de prueba", "tags": ["bench", "vip"],
+         "created_by": 1, "updated_by": 1}
+        for i in range(PAGE)
+    ])
+    db.commit()
+    admin = db.get(User, 1)
+
+    # Query params fijos: páginas de 200 (el máximo del service)
+    app.dependency_overrides[get_connection] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[CustomerQuery] = lambda: CustomerQuery.model_construct(
+        **{**CustomerQuery().model_dump(), "limit": PAGE})
+    app.dependency_overrides[UserQuery] = lambda: UserQuery.model_construct(
+        **{**UserQuery().model_dump(), "limit": PAGE})
+    return db
+
+
+async def get(path: str) -> bytes:
+    """GET directo contra la app ASGI (sin cliente HTTP de por medio)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def bench_endpoint(path: str, total: int, fast: bool) -> float:
+    settings.FAST_JSON_RESPONSES = fast
+    await get(path)  # warm-up
+    start = time.perf_counter()
+    for _ in range(total):
+        await get(path)
+    return (time.perf_counter() - start) / total
+
+
+def bench_validation(rows, model, total: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(total):
+        [model.model_validate(row) for row in rows]
+    per_row = (time.perf_counter() - start) / total
+    start = time.perf_counter()
+    for _ in range(total):
+        validate_rows(model, rows)
+    return per_row, (time.perf_counter() - start) / total
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    list_cache.ttl = 0
+    db = make_session()
+    print(f"FastAPI {fastapi.__version__}, orjson {'sí' if orjson else 'no'}")
+
+    for path in ("/customers/", "/users/"):
+        slow = asyncio.run(bench_endpoint(path, total, fast=False))
+        fast = asyncio.run(bench_endpoint(path, total, fast=True))
+        print(f"GET {path:<12} {PAGE} filas: "
+              f"response_model {slow * 1e3:6.2f} ms/página, "
+              f"rápido {fast * 1e3:6.2f} ms/página ({slow / fast:4.1f}x)")
+
+    for model, rows in (
+        (CustomerRead, db.query(Customer).all()), (UserRead, db.query(User).all())
+    ):
+        per_row, bulk = bench_validation(rows, model, total)
+        print(f"validación {model.__name__:<12} por fila {per_row * 1e3:6.2f} ms, "
+              f"validate_rows {bulk * 1e3:6.2f} ms ({per_row / bulk:4.1f}x)")
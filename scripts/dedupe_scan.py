@@ -0,0 +1,45 @@
+"""
+Busca pares de clientes posiblemente duplicados y los escribe como CSV.
+
+Uso:
+    python scripts/dedupe_scan.py [--min-score 0.5] [--backfill] > duplicados.csv
+
+Solo compara clientes que comparten una clave de bloqueo (teléfono, nombre
+fonético o email), así que no recorre todos los pares de la tabla. Con
+--backfill recalcula antes customer_dedupe_keys (p. ej. si cambió la normalización).
+"""
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.customer_dedupe_service import CustomerDedupeService  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-score", type=float, default=settings.DEDUPE_MIN_SCORE)
+    parser.add_argument("--backfill", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            total = CustomerDedupeService.backfill_keys(db, batch_size=args.batch_size)
+            print(f"Claves recalculadas para {total} clientes", file=sys.stderr)
+
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["customer_id", "duplicate_id", "score", "matched"])
+        pairs = 0
+        for customer_id, duplicate_id, score, matched in CustomerDedupeService.scan(
+                db, min_score=args.min_score, batch_size=args.batch_size):
+            writer.writerow([customer_id, duplicate_id, score, "|".join(matched)])
+            pairs += 1
+    finally:
+        db.close()
+    print(f"Pares encontrados: {pairs}", file=sys.stderr)
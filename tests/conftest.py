@@ -0,0 +1,87 @@
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db.base import Base
+from app.core.cache import CACHES
+from app.db.session import get_connection
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in CACHES.values():
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+    )()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _make_user(db, username: str, role: str) -> User:
+    user = User(
+        username=username,
+        email=f"{username}@example.com",
+        full_name=username.title(),
+        hashed_password="x",
+        role=role,
+        created_by=1,
+        updated_by=1,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def admin(db):
+    return _make_user(db, "admin", "admin")
+
+
+@pytest.fixture
+def seller(db, admin):
+    return _make_user(db, "seller", "user")
+
+
+@pytest.fixture
+def client_as(db):
+    """Devuelve un TestClient autenticado como el usuario indicado."""
+    users = {}
+
+    def _current_user(request: Request) -> User:
+        return users[request.headers["X-Test-User"]]
+
+    app.dependency_overrides[get_connection] = lambda: db
+    app.dependency_overrides[get_current_user] = _current_user
+
+    def _client(user: User) -> TestClient:
+        users[str(user.id)] = user
+        return TestClient(app, headers={"X-Test-User": str(user.id)})
+
+    yield _client
+    app.dependency_overrides.clear()
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.customer import Customer
+from app.models.customer_archive import CustomerArchive
+from app.models.user import User
+from app.models.user_archive import UserArchive
+from app.services.archive_service import ArchiveService
+
+
+def _days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def _seed(db, admin, seller):
+    gone = User(
+        username="gone", email="gone@example.com", hashed_password="x", role="user",
+        created_by=admin.id, updated_by=admin.id, is_deleted=True,
+        deleted_at=_days_ago(90)
+    )
+    seller.is_deleted = True
+    seller.deleted_at = _days_ago(90)
+    db.add_all(
+        [
+            gone,
+            Customer(
+                id=10, full_name="Viejo", email="viejo@example.com", tags=["vip"],
+                is_deleted=True, deleted_at=_days_ago(40), created_by=admin.id,
+                updated_by=admin.id
+            ),
+            Customer(
+                id=11, full_name="Reciente", is_deleted=True, deleted_at=_days_ago(1),
+                created_by=admin.id, updated_by=admin.id
+            ),
+            Customer(
+                id=12, full_name="Activo", created_by=seller.id, updated_by=seller.id
+            ),
+        ]
+    )
+    db.commit()
+    return gone.id
+
+
+def test_archive_moves_only_expired_unreferenced_rows(db, admin, seller):
+    gone_id = _seed(db, admin, seller)
+
+    moved = ArchiveService.archive_expired(db, days=30, batch_size=1)
+
+    assert moved == {"customers": 1, "users": 1}
+    assert [c.id for c in db.query(Customer).order_by(Customer.id)] == [11, 12]
+    assert db.query(CustomerArchive).one().id == 10
+    # seller sigue siendo dueño de un cliente activo: no se puede archivar
+    assert db.query(UserArchive).one().id == gone_id
+    assert db.get(User, seller.id) is not None
+
+
+def test_reactivate_restores_from_archive(db, admin, seller, client_as):
+    gone_id = _seed(db, admin, seller)
+    ArchiveService.archive_expired(db, days=30)
+    db.refresh(admin)
+    client = client_as(admin)
+
+    response = client.post("/customers/10/reactivate")
+    assert response.status_code == 200
+    assert response.json()["email"] == "viejo@example.com"
+    assert db.query(CustomerArchive).count() == 0
+    assert client.get("/customers/?tags_any=vip").json()["total_items"] == 1
+
+    assert client.post(f"/users/{gone_id}/reactivate").json()["username"] == "gone"
+    assert db.query(UserArchive).count() == 0
+    assert client.post("/customers/999/reactivate").status_code == 404
+
+
+def test_reactivate_reports_an_archived_owner_instead_of_a_duplicate_email(
+        db, admin, client_as
+):
+    owner = User(
+        username="owner", email="owner@example.com", hashed_password="x", role="user",
+        created_by=admin.id, updated_by=admin.id, is_deleted=True,
+        deleted_at=_days_ago(90)
+    )
+    db.add(owner)
+    db.flush()
+    db.add(
+        Customer(
+            id=20, full_name="Huerfano", email="huerfano@example.com", is_deleted=True,
+            deleted_at=_days_ago(40), created_by=owner.id, updated_by=owner.id
+        )
+    )
+    db.commit()
+    # El cliente se archiva primero; después el dueño ya no tiene
+    # referencias y se archiva también
+    ArchiveService.archive_expired(db, days=30)
+    ArchiveService.archive_expired(db, days=30)
+    assert db.query(UserArchive).one().id == owner.id
+    db.refresh(admin)
+    client = client_as(admin)
+
+    response = client.post("/customers/20/reactivate")
+    assert response.status_code == 409
+    assert "created_by" in response.json()["detail"]
+    assert db.query(CustomerArchive).one().id == 20
+
+    assert client.post(f"/users/{owner.id}/reactivate").status_code == 200
+    assert client.post("/customers/20/reactivate").status_code == 200
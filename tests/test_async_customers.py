@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.customers import router as customer_router
+from app.api.v1.customers_async import router as async_customer_router
+from app.core.cache import CACHES
+from app.db.base import Base
+from app.db.session import get_async_connection, get_connection
+from app.dependencies.auth import get_current_user, get_current_user_async
+from app.models.audit_log import AuditLog
+from app.models.customer import Customer
+from app.models.security.user_tokens import RevokedToken
+from app.models.user import User
+from app.repositories.async_auth_repository import AsyncAuthRepository
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Misma base para los dos stacks: sqlite y sqlite+aiosqlite sobre un archivo."""
+    path = tmp_path / "crm.db"
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=NullPool
+    )
+    yield engine, async_engine
+    engine.dispose()
+
+
+@pytest.fixture
+def file_db(database):
+    """Sesión sync sobre el archivo compartido (la db de conftest está en memoria)."""
+    session = sessionmaker(bind=database[0], autoflush=False, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def users(file_db):
+    created = [
+        User(
+            username=name, email=f"{name}@example.com", hashed_password="x", role=role,
+            created_by=1, updated_by=1
+        )
+        for name, role in (("admin", "admin"), ("seller", "user"))
+    ]
+    file_db.add_all(created)
+    file_db.commit()
+    return created
+
+
+@pytest.fixture
+def async_client_as(database, file_db, users):
+    """App con las rutas async registradas antes que las sync (como con DB_ASYNC=1)."""
+    app = FastAPI()
+    app.include_router(async_customer_router, prefix="/customers")
+    app.include_router(customer_router, prefix="/customers")
+    by_id = {str(u.id): u for u in users}
+    factory = async_sessionmaker(database[1], autoflush=False, expire_on_commit=False)
+
+    async def _async_db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_connection] = _async_db
+    app.dependency_overrides[get_connection] = lambda: file_db
+    for dependency in (get_current_user_async, get_current_user):
+        app.dependency_overrides[dependency] = _user_from_header(by_id)
+
+    clients = []
+
+    def _client(user):
+        client = TestClient(app, headers={"X-Test-User": str(user.id)})
+        clients.append(client.__enter__())  # un solo event loop por cliente
+        return client
+
+    yield _client
+    for client in clients:
+        client.__exit__(None, None, None)
+
+
+def _user_from_header(by_id):
+    def _current_user(request: Request) -> User:
+        return by_id[request.headers["X-Test-User"]]
+    return _current_user
+
+
+def test_async_routes_read_and_write_through_the_same_rules(
+        file_db, users, async_client_as
+):
+    admin, seller = users
+    client = async_client_as(seller)
+
+    created = client.post(
+        "/customers/", json={"full_name": "Ana Paz", "email": "ana@example.com"}
+    )
+    assert created.status_code == 200
+    customer_id = created.json()["id"]
+    history = file_db.query(AuditLog).filter_by(
+        entity="customer", entity_id=customer_id
+    )
+    assert history.count() == 1
+
+    fetched = client.get(f"/customers/{customer_id}")
+    assert fetched.json()["full_name"] == "Ana Paz"
+    not_modified = client.get(
+        f"/customers/{customer_id}", headers={"If-None-Match": fetched.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+
+    patched = client.patch(
+        f"/customers/{customer_id}", json={"status": "CONTACTED"},
+        headers={"If-Match": fetched.headers["etag"]}
+    )
+    assert patched.json()["status"] == "CONTACTED"
+    # cache invalidada
+    assert client.get(f"/customers/{customer_id}").json()["status"] == "CONTACTED"
+
+    page = client.get("/customers/")
+    assert [c["id"] for c in page.json()["items"]] == [customer_id]
+    not_modified = client.get(
+        "/customers/", headers={"If-None-Match": page.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert client.get("/customers/count").json() == 1
+
+    # El resto de /customers sigue en las rutas sync
+    assert client.get("/customers/suggest?prefix=ana").json()[0]["id"] == customer_id
+
+    foreign = Customer(full_name="Ajeno", created_by=admin.id, updated_by=admin.id)
+    file_db.add(foreign)
+    file_db.commit()
+    assert client.get(f"/customers/{foreign.id}").status_code == 403
+    assert client.get("/customers/count").json() == 1
+    assert async_client_as(admin).get("/customers/count").json() == 2
+
+    assert client.delete(f"/customers/{customer_id}").json() is True
+    assert client.get(f"/customers/{customer_id}").status_code == 404
+
+
+def test_async_and_sync_lists_return_the_same_page(file_db, users, async_client_as):
+    admin, _ = users
+    file_db.add_all([
+        Customer(
+            full_name=f"Cliente {i}", tags=["vip"], created_by=admin.id,
+            updated_by=admin.id
+        )
+        for i in range(5)
+    ])
+    file_db.commit()
+
+    async_page = async_client_as(admin).get(
+        "/customers/?limit=3&order_by=full_name&order_dir=asc"
+    )
+    for cache in CACHES.values():
+        # que el sync vaya a la BD y no devuelva la página que cacheó el async
+        cache.clear()
+
+    sync_only = FastAPI()
+    sync_only.include_router(customer_router, prefix="/customers")
+    sync_only.dependency_overrides[get_connection] = lambda: file_db
+    sync_only.dependency_overrides[get_current_user] = lambda: admin
+    sync_page = TestClient(sync_only).get(
+        "/customers/?limit=3&order_by=full_name&order_dir=asc"
+    )
+
+    assert async_page.json() == sync_page.json()
+    assert async_page.headers["etag"] == sync_page.headers["etag"]
+
+
+def test_audit_rows_of_async_writes_use_a_sync_engine_on_the_same_file(database):
+    from app.db.session import sync_engine_for
+
+    engine, async_engine = database
+    derived = sync_engine_for(async_engine.sync_engine)
+    assert not derived.dialect.is_async
+    assert derived.url.database == engine.url.database
+    assert sync_engine_for(async_engine.sync_engine) is derived
+    assert sync_engine_for(engine) is engine
+    derived.dispose()
+
+
+def test_async_auth_repository(database, users, file_db):
+    file_db.add(RevokedToken(jti="revoked-jti"))
+    file_db.commit()
+    factory = async_sessionmaker(database[1], expire_on_commit=False)
+
+    async def main():
+        async with factory() as session:
+            seller = await AsyncAuthRepository.get_user_by_id(session, users[1].id)
+            return (
+                await AsyncAuthRepository.is_token_revoked(session, "revoked-jti"),
+                await AsyncAuthRepository.is_token_revoked(session, "other"),
+                seller.username,
+            )
+
+    assert asyncio.run(main()) == (True, False, "seller")
@@ -0,0 +1,56 @@
+from app.models.audit_log import AuditLog
+from app.workers.audit_writer import AuditWriter
+
+
+def test_history_records_field_level_changes(db, admin, seller, client_as):
+    client = client_as(admin)
+    customer = client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com"}
+    ).json()
+    client.patch(f"/customers/{customer['id']}", json={"status": "CONTACTED"})
+    client.delete(f"/customers/{customer['id']}")
+    client.post(f"/customers/{customer['id']}/reactivate")
+
+    history = client.get(f"/customers/{customer['id']}/history").json()
+    actions = [entry["action"] for entry in history["items"]]
+
+    assert actions == ["reactivate", "delete", "update", "create"]
+    reactivate, delete, update, create = history["items"]
+    assert reactivate["changes"]["is_deleted"] == {"old": True, "new": False}
+    assert update["changes"] == {"status": {"new": "CONTACTED"}}
+    assert create["changes"]["email"] == {"new": "ana@example.com"}
+    assert delete["actor_id"] == admin.id
+
+    db.refresh(seller)
+    history = client_as(seller).get(f"/customers/{customer['id']}/history")
+    assert history.status_code == 403
+
+
+def test_rolled_back_writes_are_not_logged(db, admin, client_as):
+    client = client_as(admin)
+    ana = client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com"}
+    ).json()
+    client.post("/customers/", json={"full_name": "Beto", "email": "beto@example.com"})
+
+    conflict = client.patch(
+        f"/customers/{ana['id']}", json={"email": "beto@example.com"}
+    )
+    assert conflict.status_code == 400
+    history = db.query(AuditLog).filter_by(entity="customer", entity_id=ana["id"])
+    assert history.count() == 1
+
+
+def test_writer_batches_in_background_and_drains_on_stop(engine, db):
+    writer = AuditWriter(maxsize=10, batch_size=4, interval=0.01)
+    writer.start()
+    rows = [
+        {"entity": "customer", "entity_id": i, "action": "update", "changes": {},
+         "actor_id": 1}
+        for i in range(25)
+    ]
+    writer.enqueue(engine, rows)
+    writer.stop()
+
+    assert db.query(AuditLog).count() == 25
+    assert writer.stats()["queued"] == 0
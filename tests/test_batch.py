@@ -0,0 +1,145 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.events import customer_events
+from app.models.audit_log import AuditLog
+from app.models.customer import Customer
+
+
+@pytest.fixture(autouse=True)
+def sqlite_savepoints(engine):
+    """pysqlite no emite BEGIN y rompe SAVEPOINT (receta de la doc de SQLAlchemy)."""
+    def _begin(connection):
+        # Directo al driver: no cuenta en los listeners de sentencias
+        connection.connection.driver_connection.execute("BEGIN")
+
+    # StaticPool: una sola conexión, ya abierta por create_all
+    raw = engine.raw_connection()
+    raw.driver_connection.isolation_level = None
+    raw.close()
+    event.listen(engine, "begin", _begin)
+    yield
+    event.remove(engine, "begin", _begin)
+
+
+def _existing(db, owner):
+    customer = Customer(
+        full_name="Previo", email="previo@example.com", created_by=owner.id,
+        updated_by=owner.id
+    )
+    db.add(customer)
+    db.commit()
+    return customer.id
+
+
+def test_batch_runs_all_operations_with_a_single_commit(
+        engine, db, admin, seller, client_as, monkeypatch
+):
+    existing = _existing(db, seller)
+    audited = []
+    monkeypatch.setattr(
+        "app.core.audit.audit_writer.enqueue", lambda bind, rows: audited.extend(rows)
+    )
+    commits = []
+    listener = lambda conn: commits.append(conn)  # noqa: E731
+    event.listen(engine, "commit", listener)
+    try:
+        response = client_as(seller).post("/batch", json={"operations": [
+            {
+                "op": "create",
+                "data": {"full_name": "Ana Paz", "email": "ana@example.com"}
+            },
+            {"op": "patch", "id": existing, "data": {"status": "CONTACTED"}},
+            {"op": "delete", "id": existing},
+        ]})
+    finally:
+        event.remove(engine, "commit", listener)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is True
+    assert [(r["op"], r["status"]) for r in body["results"]] == [
+        ("create", 200), ("patch", 200), ("delete", 200)
+    ]
+    assert body["results"][1]["customer"]["status"] == "CONTACTED"
+    assert len(commits) == 1
+    # recién después del commit
+    assert [row["action"] for row in audited] == ["create", "update", "delete"]
+
+    created = body["results"][0]["id"]
+    assert db.get(Customer, created).full_name == "Ana Paz"
+    assert db.get(Customer, existing).is_deleted is True
+
+
+def test_atomic_batch_discards_everything_on_first_failure(
+        db, admin, seller, client_as
+):
+    published = customer_events.published
+
+    body = client_as(seller).post("/batch", json={"operations": [
+        {"op": "create", "data": {"full_name": "Ana Paz", "email": "ana@example.com"}},
+        {"op": "patch", "id": 999, "data": {"status": "CONTACTED"}},
+        {"op": "create", "data": {"full_name": "Beto", "email": "beto@example.com"}},
+    ]}).json()
+
+    assert body["committed"] is False
+    assert [r["status"] for r in body["results"]] == [200, 404, 424]
+    assert body["results"][1]["error"] == "Customer not found"
+    assert db.query(Customer).count() == 0
+    assert db.query(AuditLog).filter_by(entity="customer").count() == 0
+    # ningún evento de lo que se volvió atrás
+    assert customer_events.published == published
+
+
+def test_non_atomic_batch_rolls_back_only_the_failed_operation(
+        db, admin, seller, client_as
+):
+    body = client_as(admin).post("/batch", json={"atomic": False, "operations": [
+        {"op": "create", "data": {"full_name": "Ana Paz", "email": "ana@example.com"}},
+        {"op": "create", "data": {"full_name": "Otra Ana", "email": "ana@example.com"}},
+        {"op": "create", "data": {"full_name": "Beto", "email": "beto@example.com"}},
+    ]}).json()
+
+    assert body["committed"] is True
+    assert [r["status"] for r in body["results"]] == [200, 400, 200]
+    assert sorted(c.full_name for c in db.query(Customer)) == ["Ana Paz", "Beto"]
+    assert db.query(AuditLog).filter_by(entity="customer").count() == 2
+
+
+def test_unexpected_db_error_fails_only_that_operation(
+        db, admin, seller, client_as, monkeypatch
+):
+    from sqlalchemy.exc import IntegrityError
+    from app.services.customer_service import CustomerService
+
+    def broken_reactivate(session, customer_id, user):
+        session.add(
+            Customer(full_name="Fantasma", created_by=user.id, updated_by=user.id)
+        )
+        session.flush()
+        raise IntegrityError("UPDATE customers ...", {}, Exception("constraint failed"))
+
+    monkeypatch.setattr(
+        CustomerService, "reactivate_customer", staticmethod(broken_reactivate)
+    )
+    body = client_as(admin).post("/batch", json={"atomic": False, "operations": [
+        {"op": "create", "data": {"full_name": "Ana Paz", "email": "ana@example.com"}},
+        {"op": "reactivate", "id": 1},
+        {"op": "create", "data": {"full_name": "Beto", "email": "beto@example.com"}},
+    ]}).json()
+
+    assert body["committed"] is True
+    assert [r["status"] for r in body["results"]] == [200, 500, 200]
+    assert body["results"][1]["error"] == "Internal server error"
+    assert sorted(c.full_name for c in db.query(Customer)) == ["Ana Paz", "Beto"]
+
+
+def test_batch_validates_operations(db, admin, client_as, monkeypatch):
+    client = client_as(admin)
+    assert client.post("/batch", json={"operations": []}).status_code == 422
+    unknown = client.post("/batch", json={"operations": [{"op": "explode", "id": 1}]})
+    assert unknown.status_code == 422
+
+    monkeypatch.setattr("app.config.settings.BATCH_MAX_OPERATIONS", 1)
+    operations = [{"op": "delete", "id": 1}, {"op": "delete", "id": 2}]
+    assert client.post("/batch", json={"operations": operations}).status_code == 400
@@ -0,0 +1,110 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, negotiate
+from app.models.customer import Customer
+
+BIG = "cliente " * 500
+
+
+def _app(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BIG, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(BIG.encode()), headers={"Content-Encoding": "gzip"}
+        )
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter([BIG]), media_type="text/event-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"{i},{BIG}\n" for i in range(3)), media_type="text/csv"
+        )
+
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=500, encodings=["zstd", "br", "gzip"],
+        **kwargs
+    )
+    return TestClient(app)
+
+
+def test_negotiation_follows_server_preference_and_q_values():
+    assert negotiate("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate("br;q=0, gzip;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("*;q=0.1", ["gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+
+def test_compresses_large_responses_and_weakens_the_etag():
+    client = _app()
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < len(BIG) // 10
+    assert response.text == BIG  # httpx descomprime
+
+    plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.headers["etag"] == '"v1"'
+
+
+def test_skips_small_already_encoded_and_event_stream_responses():
+    client = _app()
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+
+    encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert encoded.text == BIG  # una sola capa de gzip
+
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in events.headers
+
+
+def test_streaming_responses_are_compressed_chunk_by_chunk():
+    headers = {"Accept-Encoding": "gzip"}
+    with _app().stream("GET", "/stream", headers=headers) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw).decode() == "".join(f"{i},{BIG}\n" for i in range(3))
+
+
+def test_list_pages_go_out_compressed_and_still_revalidate(db, admin, client_as):
+    db.add_all([
+        Customer(
+            full_name=f"Cliente {i}", notes="nota " * 20, tags=["vip"],
+            created_by=admin.id, updated_by=admin.id
+        )
+        for i in range(50)
+    ])
+    db.commit()
+    client = client_as(admin)
+
+    response = client.get("/customers/?limit=50", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["items"]) == 50
+
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    not_modified = client.get("/customers/?limit=50", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
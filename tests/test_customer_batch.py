@@ -0,0 +1,73 @@
+from sqlalchemy import event
+
+from app.models.customer import Customer
+
+
+def _seed(db, admin, seller):
+    customers = [
+        Customer(
+            full_name="Ana Paz", email="ana@example.com", created_by=seller.id,
+            updated_by=seller.id
+        ),
+        Customer(full_name="Bruno Díaz", created_by=seller.id, updated_by=seller.id),
+        Customer(full_name="Ajeno", created_by=admin.id, updated_by=admin.id),
+        Customer(
+            full_name="Baja", created_by=seller.id, updated_by=seller.id,
+            is_deleted=True
+        ),
+    ]
+    db.add_all(customers)
+    db.commit()
+    return [c.id for c in customers]
+
+
+def test_batch_get_filters_by_owner_and_reports_missing(db, admin, seller, client_as):
+    mine, other_mine, foreign, deleted = _seed(db, admin, seller)
+    client = client_as(seller)
+
+    response = client.get(
+        f"/customers/batch?ids={other_mine},{foreign},{mine},{deleted},999,{mine}"
+    )
+    assert response.status_code == 200
+    body = response.json()
+    # orden pedido, sin repetidos
+    assert [c["id"] for c in body["items"]] == [other_mine, mine]
+    assert body["missing"] == [foreign, deleted, 999]
+
+    body = client_as(admin).post(
+        "/customers/batch", json={"ids": [foreign, mine]}
+    ).json()
+    assert [c["full_name"] for c in body["items"]] == ["Ajeno", "Ana Paz"]
+    assert body["missing"] == []
+
+
+def test_batch_get_is_one_query_and_then_served_from_cache(
+        engine, db, admin, seller, client_as
+):
+    # los eliminados no se cachean: se vuelven a buscar
+    ids = _seed(db, admin, seller)[:3]
+    client = client_as(admin)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        first = client.post("/customers/batch", json={"ids": ids}).json()
+        queries_first = len(statements)
+        second = client.post("/customers/batch", json={"ids": ids}).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert queries_first == 1 and " IN (" in statements[0]
+    assert len(statements) == 1  # la segunda vez, todo sale de la cache de entidades
+    assert first == second
+
+
+def test_batch_get_validates_ids(db, admin, client_as, monkeypatch):
+    client = client_as(admin)
+    assert client.get("/customers/batch?ids=1,x").status_code == 400
+    assert client.get("/customers/batch?ids=,").status_code == 400
+    assert client.post("/customers/batch", json={"ids": []}).status_code == 422
+
+    monkeypatch.setattr("app.config.settings.BATCH_GET_MAX_IDS", 2)
+    assert client.get("/customers/batch?ids=1,2,3").status_code == 400
@@ -0,0 +1,93 @@
+from app.enums.lead_status import LeadStatus
+from app.models.customer import Customer
+
+
+def _seed(db, admin, seller):
+    customers = [
+        Customer(
+            full_name="Ana", email="ana@example.com", tags=["vip"],
+            created_by=seller.id, updated_by=seller.id
+        ),
+        Customer(
+            full_name="Beto", email="beto@example.com", tags=[], created_by=seller.id,
+            updated_by=seller.id
+        ),
+        Customer(
+            full_name="Caro", email="caro@example.com", tags=[], created_by=admin.id,
+            updated_by=admin.id
+        ),
+    ]
+    db.add_all(customers)
+    db.commit()
+    return customers
+
+
+def test_bulk_set_status_by_ids_keeps_ownership(db, admin, seller, client_as):
+    ana, beto, caro = _seed(db, admin, seller)
+    response = client_as(seller).post("/customers/bulk", json={
+        "action": "set_status", "status": "CONTACTED",
+        "ids": [ana.id, beto.id, caro.id],
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {"action": "set_status", "matched": 2, "affected": 2}
+    db.expire_all()
+    assert ana.status == LeadStatus.CONTACTED
+    assert caro.status == LeadStatus.NEW
+
+
+def test_bulk_soft_delete_by_filters_and_tags(db, admin, seller, client_as):
+    ana, beto, caro = _seed(db, admin, seller)
+    client = client_as(admin)
+
+    response = client.post(
+        "/customers/bulk",
+        json={"action": "add_tags", "tags": ["VIP", "promo"], "filters": {}}
+    )
+    assert response.json()["affected"] == 3
+
+    response = client.post(
+        "/customers/bulk", json={"action": "soft_delete", "filters": {"q": "ana"}}
+    )
+    assert response.json()["affected"] == 1
+    db.expire_all()
+    assert ana.is_deleted and ana.deleted_by == admin.id
+    assert ana.tags == ["vip", "promo"]
+    assert not beto.is_deleted
+
+
+def test_bulk_transfer_requires_admin(db, admin, seller, client_as):
+    ana, _, _ = _seed(db, admin, seller)
+    response = client_as(seller).post("/customers/bulk", json={
+        "action": "transfer_owner", "owner_id": admin.id, "ids": [ana.id],
+    })
+    assert response.status_code == 403
+
+
+def test_bulk_tags_skip_rows_changed_after_the_read(db, admin, seller, monkeypatch):
+    from app.repositories.customer_repository import CustomerRepository
+    from app.schemas.customer_schema import CustomerBulkRequest
+    from app.services.customer_bulk_service import CustomerBulkService
+
+    ana, beto, _ = _seed(db, admin, seller)
+    read = CustomerRepository.get_tags_by_ids
+
+    def read_then_concurrent_delete(session, ids):
+        rows = read(session, ids)
+        # otra request lo da de baja entre la lectura y la escritura
+        beto.is_deleted = True
+        session.commit()
+        return rows
+
+    monkeypatch.setattr(
+        CustomerRepository, "get_tags_by_ids", read_then_concurrent_delete
+    )
+    payload = CustomerBulkRequest(
+        action="add_tags", tags=["promo"], ids=[ana.id, beto.id]
+    )
+    result = CustomerBulkService.run(db, payload, seller)
+
+    assert (result.matched, result.affected) == (2, 1)
+    db.expire_all()
+    assert ana.tags == ["vip", "promo"]
+    assert beto.tags == [] and beto.is_deleted
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.customer import Customer
+from app.utils.helpers import decode_cursor, encode_cursor
+
+
+def _seed(db, admin, seller):
+    base = datetime.utcnow() - timedelta(hours=1)
+    db.add_all([
+        Customer(
+            id=1, full_name="Ana", created_by=seller.id, updated_by=seller.id,
+            updated_at=base
+        ),
+        Customer(
+            id=2, full_name="Beto", created_by=admin.id, updated_by=admin.id,
+            updated_at=base
+        ),
+        Customer(id=3, full_name="Caro", created_by=seller.id, updated_by=seller.id,
+                 updated_at=base + timedelta(minutes=1)),
+    ])
+    db.commit()
+
+
+def test_feed_pages_by_cursor_and_reports_tombstones(
+        db, admin, seller, client_as, monkeypatch
+):
+    _seed(db, admin, seller)
+    client = client_as(admin)
+
+    first = client.get("/customers/changes?limit=2").json()
+    # mismo updated_at: desempata el id
+    assert [c["id"] for c in first["items"]] == [1, 2]
+    assert first["has_more"] is True
+
+    second = client.get(f"/customers/changes?since={first['next_cursor']}").json()
+    assert [c["id"] for c in second["items"]] == [3]
+    assert second["has_more"] is False
+
+    # Sin cambios nuevos el cursor avanza hasta el margen de
+    # seguridad (no envejece hasta el 410)
+    empty = client.get(f"/customers/changes?since={second['next_cursor']}").json()
+    assert (empty["items"], empty["has_more"]) == ([], False)
+    assert decode_cursor(empty["next_cursor"])["i"] == 0
+    last_change = decode_cursor(second["next_cursor"])["u"]
+    assert decode_cursor(empty["next_cursor"])["u"] > last_change
+
+    # Baja reciente: queda fuera hasta que pase el margen de seguridad
+    client.delete("/customers/1")
+    db.refresh(admin)
+    since_empty = f"/customers/changes?since={empty['next_cursor']}"
+    assert client.get(since_empty).json()["items"] == []
+
+    monkeypatch.setattr(settings, "CHANGES_SAFETY_LAG_SECONDS", -5)
+    tombstone = client.get(since_empty).json()["items"]
+    assert tombstone == [
+        {
+            "op": "delete", "id": 1, "updated_at": tombstone[0]["updated_at"],
+            "customer": None
+        }
+    ]
+
+
+def test_feed_is_scoped_to_owner(db, admin, seller, client_as):
+    _seed(db, admin, seller)
+    items = client_as(seller).get("/customers/changes").json()["items"]
+    assert [c["id"] for c in items] == [1, 3]
+    assert items[0]["customer"]["full_name"] == "Ana"
+
+
+def test_invalid_and_expired_cursors(db, admin, client_as):
+    client = client_as(admin)
+    assert client.get("/customers/changes?since=nope").status_code == 400
+
+    old = encode_cursor(
+        {"u": (datetime.utcnow() - timedelta(days=365)).isoformat(), "i": 1}
+    )
+    assert client.get(f"/customers/changes?since={old}").status_code == 410
+
+
+def test_cursor_with_utc_offset_is_accepted(db, admin, seller, client_as):
+    _seed(db, admin, seller)
+    since = encode_cursor(
+        {"u": (datetime.utcnow() - timedelta(hours=1)).isoformat() + "+00:00", "i": 2}
+    )
+    response = client_as(admin).get(f"/customers/changes?since={since}")
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["items"]] == [3]
@@ -0,0 +1,103 @@
+from app.models.customer import Customer
+from app.models.customer_dedupe_key import CustomerDedupeKey
+from app.services.customer_dedupe_service import CustomerDedupeService
+from app.utils.dedupe_keys import dedupe_keys
+
+
+def test_keys_normalize_accents_phone_prefixes_and_email_tags():
+    a = dedupe_keys("José Pérez", "+54 9 11 4567-8901", "Jose.Perez+crm@gmail.com")
+    b = dedupe_keys("perez jose", "011 4567 8901", "joseperez@hotmail.com")
+    assert a == b
+
+
+def test_create_flags_duplicates_and_merge_folds_them(db, admin, seller, client_as):
+    client = client_as(seller)
+    first = client.post("/customers/", json={
+        "full_name": "María González", "phone": "11 4567-8901",
+        "email": "maria@example.com", "tags": ["vip"],
+    })
+    assert "X-Possible-Duplicates" not in first.headers
+    target_id = first.json()["id"]
+
+    db.refresh(seller)
+    dup = client.post("/customers/", json={
+        "full_name": "Maria Gonzales", "phone": "+54 11 4567 8901", "notes": "llamar",
+        "tags": ["mayorista"],
+    })
+    assert dup.headers["X-Possible-Duplicates"] == str(target_id)
+    dup_id = dup.json()["id"]
+
+    # Otro dueño: el vendedor no lo ve como candidato
+    db.add(
+        Customer(
+            full_name="Maria Gonzalez", phone="1145678901", created_by=admin.id,
+            updated_by=admin.id
+        )
+    )
+    db.commit()
+
+    db.refresh(seller)
+    candidates = client.get(f"/customers/{target_id}/duplicates").json()
+    assert [c["customer"]["id"] for c in candidates] == [dup_id]
+    assert candidates[0]["matched"] == ["name", "phone"]
+    assert candidates[0]["score"] > 0.9
+
+    db.refresh(seller)
+    merged = client.post(
+        f"/customers/{target_id}/merge", json={"duplicate_ids": [dup_id]}
+    )
+    assert merged.status_code == 200
+    assert merged.json()["notes"] == "llamar"
+    assert merged.json()["tags"] == ["vip", "mayorista"]
+
+    db.refresh(seller)
+    assert client.get(f"/customers/{dup_id}").status_code == 404
+    assert db.query(CustomerDedupeKey).filter_by(customer_id=dup_id).count() == 0
+
+
+def test_merge_rejects_self_and_foreign_customers(db, admin, seller, client_as):
+    db.add_all([
+        Customer(id=1, full_name="Ana", created_by=seller.id, updated_by=seller.id),
+        Customer(id=2, full_name="Ana", created_by=admin.id, updated_by=admin.id),
+    ])
+    db.commit()
+    client = client_as(seller)
+
+    merge = client.post("/customers/1/merge", json={"duplicate_ids": [1]})
+    assert merge.status_code == 400
+    db.refresh(seller)
+    merge = client.post("/customers/1/merge", json={"duplicate_ids": [2]})
+    assert merge.status_code == 403
+
+
+def test_scan_only_compares_within_blocks_and_skips_common_keys(db, admin, monkeypatch):
+    from app.config import settings
+    rows = [
+        ("Juan Pérez", "1144441111", None),
+        ("Juan Perez", "1144441111", None),
+        ("Carlos Gómez", "1155552222", "carlos@example.com"),
+        ("Carlos Gomez", None, "carlos@example.org"),
+        ("Ana López", None, None),
+        ("Ana Lopez", None, None),
+        ("Ana Lopes", None, None),
+    ]
+    for full_name, phone, email in rows:
+        db.add(
+            Customer(
+                full_name=full_name, phone=phone, email=email, created_by=admin.id,
+                updated_by=admin.id
+            )
+        )
+    db.commit()
+    assert CustomerDedupeService.backfill_keys(db, batch_size=3) == len(rows)
+
+    scanned = CustomerDedupeService.scan(db, batch_size=2)
+    pairs = {(a, b): matched for a, b, _, matched in scanned}
+    assert pairs[(1, 2)] == ["name", "phone"]
+    assert pairs[(3, 4)] == ["email", "name"]
+    assert (5, 6) not in pairs  # solo el nombre no alcanza el score mínimo
+
+    # Bloque "name" de Ana demasiado grande: se ignora
+    monkeypatch.setattr(settings, "DEDUPE_MAX_BLOCK", 2)
+    low = {(a, b) for a, b, _, _ in CustomerDedupeService.scan(db, min_score=0)}
+    assert (5, 6) not in low and (1, 2) in low
@@ -0,0 +1,55 @@
+def _create(client, name, email):
+    response = client.post("/customers/", json={"full_name": name, "email": email})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_get_customer_returns_304_on_matching_etag(admin, client_as):
+    client = client_as(admin)
+    customer = _create(client, "Ana", "ana@example.com")
+
+    first = client.get(f"/customers/{customer['id']}")
+    etag = first.headers["etag"]
+    assert etag.startswith(f'"{customer["id"]}-')
+
+    cached = client.get(
+        f"/customers/{customer['id']}", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    client.put(
+        f"/customers/{customer['id']}",
+        json={"full_name": "Ana Maria", "email": "ana@example.com"}
+    )
+    changed = client.get(
+        f"/customers/{customer['id']}", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.json()["full_name"] == "Ana Maria"
+
+
+def test_list_etag_changes_with_the_filtered_set(admin, client_as):
+    client = client_as(admin)
+    _create(client, "Ana", "ana@example.com")
+
+    etag = client.get("/customers/").headers["etag"]
+    assert client.get("/customers/", headers={"If-None-Match": etag}).status_code == 304
+    other_page = client.get("/customers/?limit=5", headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+    _create(client, "Beto", "beto@example.com")
+    response = client.get("/customers/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_items"] == 2
+
+
+def test_updated_at_keeps_microseconds_on_mysql():
+    # Es la versión del ETag / If-Match: DATETIME(0) la redondearía a segundos
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.schema import CreateTable
+    from app.models.customer import Customer
+
+    ddl = str(CreateTable(Customer.__table__).compile(dialect=mysql.dialect()))
+    assert "updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6)" in ddl
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+from app.config import settings
+from app.core.events import OVERFLOW, EventBroker
+from app.services.customer_service import CustomerService
+
+
+def _publish_from_thread(broker, *events):
+    # El service layer publica desde el threadpool, no desde el event loop
+    thread = threading.Thread(target=lambda: [broker.publish(e) for e in events])
+    thread.start()
+    thread.join()
+
+
+def test_events_are_scoped_by_owner():
+    broker = EventBroker("test")
+
+    async def scenario():
+        seller = broker.subscribe(owner_id=2)
+        admin = broker.subscribe(owner_id=None)
+        _publish_from_thread(
+            broker,
+            {"type": "created", "id": 1, "owner_id": 2},
+            {"type": "created", "id": 2, "owner_id": 3},
+            {"type": "bulk", "id": None, "owner_id": None},
+        )
+        await asyncio.sleep(0)
+        seller_ids = [
+            seller.queue.get_nowait()["id"] for _ in range(seller.queue.qsize())
+        ]
+        admin_ids = [admin.queue.get_nowait()["id"] for _ in range(admin.queue.qsize())]
+        return seller_ids, admin_ids
+
+    assert asyncio.run(scenario()) == ([1, None], [1, 2, None])
+
+
+def test_slow_client_gets_overflow_instead_of_unbounded_buffer(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_CLIENT_BUFFER", 2)
+    broker = EventBroker("test")
+
+    async def scenario():
+        subscription = broker.subscribe(owner_id=None)
+        _publish_from_thread(
+            broker, *[{"type": "updated", "id": i, "owner_id": 1} for i in range(5)]
+        )
+        await asyncio.sleep(0)
+        queue = subscription.queue
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [OVERFLOW]
+
+
+def test_service_publishes_after_writes(db, admin, client_as, monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        CustomerService, "publish_change",
+        staticmethod(
+            lambda kind, customer_id, owner_id,
+            customer=None: events.append((kind, customer_id, owner_id))
+        )
+    )
+    client = client_as(admin)
+    customer = client.post("/customers/", json={"full_name": "Ana"}).json()
+    client.patch(f"/customers/{customer['id']}", json={"notes": "x"})
+    client.delete(f"/customers/{customer['id']}")
+
+    assert events == [
+        ("created", 1, admin.id), ("updated", 1, admin.id), ("deleted", 1, admin.id)
+    ]
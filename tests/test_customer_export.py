@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+
+from app.models.customer import Customer
+
+
+def _seed(db, admin, seller):
+    db.add_all([
+        Customer(full_name="Ana Perez", email="ana@example.com", tags=["vip", "web"],
+                 created_by=seller.id, updated_by=seller.id),
+        Customer(full_name="Beto Diaz", email="beto@example.com", tags=[],
+                 created_by=admin.id, updated_by=admin.id),
+        Customer(full_name="Caro Ruiz", email="caro@example.com", is_deleted=True,
+                 created_by=seller.id, updated_by=seller.id),
+    ])
+    db.commit()
+
+
+def test_export_csv_respects_ownership(db, admin, seller, client_as):
+    _seed(db, admin, seller)
+    response = client_as(seller).get("/customers/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["email"] for r in rows] == ["ana@example.com"]
+    assert rows[0]["tags"] == "vip;web"
+
+
+def test_export_ndjson_applies_filters(db, admin, seller, client_as):
+    _seed(db, admin, seller)
+    response = client_as(admin).get("/customers/export?format=ndjson&q=beto")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [c["full_name"] for c in lines] == ["Beto Diaz"]
+
+
+def test_export_rejects_invalid_order(admin, client_as):
+    response = client_as(admin).get("/customers/export?order_by=notes")
+    assert response.status_code == 400
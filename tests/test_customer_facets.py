@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from app.enums.lead_source import LeadSource
+from app.enums.lead_status import LeadStatus
+from app.models.customer import Customer
+
+
+def _customer(owner, name, status, source, created_at):
+    return Customer(full_name=name, status=status, source=source, created_at=created_at,
+                    created_by=owner.id, updated_by=owner.id)
+
+
+def test_facets_group_status_source_and_bucket(db, admin, seller, client_as):
+    db.add_all([
+        _customer(
+            seller, "Ana", LeadStatus.NEW, LeadSource.WEB, datetime(2026, 3, 2, 10)
+        ),
+        _customer(
+            seller, "Beto", LeadStatus.NEW, LeadSource.INSTAGRAM,
+            datetime(2026, 3, 4, 12)
+        ),
+        _customer(
+            seller, "Caro", LeadStatus.LOST, LeadSource.WEB, datetime(2026, 4, 1, 9)
+        ),
+        _customer(
+            admin, "Dani", LeadStatus.NEW, LeadSource.WEB, datetime(2026, 4, 2, 9)
+        ),
+    ])
+    db.commit()
+
+    response = client_as(seller).get("/customers/facets?bucket=week")
+    assert response.status_code == 200
+    facets = response.json()
+    assert facets["total"] == 3
+    assert facets["status"] == [
+        {"value": "NEW", "count": 2}, {"value": "LOST", "count": 1}
+    ]
+    assert facets["source"] == [
+        {"value": "web", "count": 2}, {"value": "instagram", "count": 1}
+    ]
+    assert facets["created"] == [
+        {"value": "2026-03-02", "count": 2}, {"value": "2026-03-30", "count": 1}
+    ]
+
+    month = client_as(admin).get("/customers/facets?bucket=month").json()
+    assert month["created"] == [
+        {"value": "2026-03-01", "count": 2}, {"value": "2026-04-01", "count": 2}
+    ]
+
+
+def test_facets_reject_unknown_bucket(admin, client_as):
+    assert client_as(admin).get("/customers/facets?bucket=year").status_code == 400
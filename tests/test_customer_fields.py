@@ -0,0 +1,54 @@
+from app.models.customer import Customer
+
+
+def _seed(db, admin):
+    db.add(
+        Customer(
+            full_name="Ana Perez", email="ana@example.com", notes="largo", tags=["vip"],
+            created_by=admin.id, updated_by=admin.id
+        )
+    )
+    db.commit()
+
+
+def test_list_returns_only_requested_fields(db, admin, client_as):
+    _seed(db, admin)
+    client = client_as(admin)
+    response = client.get("/customers/?fields=full_name,status")
+
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.json()["items"] == [
+        {"id": 1, "full_name": "Ana Perez", "status": "NEW"}
+    ]
+    assert client.get("/customers/?fields=full_name,status").json() == response.json()
+    assert "notes" in client.get("/customers/").json()["items"][0]
+
+
+def test_list_projection_selects_only_those_columns(db, admin, client_as, engine):
+    from sqlalchemy import event
+
+    _seed(db, admin)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        client_as(admin).get("/customers/?fields=full_name")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    page_query = statements[-1]
+    assert "customers.full_name" in page_query
+    assert "customers.notes" not in page_query
+
+
+def test_detail_projection(db, admin, client_as):
+    _seed(db, admin)
+    response = client_as(admin).get("/customers/1?fields=email,tags")
+    assert response.json() == {"id": 1, "email": "ana@example.com", "tags": ["vip"]}
+
+
+def test_unknown_field_is_rejected(admin, client_as):
+    response = client_as(admin).get("/customers/?fields=full_name,hashed_password")
+    assert response.status_code == 400
+    assert "hashed_password" in response.json()["detail"]
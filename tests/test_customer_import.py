@@ -0,0 +1,124 @@
+from app.models.customer import Customer
+
+
+def test_import_csv_reports_row_errors(db, seller, client_as):
+    client = client_as(seller)
+    db.add(
+        Customer(
+            full_name="Existing", email="taken@example.com", created_by=seller.id,
+            updated_by=seller.id
+        )
+    )
+    db.commit()
+
+    csv_body = (
+        "full_name,email,phone,source,tags\n"
+        "Ana Perez,ana@example.com,1155554444,web,vip;lead\n"
+        "Juan 123,juan@example.com,,,\n"
+        "Dup One,taken@example.com,,,\n"
+        "Maria Lopez,ANA@example.com,,,\n"
+        "Pedro Gomez,,1144443333,,\n"
+    )
+    response = client.post(
+        "/customers/import",
+        files={"file": ("leads.csv", csv_body, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 5
+    assert report["inserted"] == 2
+    assert report["failed"] == 3
+    assert [e["row"] for e in report["errors"]] == [2, 3, 4]
+
+    ana = db.query(Customer).filter(Customer.email == "ana@example.com").one()
+    assert ana.tags == ["vip", "lead"]
+    assert ana.created_by == seller.id
+
+
+def test_import_ndjson(db, seller, client_as):
+    client = client_as(seller)
+    body = '{"full_name": "Lucia Diaz", "email": "lucia@example.com"}\nnot json\n'
+    response = client.post(
+        "/customers/import?format=ndjson",
+        files={"file": ("leads.txt", body, "application/octet-stream")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["errors"][0]["row"] == 2
+
+
+def test_import_falls_back_when_generated_ids_cannot_be_derived(
+        db, seller, client_as, monkeypatch
+):
+    from app.models.customer_tag import CustomerTag
+    from app.repositories.customer_repository import CustomerRepository
+
+    # Como un MySQL multi-primario con auto_increment_increment=2 mal
+    # leído: los ids deducidos no cuadran
+    monkeypatch.setattr(
+        CustomerRepository, "_auto_increment_step", staticmethod(lambda db: 2)
+    )
+    body = (
+        '{"full_name": "Lucia Diaz", "email": "lucia@example.com", "tags": ["vip"]}\n'
+        '{"full_name": "Pablo Ruiz", "email": "pablo@example.com", "tags": ["lead"]}\n'
+    )
+    response = client_as(seller).post(
+        "/customers/import?format=ndjson",
+        files={"file": ("leads.txt", body, "application/octet-stream")},
+    )
+
+    assert response.json()["inserted"] == 2
+    tags = {
+        (c.email, t.tag)
+        for c in db.query(Customer)
+        for t in db.query(CustomerTag).filter_by(customer_id=c.id)
+    }
+    assert tags == {("lucia@example.com", "vip"), ("pablo@example.com", "lead")}
+
+
+def test_import_ndjson_non_string_email_is_a_row_error(db, seller, client_as):
+    body = '{"full_name": "Lucia Diaz", "email": 123}\n{"full_name": "Pablo Ruiz"}\n'
+    response = client_as(seller).post(
+        "/customers/import?format=ndjson",
+        files={"file": ("leads.txt", body, "application/octet-stream")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["errors"][0]["row"] == 1 and report["errors"][0]["email"] is None
+
+
+def test_derived_ids_are_checked_beyond_a_null_email(
+        db, admin, seller, client_as, monkeypatch
+):
+    from app.repositories.customer_repository import CustomerRepository
+
+    def no_fallback(*args):
+        raise AssertionError("the multi-row INSERT should have been verified")
+
+    monkeypatch.setattr(
+        CustomerRepository, "insert_customers_one_by_one", staticmethod(no_fallback)
+    )
+    body = (
+        '{"full_name": "Sin Email"}\n'
+        '{"full_name": "Con Email", "email": "con@example.com"}\n'
+    )
+    response = client_as(seller).post(
+        "/customers/import?format=ndjson",
+        files={"file": ("leads.txt", body, "application/octet-stream")},
+    )
+    assert response.json()["inserted"] == 2
+
+    # Otra sesión con un cliente sin email en el id deducido: el id solo no alcanza
+    other = Customer(full_name="Ajeno", created_by=admin.id, updated_by=admin.id)
+    db.add(other)
+    db.commit()
+    row = {
+        "full_name": "Mio", "email": None, "created_by": seller.id,
+        "created_at": other.created_at
+    }
+    assert not CustomerRepository._ids_match_rows(db, [other.id], [row])
@@ -0,0 +1,77 @@
+from sqlalchemy import event, text
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def test_list_is_served_from_cache_until_a_write(engine, db, admin, seller, client_as):
+    seller_client = client_as(seller)
+    seller_client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com"}
+    )
+    counter = QueryCounter(engine)
+
+    first = seller_client.get("/customers/")
+    queries_first = counter.count
+    second = seller_client.get("/customers/")
+
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert counter.count == queries_first  # sin ir a la base
+
+    # Una escritura de otro dueño no invalida el scope del vendedor...
+    client_as(admin).post(
+        "/customers/", json={"full_name": "Beto", "email": "beto@example.com"}
+    )
+    db.refresh(seller)  # la sesión de test es compartida: el commit expiró al usuario
+    before = counter.count
+    seller_client.get("/customers/")
+    assert counter.count == before
+
+    # ...pero una propia sí
+    seller_client.post(
+        "/customers/", json={"full_name": "Caro", "email": "caro@example.com"}
+    )
+    assert seller_client.get("/customers/").json()["total_items"] == 2
+
+
+def test_memory_caches_invalidated_on_write_are_off_with_several_workers(monkeypatch):
+    from app.config import settings
+    from app.core.cache import CACHES, build_cache
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    try:
+        assert not build_cache("test_pages", 10, 60).enabled
+        assert build_cache("test_replays", 10, 60, invalidated_on_write=False).enabled
+    finally:
+        CACHES.pop("test_pages", None)
+        CACHES.pop("test_replays", None)
+
+
+def test_generation_is_read_before_the_query_snapshot(
+        monkeypatch, db, seller, client_as
+):
+    from app.services.customer_service import CustomerService
+
+    seen = []
+    generations = CustomerService._generations
+
+    def _spy(user):
+        seen.append(db.in_transaction())
+        return generations(user)
+
+    monkeypatch.setattr(CustomerService, "_generations", staticmethod(_spy))
+    seller_client = client_as(seller)
+    for path in ("/customers/", "/customers/facets", "/customers/count"):
+        # como get_current_user: la transacción ya está abierta
+        db.execute(text("SELECT 1"))
+        assert seller_client.get(path).status_code == 200
+
+    assert seen == [False, False, False]
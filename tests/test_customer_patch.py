@@ -0,0 +1,91 @@
+from sqlalchemy import event
+
+from app.models.customer import Customer
+
+
+def _create(client, **data):
+    return client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com", **data}
+    ).json()
+
+
+def test_patch_updates_only_sent_fields_in_one_statement(engine, db, admin, client_as):
+    client = client_as(admin)
+    customer = _create(client, notes="vip", tags=["web"])
+    db.refresh(admin)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.patch(
+            f"/customers/{customer['id']}", json={"status": "CONTACTED"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["status"] == "CONTACTED"
+    assert body["notes"] == "vip" and body["tags"] == ["web"]
+    fetched = client.get(f"/customers/{customer['id']}")
+    assert response.headers["etag"] == fetched.headers["etag"]
+    # audit_log va por el AuditWriter (fuera del request cuando corre en background)
+    statements = [s for s in statements if "audit_log" not in s]
+    assert len(statements) == 1 and statements[0].startswith("UPDATE")
+
+
+def test_patch_with_stale_if_match_is_rejected(db, admin, client_as):
+    client = client_as(admin)
+    customer = _create(client)
+    etag = client.get(f"/customers/{customer['id']}").headers["etag"]
+
+    first = client.patch(
+        f"/customers/{customer['id']}", json={"notes": "uno"},
+        headers={"If-Match": etag}
+    )
+    stale = client.patch(
+        f"/customers/{customer['id']}", json={"notes": "dos"},
+        headers={"If-Match": etag}
+    )
+
+    assert first.status_code == 200
+    assert stale.status_code == 412
+    assert db.get(Customer, customer["id"]).notes == "uno"
+
+
+def test_patch_scope_and_errors(db, admin, seller, client_as):
+    admin_client = client_as(admin)
+    customer = _create(admin_client)
+    _create(admin_client, email="beto@example.com", full_name="Beto")
+    db.refresh(seller)
+
+    url = f"/customers/{customer['id']}"
+    forbidden = client_as(seller).patch(url, json={"notes": "x"})
+    assert forbidden.status_code == 403
+    assert admin_client.patch("/customers/999", json={"notes": "x"}).status_code == 404
+    invalid = admin_client.patch(url, json={"full_name": None})
+    assert invalid.status_code == 422
+    conflict = admin_client.patch(url, json={"email": "beto@example.com"})
+    assert conflict.status_code == 400
+
+
+def test_patch_tags_keeps_tag_index_in_sync(admin, client_as):
+    client = client_as(admin)
+    customer = _create(client, tags=["web"])
+    client.patch(f"/customers/{customer['id']}", json={"tags": ["VIP"]})
+
+    assert client.get("/customers/?tags_any=vip").json()["total_items"] == 1
+    assert client.get("/customers/?tags_any=web").json()["total_items"] == 0
+
+
+def test_patch_user(db, admin, seller, client_as):
+    client = client_as(admin)
+    response = client.patch(f"/users/{seller.id}", json={"full_name": "Vendedor"})
+
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Vendedor"
+    assert response.json()["username"] == "seller"
+    assert client.get(f"/users/{seller.id}").json()["full_name"] == "Vendedor"
+    conflict = client.patch(f"/users/{seller.id}", json={"email": "admin@example.com"})
+    assert conflict.status_code == 400
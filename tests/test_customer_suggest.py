@@ -0,0 +1,100 @@
+from sqlalchemy import event
+
+from app.models.customer import Customer
+
+
+def _seed(db, admin, seller):
+    db.add_all([
+        Customer(
+            full_name="Ángela Núñez", email="angela@example.com", created_by=seller.id,
+            updated_by=seller.id
+        ),
+        Customer(
+            full_name="Andrés Paz", email="ap@example.com", created_by=seller.id,
+            updated_by=seller.id
+        ),
+        Customer(
+            full_name="Bruno Díaz", email="angie_99@example.com", created_by=seller.id,
+            updated_by=seller.id
+        ),
+        Customer(
+            full_name="Angel Admin", email="other@example.com", created_by=admin.id,
+            updated_by=admin.id
+        ),
+        Customer(
+            full_name="Angus Baja", created_by=seller.id, updated_by=seller.id,
+            is_deleted=True
+        ),
+    ])
+    db.commit()
+
+
+def test_suggest_matches_name_or_email_prefix_without_counting(
+        engine, db, admin, seller, client_as
+):
+    _seed(db, admin, seller)
+    client = client_as(seller)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        names = [
+            c["full_name"] for c in client.get("/customers/suggest?prefix=ÁNG").json()
+        ]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Acentos / mayúsculas no importan; email "angie_99" también
+    # matchea; sin bajas ni clientes ajenos
+    assert names == ["Ángela Núñez", "Bruno Díaz"]
+    assert len(statements) == 1 and "count(" not in statements[0].lower()
+
+    db.refresh(seller)
+    suggestions = client_as(admin).get("/customers/suggest?prefix=ang&limit=2").json()
+    assert [c["full_name"] for c in suggestions] == ["Angel Admin", "Ángela Núñez"]
+
+
+def test_suggest_short_prefix_and_renames(db, admin, seller, client_as):
+    _seed(db, admin, seller)
+    client = client_as(seller)
+    assert client.get("/customers/suggest?prefix=a").json() == []
+    assert client.get("/customers/suggest?prefix=an&limit=500").status_code == 400
+
+    # El nombre normalizado se actualiza en el PATCH (UPDATE Core) y en el import
+    db.refresh(seller)
+    client.patch("/customers/2", json={"full_name": "Zoe Paz"})
+    db.refresh(seller)
+    assert [c["id"] for c in client.get("/customers/suggest?prefix=zo").json()] == [2]
+
+    db.refresh(seller)
+    client.post("/customers/import?format=ndjson",
+                files={
+                    "file": (
+                        "c.ndjson", b'{"full_name": "Zoila Rios"}\n',
+                        "application/x-ndjson"
+                    )
+                })
+    db.refresh(seller)
+    suggestions = client.get("/customers/suggest?prefix=zoi").json()
+    assert [c["full_name"] for c in suggestions] == ["Zoila Rios"]
+
+
+def test_suggest_email_prefix_ignores_case(db, admin, seller, client_as):
+    db.add(
+        Customer(
+            full_name="Zed", email="Juan.Perez@Example.com", created_by=seller.id,
+            updated_by=seller.id
+        )
+    )
+    db.commit()
+    client = client_as(seller)
+    suggestions = client.get("/customers/suggest?prefix=juan").json()
+    assert [c["email"] for c in suggestions] == ["Juan.Perez@Example.com"]
+
+    # El PATCH (UPDATE Core) mantiene email_search
+    db.refresh(seller)
+    client.patch("/customers/1", json={"email": "Ximena@Example.com"})
+    db.refresh(seller)
+    suggestions = client.get("/customers/suggest?prefix=XIM").json()
+    assert [c["full_name"] for c in suggestions] == ["Zed"]
@@ -0,0 +1,43 @@
+from app.models.customer_tag import CustomerTag
+
+
+def _create(client, name, email, tags):
+    response = client.post(
+        "/customers/", json={"full_name": name, "email": email, "tags": tags}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_tags_are_synced_and_filterable(db, admin, client_as):
+    client = client_as(admin)
+    ana = _create(client, "Ana", "ana@example.com", ["VIP", "web"])
+    beto = _create(client, "Beto", "beto@example.com", ["web"])
+    _create(client, "Caro", "caro@example.com", [])
+
+    url = "/customers/?tags_any=vip,web&order_by=id&order_dir=asc"
+    items = client.get(url).json()["items"]
+    assert [c["id"] for c in items] == [ana["id"], beto["id"]]
+
+    items = client.get("/customers/?tags_all=vip, web").json()["items"]
+    assert [c["id"] for c in items] == [ana["id"]]
+
+    client.put(
+        f"/customers/{ana['id']}",
+        json={"full_name": "Ana", "email": "ana@example.com", "tags": ["web"]}
+    )
+    tags = db.query(CustomerTag).filter_by(customer_id=ana["id"])
+    assert {t.tag for t in tags} == {"web"}
+
+
+def test_tag_facets_respect_ownership(db, admin, seller, client_as):
+    _create(client_as(admin), "Beto", "beto@example.com", ["web", "promo"])
+    seller_client = client_as(seller)
+    _create(seller_client, "Ana", "ana@example.com", ["web"])
+
+    assert seller_client.get("/customers/tags/facets").json() == [
+        {"tag": "web", "count": 1}
+    ]
+    assert client_as(admin).get("/customers/tags/facets?top=1").json() == [
+        {"tag": "web", "count": 2}
+    ]
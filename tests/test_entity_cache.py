@@ -0,0 +1,54 @@
+def test_customer_detail_uses_entity_cache_and_invalidates_on_write(
+        db, admin, client_as
+):
+    client = client_as(admin)
+    customer = client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com"}
+    ).json()
+
+    before = client.get("/metrics/cache").json()["customer_entity"]
+    client.get(f"/customers/{customer['id']}")
+    client.get(f"/customers/{customer['id']}")
+    after = client.get("/metrics/cache").json()["customer_entity"]
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    client.put(
+        f"/customers/{customer['id']}",
+        json={"full_name": "Ana Maria", "email": "ana@example.com"}
+    )
+    assert client.get(f"/customers/{customer['id']}").json()["full_name"] == "Ana Maria"
+
+    client.delete(f"/customers/{customer['id']}")
+    assert client.get(f"/customers/{customer['id']}").status_code == 404
+
+
+def test_user_detail_cache_is_invalidated_on_delete(db, admin, seller, client_as):
+    client = client_as(admin)
+    assert client.get(f"/users/{seller.id}").json()["full_name"] == "Seller"
+
+    client.delete(f"/users/{seller.id}")
+    assert client.get(f"/users/{seller.id}").status_code == 404
+
+
+def test_a_fill_that_read_before_a_write_does_not_cache_the_old_row(
+        db, admin, client_as
+):
+    from app.repositories.customer_repository import CustomerRepository
+
+    client = client_as(admin)
+    customer = client.post(
+        "/customers/", json={"full_name": "Ana", "email": "ana@example.com"}
+    ).json()
+
+    # Un lector carga la fila (miss) y se demora antes de poblar la cache...
+    stale = CustomerRepository.get_customer_by_id(db, customer["id"])
+    db.expunge(stale)
+    # ...mientras una escritura confirma e invalida
+    client.put(
+        f"/customers/{customer['id']}",
+        json={"full_name": "Ana Maria", "email": "ana@example.com"}
+    )
+    CustomerRepository.cache_snapshot(stale)
+
+    assert client.get(f"/customers/{customer['id']}").json()["full_name"] == "Ana Maria"
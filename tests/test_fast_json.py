@@ -0,0 +1,47 @@
+import warnings
+
+from app.config import settings
+from app.core.serialization import FastJSONResponse, trusted_model, validate_rows
+from app.models.customer import Customer
+from app.schemas.customer_schema import CustomerRead
+from app.schemas.user_schema import UserRead
+
+
+def test_trusted_model_only_relaxes_email_fields():
+    fast = trusted_model(CustomerRead)
+    assert issubclass(fast, CustomerRead)
+    assert list(fast.model_fields) == list(CustomerRead.model_fields)
+    original = CustomerRead.model_fields["email"].annotation
+    assert fast.model_fields["email"].annotation != original
+    assert trusted_model(CustomerRead) is fast  # uno por modelo
+
+
+def test_fast_path_returns_the_same_body(db, admin, seller, client_as, monkeypatch):
+    db.add_all([
+        Customer(full_name=f"Cliente {i}", email=f"c{i}@example.com", tags=["a"],
+                 created_by=admin.id, updated_by=admin.id)
+        for i in range(30)
+    ])
+    db.commit()
+    client = client_as(admin)
+
+    expected = {
+        path: client.get(path).json() for path in ("/customers/?limit=50", "/users/")
+    }
+    db.refresh(admin)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # sin avisos de serialización por la subclase
+        for path, body in expected.items():
+            response = client.get(path)
+            assert response.status_code == 200
+            assert response.json() == body
+            db.refresh(admin)
+    assert len(expected["/customers/?limit=50"]["items"]) == 30
+
+
+def test_validate_rows_and_response_render(db, admin):
+    users = validate_rows(UserRead, [admin])
+    assert users[0].email == "admin@example.com"
+    assert FastJSONResponse({"ok": True}).body.replace(b" ", b"") == b'{"ok":true}'
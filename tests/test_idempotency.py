@@ -0,0 +1,75 @@
+import json
+
+from app.config import settings
+from app.middleware.idempotency import idempotency_store
+from app.models.customer import Customer
+
+PAYLOAD = {"full_name": "Ana", "email": "ana@example.com"}
+
+
+def test_retry_with_same_key_replays_first_response(db, admin, client_as):
+    client = client_as(admin)
+    first = client.post("/customers/", json=PAYLOAD, headers={"Idempotency-Key": "k1"})
+    retry = client.post("/customers/", json=PAYLOAD, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert db.query(Customer).count() == 1
+
+
+def test_without_key_retry_is_a_new_request(admin, client_as):
+    client = client_as(admin)
+    client.post("/customers/", json=PAYLOAD)
+    assert client.post("/customers/", json=PAYLOAD).status_code == 400
+
+
+def test_same_key_with_different_payload_is_rejected(admin, client_as):
+    client = client_as(admin)
+    client.post("/customers/", json=PAYLOAD, headers={"Idempotency-Key": "k1"})
+    other = client.post("/customers/", json={**PAYLOAD, "email": "otra@example.com"},
+                        headers={"Idempotency-Key": "k1"})
+    assert other.status_code == 422
+
+
+def test_duplicate_while_first_is_in_flight_gets_409(db, admin, client_as, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.1)
+    client = client_as(admin)
+    # Simula la request original todavía en curso: el lock ya está tomado
+    response = client.post(
+        "/customers/", json=PAYLOAD, headers={"Idempotency-Key": "k1"}
+    )
+    store_key = next(iter(idempotency_store._data))
+    idempotency_store.set(store_key, json.dumps({
+        "state": "pending",
+        "fingerprint": json.loads(idempotency_store.get(store_key))["fingerprint"],
+    }))
+
+    retry = client.post("/customers/", json=PAYLOAD, headers={"Idempotency-Key": "k1"})
+    assert response.status_code == 200
+    assert retry.status_code == 409
+    assert db.query(Customer).count() == 1
+
+
+def test_retry_after_token_refresh_keeps_the_same_key(
+        db, admin, client_as, monkeypatch
+):
+    from app.services.auth_service import AuthService
+
+    tokens = {"old-token": {"sub": str(admin.id)}, "new-token": {"sub": str(admin.id)}}
+    monkeypatch.setattr(AuthService, "decode_access_token", staticmethod(tokens.get))
+    client = client_as(admin)
+
+    first = client.post("/customers/", json=PAYLOAD,
+                        headers={
+                            "Idempotency-Key": "k1", "Authorization": "Bearer old-token"
+                        })
+    retry = client.post("/customers/", json=PAYLOAD,
+                        headers={
+                            "Idempotency-Key": "k1", "Authorization": "Bearer new-token"
+                        })
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert db.query(Customer).count() == 1
@@ -0,0 +1,39 @@
+from app.models.customer import Customer
+from app.models.user import User
+
+
+def _orm_instances(db, model):
+    return [obj for obj in db.identity_map.values() if isinstance(obj, model)]
+
+
+def test_customer_list_reads_rows_without_the_orm(db, admin, seller, client_as):
+    customers = [
+        Customer(full_name=f"Cliente {i}", email=f"c{i}@example.com", tags=["a"],
+                 status="CONTACTED", created_by=seller.id if i % 2 else admin.id,
+                 updated_by=admin.id)
+        for i in range(6)
+    ]
+    db.add_all(customers)
+    db.commit()
+    for customer in customers:
+        db.expunge(customer)
+    db.refresh(seller)
+
+    body = client_as(seller).get("/customers/?order_by=id&order_dir=asc").json()
+    assert body["total_items"] == 3
+    assert [c["full_name"] for c in body["items"]] == [
+        "Cliente 1", "Cliente 3", "Cliente 5"
+    ]
+    first = body["items"][0]
+    assert first["status"] == "CONTACTED" and first["tags"] == ["a"]
+    assert _orm_instances(db, Customer) == []
+
+
+def test_user_list_reads_rows_without_the_orm(db, admin, seller, client_as):
+    client = client_as(admin)
+    db.expunge(seller)
+
+    body = client.get("/users/?order_by=id&order_dir=desc").json()
+    assert body["total_items"] == 2
+    assert [u["username"] for u in body["items"]] == ["seller", "admin"]
+    assert [u for u in _orm_instances(db, User) if u.username == "seller"] == []
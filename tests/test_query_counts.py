@@ -0,0 +1,71 @@
+import time
+
+from sqlalchemy import event
+
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+
+class StatementLog:
+    def __init__(self, engine):
+        self.statements = []
+        self.engine = engine
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self.statements
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        self.statements.append(" ".join(statement.split()))
+
+
+def test_create_and_delete_do_not_reload_rows_after_commit(
+        engine, db, admin, seller, client_as
+):
+    client = client_as(seller)
+
+    with StatementLog(engine) as created:
+        response = client.post(
+            "/customers/", json={"full_name": "Ana Paz", "email": "ana@example.com"}
+        )
+    assert response.status_code == 200
+    assert response.json()["created_at"] is not None
+
+    # Sin refresh(): ni SELECT de la fila recién insertada ni recarga
+    # del usuario después del commit
+    assert [
+        s for s in created if s.startswith("SELECT") and "WHERE customers.id = ?" in s
+    ] == []
+    assert [s for s in created if "FROM users" in s] == []
+    inserts = [s for s in created if s.startswith("INSERT INTO customers ")]
+    # el timestamp viaja en el INSERT
+    assert len(inserts) == 1 and "created_at" in inserts[0]
+
+    with StatementLog(engine) as deleted:
+        assert client.delete(f"/customers/{response.json()['id']}").status_code == 200
+    # Un SELECT para cargarlo, el UPDATE y la fila de auditoría
+    assert [s.split()[0] for s in deleted] == ["SELECT", "UPDATE", "INSERT"]
+
+
+def test_insert_user_needs_a_single_statement_and_gets_fresh_timestamps(
+        engine, db, admin
+):
+    def _user(name):
+        return User(
+            username=name, email=f"{name}@example.com", hashed_password="x",
+            role="user", created_by=admin.id, updated_by=admin.id
+        )
+
+    with StatementLog(engine) as statements:
+        first = UserRepository.insert_user(db, _user("uno"))
+        assert first.id and first.created_at  # ya cargados, sin SELECT
+    # usuario + auditoría
+    assert [s.split()[0] for s in statements] == ["INSERT", "INSERT"]
+
+    time.sleep(0.01)
+    second = UserRepository.insert_user(db, _user("dos"))
+    # el default se evalúa por fila, no al importar
+    assert second.created_at > first.created_at
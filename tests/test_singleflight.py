@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+from app.repositories.customer_repository import CustomerRepository
+from app.services.customer_service import CustomerService, customer_reads_flight
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def query():
+        calls.append(1)
+        release.wait(2)
+        return {"total": 42}
+
+    with ThreadPoolExecutor(5) as pool:
+        futures = [pool.submit(flight.do, "count:all", query) for _ in range(5)]
+        _wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {
+        "in_flight": 0, "executed": 1, "coalesced": 4, "coalesced_ratio": 0.8
+    }
+
+    # Terminada la consulta la clave se libera: no es una cache
+    assert flight.do("count:all", lambda: {"total": 43}) == {"total": 43}
+
+
+def test_errors_reach_every_waiter_and_free_the_key():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    def failing():
+        release.wait(2)
+        raise RuntimeError("db down")
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(flight.do, "k", failing) for _ in range(3)]
+        _wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="db down"):
+                future.result()
+
+    assert flight.do("k", lambda: "ok") == "ok"
+
+
+def test_async_callers_join_a_flight_started_in_a_thread():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        leader = loop.run_in_executor(
+            None, flight.do, "k", lambda: release.wait(2) and "rows"
+        )
+        await asyncio.to_thread(_wait_for, lambda: flight.executed == 1)
+
+        async def never_called():
+            raise AssertionError("should have joined the running flight")
+
+        followers = [flight.do_async("k", never_called) for _ in range(3)]
+        gathered = asyncio.gather(*followers)
+        await asyncio.to_thread(_wait_for, lambda: flight.coalesced == 3)
+        release.set()
+        return await leader, await gathered
+
+    leader, followers = asyncio.run(main())
+    assert leader == "rows" and followers == ["rows"] * 3
+
+
+def test_cancelled_leader_hands_the_flight_to_a_waiter():
+    flight = SingleFlight("test")
+
+    async def main():
+        started = asyncio.Event()
+
+        async def hangs():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def query():
+            return "rows"
+
+        leader = asyncio.create_task(flight.do_async("k", hangs))
+        await started.wait()
+        waiters = [asyncio.create_task(flight.do_async("k", query)) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()  # un seguidor que se va tampoco afecta a los demás
+        leader.cancel()      # el cliente del líder se desconecta
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiters[1]
+
+    assert asyncio.run(main()) == "rows"
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_count_is_coalesced_per_scope(db, admin, seller, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_count(db, user_id=None, is_admin=False):
+        calls.append(is_admin)
+        release.wait(2)
+        return 7
+
+    monkeypatch.setattr(
+        CustomerRepository, "count_all_customers", staticmethod(slow_count)
+    )
+    coalesced = customer_reads_flight.coalesced
+
+    with ThreadPoolExecutor(6) as pool:
+        futures = [
+            pool.submit(CustomerService.count_all_customers, db, user)
+            for user in [seller] * 4 + [admin] * 2
+        ]
+        _wait_for(lambda: customer_reads_flight.coalesced - coalesced == 4)
+        release.set()
+        assert [f.result() for f in futures] == [7] * 6
+
+    assert sorted(calls) == [False, True]  # una consulta por scope (vendedor / admin)